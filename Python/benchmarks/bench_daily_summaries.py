@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src (e tests, para o servidor SMTP local) ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests'))
+
+from automation.mail_delivery import MailDispatcher, SMTPConnectionPool
+from automation.multi_tenant import MultiTenantScheduler
+from automation.task_store import SQLiteTaskStore
+from local_servers import SMTPStandIn
+
+
+def make_tasks(students: int, tasks_per_student: int, now: datetime):
+    for student in range(students):
+        for number in range(tasks_per_student):
+            yield {
+                'title': f"Tarefa {number}",
+                'due_date': (now + timedelta(hours=7 * number + student % 24)).isoformat(),
+                'course': f"Disciplina {number % 6}",
+                'type': 'assignment',
+                'completed': False,
+                'student_id': f"{student:06d}"
+            }
+
+
+def run(students: int, tasks_per_student: int, workers: int, connections: int):
+    workdir = tempfile.mkdtemp(prefix="bench_daily_summaries_")
+    now = datetime.now()
+
+    store = SQLiteTaskStore(os.path.join(workdir, "tasks.db"))
+    start = time.perf_counter()
+    store.insert_many(make_tasks(students, tasks_per_student, now))
+    print(f"{students * tasks_per_student:,} tarefas inseridas em {time.perf_counter() - start:.1f}s")
+
+    recipients = {f"{student:06d}": f"aluno{student}@universidade.edu" for student in range(students)}
+
+    with SMTPStandIn() as server:
+        pool = SMTPConnectionPool("127.0.0.1", server.port, starttls=False, size=connections)
+        mailer = MailDispatcher(pool, workers=connections, queue_size=10_000, batch_size=100)
+        scheduler = MultiTenantScheduler(store, recipients, email_config={'sender': 'scheduler@universidade.edu'},
+                                         mailer=mailer, workers=workers)
+
+        start = time.perf_counter()
+        result = scheduler.send_daily_summaries(3, now)
+        mailer.close()
+        elapsed = time.perf_counter() - start
+
+        print(f"Resumos montados e enfileirados: {result['summaries']:,} em {result['seconds']:.1f}s")
+        print(f"Entrega completa: {elapsed:.1f}s ({result['summaries'] / elapsed:,.0f} emails/s)")
+        print(f"Servidor SMTP: {len(server.messages):,} mensagens em {server.connections} conexões")
+        print(mailer.stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do resumo diário multiusuário contra um servidor SMTP local")
+    parser.add_argument('--students', type=int, default=50_000)
+    parser.add_argument('--tasks-per-student', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Processos para montar os resumos")
+    parser.add_argument('--connections', type=int, default=8,
+                        help="Conexões SMTP simultâneas")
+    args = parser.parse_args()
+
+    run(args.students, args.tasks_per_student, args.workers, args.connections)
@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_analysis.grade_calculator import GradeCalculator
+
+
+def legacy_calculate_gpa(calc: GradeCalculator, grades) -> float:
+    """Implementação original (laço por nota sobre o dict de ranges)."""
+    points = []
+    for grade in grades:
+        for grade_range, point in calc.gpa_scale.items():
+            if int(grade) in grade_range:
+                points.append(point)
+                break
+        else:
+            points.append(0.0)
+    return np.mean(points)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(sizes, grades_per_student: int, legacy_limit: int):
+    calc = GradeCalculator()
+    rng = np.random.default_rng(42)
+
+    print(f"{'notas':>12} {'caminho':>10} {'amostra':>12} {'tempo (s)':>10} {'notas/s':>14}")
+    for size in sizes:
+        grades = rng.uniform(0, 100, size)
+        students = grades.reshape(-1, grades_per_student)
+
+        # O caminho escalar legado é medido numa amostra e extrapolado
+        sample = grades[:min(size, legacy_limit)]
+        elapsed = timed(lambda: legacy_calculate_gpa(calc, sample))
+        print(f"{size:>12,} {'legado':>10} {len(sample):>12,} {elapsed:>10.3f} {len(sample) / elapsed:>14,.0f}")
+
+        rows = students[:max(1, min(len(students), legacy_limit // grades_per_student))]
+        elapsed = timed(lambda: [calc.calculate_gpa(row) for row in rows])
+        print(f"{size:>12,} {'escalar':>10} {rows.size:>12,} {elapsed:>10.3f} {rows.size / elapsed:>14,.0f}")
+
+        elapsed = timed(lambda: calc.calculate_gpa_batch(students))
+        print(f"{size:>12,} {'lote':>10} {size:>12,} {elapsed:>10.3f} {size / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de conversão GPA: escalar vs lote")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**3, 10**6, 10**7])
+    parser.add_argument('--grades-per-student', type=int, default=10)
+    parser.add_argument('--legacy-limit', type=int, default=10**5,
+                        help="Máximo de notas medidas nos caminhos por estudante")
+    args = parser.parse_args()
+
+    run(args.sizes, args.grades_per_student, args.legacy_limit)
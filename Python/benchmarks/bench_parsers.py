@@ -0,0 +1,86 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bs4 import BeautifulSoup
+
+from web_scraping.parsers import PageParser, available_backends
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+PAGES = {
+    'timetable': 'sigaa_turmas.html',
+    'materials': 'moodle_course.html'
+}
+
+
+def load_fixtures():
+    pages = {}
+    for extractor, filename in PAGES.items():
+        with open(os.path.join(FIXTURES, filename), encoding='utf-8') as f:
+            pages[extractor] = f.read()
+    return pages
+
+
+def full_tree(html: str):
+    """Referência: a árvore inteira com o parser padrão do BeautifulSoup."""
+    return BeautifulSoup(html, 'html.parser')
+
+
+def measure(backend: str, extractor: str, iterations: int, results):
+    """Executado num processo próprio, para que o pico de RSS seja só deste backend."""
+    html = load_fixtures()[extractor]
+    extract = full_tree if backend == 'full-tree' else getattr(PageParser(backend), extractor)
+
+    extract(html)
+    tracemalloc.start()
+    extract(html)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extract(html)
+    elapsed = time.perf_counter() - start
+
+    results.put({
+        'backend': backend,
+        'extractor': extractor,
+        'pages_per_second': iterations / elapsed,
+        'python_peak_kb': python_peak / 1024,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    })
+
+
+def run(iterations: int, backends):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    pages = load_fixtures()
+
+    print("Páginas: " + ", ".join(f"{PAGES[name]} ({len(html) / 1024:.0f} KB)" for name, html in pages.items()))
+    print(f"{'Extrator':<10} {'Backend':<12} {'páginas/s':>10} {'pico Python (KB)':>17} {'RSS máx. (KB)':>14}")
+    for extractor in PAGES:
+        for backend in backends:
+            process = context.Process(target=measure, args=(backend, extractor, iterations, results))
+            process.start()
+            row = results.get()
+            process.join()
+            print(f"{row['extractor']:<10} {row['backend']:<12} {row['pages_per_second']:>10,.1f} "
+                  f"{row['python_peak_kb']:>17,.0f} {row['max_rss_kb']:>14,}")
+    print("(o pico Python vem do tracemalloc e não inclui a memória alocada em C pelo lxml)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos extratores de página por backend")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--backends', nargs='+', default=available_backends() + ['full-tree'],
+                        help="Backends a comparar (full-tree = página inteira no BeautifulSoup)")
+    args = parser.parse_args()
+
+    run(args.iterations, args.backends)
@@ -0,0 +1,76 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automation.academic_scheduler import AcademicScheduler
+from automation.task_store import SQLiteTaskStore
+
+
+def make_tasks(count: int):
+    start = datetime(2024, 3, 4)
+    return [
+        {
+            'title': f"Tarefa {i}",
+            'due_date': (start + timedelta(hours=i)).isoformat(),
+            'course': f"Disciplina {i % 50}",
+            'type': 'assignment'
+        }
+        for i in range(count)
+    ]
+
+
+def bench_add_task(scheduler: AcademicScheduler, tasks) -> float:
+    start = time.perf_counter()
+    for task in tasks:
+        scheduler.add_task(task)
+    return time.perf_counter() - start
+
+
+def report(label: str, count: int, elapsed: float, note: str = ""):
+    print(f"{label:<36} {count:>10,} {elapsed:>12.2f} {count / elapsed:>14,.0f} {note}")
+
+
+def run(count: int, legacy_limit: int):
+    workdir = tempfile.mkdtemp(prefix="bench_task_store_")
+    os.chdir(workdir)
+
+    print(f"{'implementação':<36} {'inserções':>10} {'tempo (s)':>12} {'inserções/s':>14}")
+
+    # O formato legado reescreve o arquivo inteiro a cada inserção (O(n) por
+    # tarefa); mede-se uma amostra e extrapola-se o custo quadrático
+    legacy_count = min(count, legacy_limit)
+    elapsed = bench_add_task(AcademicScheduler(), make_tasks(legacy_count))
+    report("JSON legado (add_task)", legacy_count, elapsed)
+    if legacy_count < count:
+        estimate = elapsed * (count / legacy_count) ** 2
+        print(f"{'':<36} {count:>10,} {estimate:>12.0f} {count / estimate:>14,.0f} (extrapolado)")
+
+    scheduler = AcademicScheduler(store=SQLiteTaskStore(os.path.join(workdir, "per_task.db")))
+    elapsed = bench_add_task(scheduler, make_tasks(count))
+    report("SQLite (add_task, 1 transação cada)", count, elapsed)
+
+    store = SQLiteTaskStore(os.path.join(workdir, "bulk.db"))
+    tasks = [dict(task, completed=False) for task in make_tasks(count)]
+    start = time.perf_counter()
+    store.insert_many(tasks)
+    report("SQLite (insert_many, 1 transação)", count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pending = store.query(completed=False, due_before=datetime(2024, 3, 11).isoformat())
+    print(f"\nConsulta indexada (7 dias): {len(pending)} tarefas em {time.perf_counter() - start:.4f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de inserção de tarefas: JSON legado vs SQLite")
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--legacy-limit', type=int, default=1_000,
+                        help="Máximo de inserções medidas no formato JSON legado")
+    args = parser.parse_args()
+
+    run(args.count, args.legacy_limit)
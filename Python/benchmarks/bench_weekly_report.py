@@ -0,0 +1,104 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automation.academic_scheduler import AcademicScheduler
+from automation.task_store import JSONTaskStore
+
+
+def make_tasks(count: int):
+    # Prazos espalhados por um ano, começando uma semana atrás
+    start = datetime.now() - timedelta(days=7)
+    step = timedelta(days=365) / count
+    return [
+        {
+            'id': i + 1,
+            'title': f"Tarefa {i}",
+            'due_date': (start + step * i).isoformat(),
+            'course': f"Disciplina {i % 50}",
+            'type': 'assignment',
+            'completed': i % 3 == 0,
+            'priority': 'medium'
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_weekly_report(store: JSONTaskStore) -> str:
+    """Algoritmo anterior: três passagens sobre as tarefas e duas leituras do arquivo."""
+    tasks = store.all()
+
+    completed = [t for t in tasks if t['completed']]
+    pending = [t for t in tasks if not t['completed']]
+
+    course_stats = {}
+    for task in tasks:
+        course = task['course']
+        if course not in course_stats:
+            course_stats[course] = {'total': 0, 'completed': 0}
+        course_stats[course]['total'] += 1
+        if task['completed']:
+            course_stats[course]['completed'] += 1
+
+    report = f"{len(tasks)} {len(completed)} {len(pending)} {len(completed) / len(tasks) * 100:.1f}"
+    for course, stats in course_stats.items():
+        report += f"\n{course}: {stats['completed']}/{stats['total']}"
+
+    now = datetime.now()
+    cutoff_date = now + timedelta(days=7)
+    for task in store.all():
+        if not task['completed']:
+            due_date = datetime.fromisoformat(task['due_date'])
+            if due_date <= cutoff_date:
+                report += f"\n- {task['title']}"
+    return report
+
+
+def timed(function, repeat: int) -> float:
+    """Melhor tempo (ms) entre repeat execuções."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(sizes, repeat: int):
+    workdir = tempfile.mkdtemp(prefix="bench_weekly_report_")
+    os.chdir(workdir)
+
+    print(f"{'tarefas':>10} {'legado (ms)':>14} {'carga inicial (ms)':>20} {'incremental (ms)':>18} {'contadores (ms)':>17}")
+    for count in sizes:
+        store = JSONTaskStore(os.path.join(workdir, f"tasks_{count}.json"))
+        store.replace_all(make_tasks(count))
+
+        legacy = timed(lambda: legacy_weekly_report(store), repeat)
+
+        scheduler = AcademicScheduler(store=store)
+        start = time.perf_counter()
+        scheduler.generate_weekly_report()
+        cold = (time.perf_counter() - start) * 1000
+
+        # Relatório com os contadores já em memória, após uma tarefa concluída
+        scheduler._track(dict(store.get(2), completed=True))
+        warm = timed(scheduler.generate_weekly_report, repeat)
+        # Só o resumo (sem a lista de tarefas próximas, que cresce com a janela)
+        counters = timed(scheduler.counters.summary, repeat)
+
+        print(f"{count:>10,} {legacy:>14.1f} {cold:>20.1f} {warm:>18.2f} {counters:>17.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do relatório semanal: varredura completa vs contadores incrementais")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeat)
@@ -1,26 +1,93 @@
+import os
 import smtplib
+import sys
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import pandas as pd
 from datetime import datetime, timedelta
 import schedule
 import time
-from typing import Dict, List
-import json
-import os
+from typing import Dict, Iterable, List
+import itertools
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Execução direta (python src/automation/academic_scheduler.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automation.grade_backup import GradeBackupStore
+from automation.mail_delivery import MailDispatcher
+from automation.reminder_engine import ReminderEngine
+from automation.task_index import DueDateIndex
+from automation.task_stats import TaskCounters
+from automation.task_store import TaskStore, JSONTaskStore
+
+DAILY_SUMMARY_HEADER = """
+        Bom dia! Aqui está seu resumo de tarefas acadêmicas:
+        
+        TAREFAS PRÓXIMAS:
+        """
+
+DAILY_SUMMARY_FOOTER = """
+        
+        Dica: Organize seu tempo e não deixe para última hora!
+        
+        ---
+        CollegeFunctions Academic Scheduler
+        """
+
+def render_daily_summary(tasks: Iterable[Dict], now: datetime = None) -> str:
+    """
+    Monta o corpo do resumo diário de tarefas.
+    
+    Args:
+        tasks: Tarefas em ordem de prazo, com days_until_due ou due_date
+        now: Referência para days_until_due, quando ausente (padrão: datetime.now())
+    
+    Returns:
+        Corpo do email
+    """
+    now = now or datetime.now()
+    lines = [DAILY_SUMMARY_HEADER]
+    
+    for task in tasks:
+        days_left = task.get('days_until_due')
+        if days_left is None:
+            days_left = (datetime.fromisoformat(task['due_date']) - now).days
+        urgency = "🔴" if days_left <= 1 else "🟡" if days_left <= 3 else "🟢"
+        
+        lines.append(f"\n{urgency} {task['title']} ({task['course']}) - Vence em {days_left} dia(s)")
+    
+    lines.append(DAILY_SUMMARY_FOOTER)
+    return "".join(lines)
+
 class AcademicScheduler:
     """
     Sistema de automação para tarefas acadêmicas.
     """
     
-    def __init__(self, email_config: Dict = None):
+    REQUIRED_FIELDS = ['title', 'due_date', 'course', 'type']
+    # Antecedências dos lembretes de cada tarefa
+    REMINDER_OFFSETS = [timedelta(days=1), timedelta(hours=1)]
+    
+    def __init__(self, email_config: Dict = None, store: TaskStore = None,
+                 reminders: ReminderEngine = None, mailer: MailDispatcher = None):
         self.email_config = email_config or {}
         self.tasks_file = "academic_tasks.json"
+        # Padrão: arquivo JSON legado; SQLiteTaskStore para volume e concorrência
+        self.store = store or JSONTaskStore(self.tasks_file)
+        self._due_index = None
+        self._counters = None
+        self.reminders = reminders if reminders is not None else ReminderEngine()
+        self.reminders.callback = self._send_reminder
+        # Com um MailDispatcher, os emails saem em segundo plano por conexões reutilizadas
+        self.mailer = mailer
         self.backup_dir = Path("backups")
         self.backup_dir.mkdir(exist_ok=True)
-        
+        self._backups = None
+        # Os lembretes só existem em memória: refaz os das tarefas pendentes já gravadas
+        self._schedule_reminders_batch(self.store.query(completed=False))
+    
     def add_task(self, task: Dict) -> bool:
         """
         Adiciona uma nova tarefa acadêmica.
@@ -30,103 +97,218 @@ class AcademicScheduler:
             
         Returns:
             True se adicionado com sucesso
+            
+        Raises:
+            ValueError: Se faltar um campo obrigatório ou due_date for inválida
         """
-        required_fields = ['title', 'due_date', 'course', 'type']
-        if not all(field in task for field in required_fields):
+        if not all(field in task for field in self.REQUIRED_FIELDS):
             raise ValueError("Campos obrigatórios faltando")
+        try:
+            datetime.fromisoformat(task['due_date'])
+        except (TypeError, ValueError):
+            raise ValueError(f"Data de entrega inválida: {task['due_date']!r}")
         
-        tasks = self._load_tasks()
-        task['id'] = len(tasks) + 1
         task['created_at'] = datetime.now().isoformat()
         task['completed'] = False
         task['priority'] = task.get('priority', 'medium')
         
-        tasks.append(task)
-        self._save_tasks(tasks)
+        self.store.insert(task)
+        self._track(task)
         
         # Agendar lembretes
         self._schedule_reminders(task)
         
         return True
     
-    def get_upcoming_tasks(self, days_ahead: int = 7) -> List[Dict]:
+    def add_tasks(self, tasks: Iterable[Dict]) -> Dict:
         """
-        Retorna tarefas próximas.
+        Adiciona várias tarefas de uma vez (por exemplo, importadas do LMS).
+        
+        Todas as linhas são validadas numa única passagem e as válidas são
+        gravadas numa única escrita/transação. Linhas inválidas não
+        interrompem a importação; elas aparecem no relatório de erros.
         
         Args:
-            days_ahead: Dias a frente para buscar
-            
+            tasks: Iterável de dicts de tarefa
+        
         Returns:
-            Lista de tarefas
+            Dict com inserted (quantidade), ids e errors (lista de
+            {'row': posição, 'error': mensagem})
         """
-        tasks = self._load_tasks()
-        upcoming = []
+        created_at = datetime.now().isoformat()
+        valid = []
+        errors = []
+        
+        for row, task in enumerate(tasks):
+            missing = [field for field in self.REQUIRED_FIELDS if field not in task]
+            if missing:
+                errors.append({'row': row, 'error': f"Campos obrigatórios faltando: {', '.join(missing)}"})
+                continue
+            
+            try:
+                datetime.fromisoformat(task['due_date'])
+            except (TypeError, ValueError):
+                errors.append({'row': row, 'error': f"Data de entrega inválida: {task['due_date']!r}"})
+                continue
+            
+            task['created_at'] = created_at
+            task['completed'] = False
+            task['priority'] = task.get('priority', 'medium')
+            valid.append(task)
         
-        cutoff_date = datetime.now() + timedelta(days=days_ahead)
+        inserted = self.store.insert_many(valid) if valid else []
+        for task in inserted:
+            self._track(task)
         
-        for task in tasks:
-            if not task['completed']:
-                due_date = datetime.fromisoformat(task['due_date'])
-                if due_date <= cutoff_date:
-                    task['days_until_due'] = (due_date - datetime.now()).days
-                    upcoming.append(task)
+        self._schedule_reminders_batch(inserted)
         
-        return sorted(upcoming, key=lambda x: x['due_date'])
+        return {
+            'inserted': len(inserted),
+            'ids': [task['id'] for task in inserted],
+            'errors': errors
+        }
     
-    def send_daily_summary(self):
+    def complete_task(self, task_id: int) -> bool:
         """
-        Envia resumo diário de tarefas por email.
+        Marca uma tarefa como concluída.
+        
+        Args:
+            task_id: Id da tarefa
+        
+        Returns:
+            True se a tarefa existia
         """
-        tasks = self.get_upcoming_tasks(3)
+        task = self.store.update(task_id, {'completed': True})
+        if task is None:
+            return False
         
-        if not tasks:
-            return
+        self._track(task)
+        self._cancel_reminders(task_id)
+        return True
+    
+    def update_task(self, task_id: int, changes: Dict) -> bool:
+        """
+        Altera campos de uma tarefa (por exemplo, um novo prazo), reagendando
+        os lembretes dela.
         
-        subject = f"📚 Resumo Acadêmico - {datetime.now().strftime('%d/%m/%Y')}"
+        Args:
+            task_id: Id da tarefa
+            changes: Campos a alterar
         
-        body = f"""
-        Bom dia! Aqui está seu resumo de tarefas acadêmicas:
+        Returns:
+            True se a tarefa existia
+        """
+        if 'due_date' in changes:
+            datetime.fromisoformat(changes['due_date'])
         
-        TAREFAS PRÓXIMAS:
+        task = self.store.update(task_id, changes)
+        if task is None:
+            return False
+        
+        self._track(task)
+        self._schedule_reminders(task)
+        return True
+    
+    def check_reminders(self) -> int:
         """
+        Envia os lembretes vencidos.
         
-        for task in tasks:
-            days_left = task['days_until_due']
-            urgency = "🔴" if days_left <= 1 else "🟡" if days_left <= 3 else "🟢"
-            
-            body += f"\n{urgency} {task['title']} ({task['course']})"
-            body += f" - Vence em {days_left} dia(s)"
+        Para rodar continuamente, use self.reminders.run_forever ou
+        self.reminders.run (asyncio), que dormem até o próximo lembrete.
         
-        body += f"""
+        Returns:
+            Número de lembretes enviados
+        """
+        return self.reminders.run_pending()
+    
+    @property
+    def due_index(self) -> DueDateIndex:
+        """Índice das tarefas pendentes, carregado do armazenamento no primeiro uso."""
+        if self._due_index is None:
+            self._due_index = DueDateIndex(self.store.query(completed=False))
+        return self._due_index
+    
+    @property
+    def counters(self) -> TaskCounters:
+        """Contadores por disciplina, carregados do armazenamento no primeiro uso."""
+        if self._counters is None:
+            self._counters = TaskCounters(self.store.all())
+        return self._counters
+    
+    def refresh_index(self):
+        """Descarta o índice e os contadores em memória (por exemplo, após alterações externas no arquivo)."""
+        self._due_index = None
+        self._counters = None
+    
+    def get_upcoming_tasks(self, days_ahead: int = 7) -> List[Dict]:
+        """
+        Retorna tarefas próximas.
         
-        Dica: Organize seu tempo e não deixe para última hora!
+        Args:
+            days_ahead: Dias a frente para buscar
+            
+        Returns:
+            Lista de tarefas (visões somente leitura, com days_until_due)
+        """
+        now = datetime.now()
+        cutoff_date = now + timedelta(days=days_ahead)
         
-        ---
-        CollegeFunctions Academic Scheduler
+        return self.due_index.due_between(end=cutoff_date, now=now)
+    
+    def send_daily_summary(self):
+        """
+        Envia resumo diário de tarefas por email.
         """
+        tasks = self.get_upcoming_tasks(3)
+        
+        if not tasks:
+            return
+        
+        subject = f"📚 Resumo Acadêmico - {datetime.now().strftime('%d/%m/%Y')}"
+        body = render_daily_summary(tasks)
         
         self._send_email(subject, body)
     
-    def backup_grades(self, grades_data: Dict):
+    @property
+    def backups(self) -> GradeBackupStore:
+        """Armazenamento incremental dos backups de notas (em backup_dir)."""
+        if self._backups is None:
+            self._backups = GradeBackupStore(self.backup_dir)
+        return self._backups
+    
+    def backup_grades(self, grades_data: Dict, changed: Iterable[str] = None) -> Dict:
         """
         Faz backup automático das notas.
         
+        Só as disciplinas alteradas geram novos arquivos; backups antigos
+        seguem a política de retenção de GradeBackupStore.
+        
         Args:
             grades_data: Dict com dados de notas
+            changed: Disciplinas alteradas desde o último backup (opcional)
+        
+        Returns:
+            Dict com o resultado de GradeBackupStore.backup
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.backup_dir / f"grades_backup_{timestamp}.json"
+        result = self.backups.backup(grades_data, changed)
         
-        backup_data = {
-            'timestamp': datetime.now().isoformat(),
-            'grades': grades_data,
-            'total_courses': len(grades_data)
-        }
+        if result['snapshot'] is None:
+            print("Backup sem alterações")
+        else:
+            print(f"Backup salvo: {self.backups.snapshots_dir / result['snapshot']}")
+        return result
+    
+    def restore_grades(self, at: datetime = None) -> Dict:
+        """
+        Restaura as notas do backup mais recente feito até at.
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(backup_data, f, indent=2, ensure_ascii=False)
+        Args:
+            at: Momento desejado (padrão: o backup mais recente)
         
-        print(f"Backup salvo: {filename}")
+        Returns:
+            Dict com dados de notas
+        """
+        return self.backups.restore(at)
     
     def generate_weekly_report(self) -> str:
         """
@@ -135,39 +317,30 @@ class AcademicScheduler:
         Returns:
             String com o relatório
         """
-        tasks = self._load_tasks()
-        
-        completed = [t for t in tasks if t['completed']]
-        pending = [t for t in tasks if not t['completed']]
-        
-        # Análise por curso
-        course_stats = {}
-        for task in tasks:
-            course = task['course']
-            if course not in course_stats:
-                course_stats[course] = {'total': 0, 'completed': 0}
-            course_stats[course]['total'] += 1
-            if task['completed']:
-                course_stats[course]['completed'] += 1
+        return self._weekly_report(self.counters.summary(datetime.now()), self.get_upcoming_tasks(7))
+    
+    def _weekly_report(self, summary: Dict, upcoming: List[Dict]) -> str:
+        """Monta o relatório semanal a partir dos contadores e das tarefas próximas."""
+        completion_rate = summary['completed'] / summary['total'] * 100 if summary['total'] else 0.0
         
         report = f"""
         📊 RELATÓRIO SEMANAL ACADÊMICO
         
         RESUMO GERAL:
-        - Total de tarefas: {len(tasks)}
-        - Tarefas concluídas: {len(completed)}
-        - Tarefas pendentes: {len(pending)}
-        - Taxa de conclusão: {(len(completed)/len(tasks)*100):.1f}%
+        - Total de tarefas: {summary['total']}
+        - Tarefas concluídas: {summary['completed']}
+        - Tarefas pendentes: {summary['pending']}
+        - Tarefas atrasadas: {summary['overdue']}
+        - Taxa de conclusão: {completion_rate:.1f}%
         
         DESEMPENHO POR DISCIPLINA:
         """
         
-        for course, stats in course_stats.items():
+        for course, stats in summary['courses'].items():
             completion_rate = (stats['completed'] / stats['total']) * 100
             report += f"\n{course}: {stats['completed']}/{stats['total']} ({completion_rate:.1f}% concluído)"
         
         # Tarefas próximas
-        upcoming = self.get_upcoming_tasks(7)
         if upcoming:
             report += "\n\n📅 TAREFAS PRÓXIMAS (7 dias):"
             for task in upcoming:
@@ -176,29 +349,65 @@ class AcademicScheduler:
         
         return report
     
+    def _track(self, task: Dict):
+        """Atualiza o índice e os contadores em memória (se carregados) após gravar uma tarefa."""
+        if self._due_index is not None:
+            self._due_index.add(task)
+        if self._counters is not None:
+            self._counters.add(task)
+    
     def _load_tasks(self) -> List[Dict]:
-        """Carrega tarefas do arquivo."""
-        try:
-            if os.path.exists(self.tasks_file):
-                with open(self.tasks_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
-        except Exception as e:
-            print(f"Erro ao carregar tarefas: {e}")
-            return []
+        """Carrega tarefas do armazenamento."""
+        return self.store.all()
     
     def _save_tasks(self, tasks: List[Dict]):
-        """Salva tarefas no arquivo."""
-        try:
-            with open(self.tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(tasks, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Erro ao salvar tarefas: {e}")
+        """Salva tarefas no armazenamento."""
+        self.store.replace_all(tasks)
+        self.refresh_index()
     
     def _schedule_reminders(self, task: Dict):
-        """Agenda lembretes para uma tarefa."""
-        # Implementação básica - em produção poderia usar agendamento mais sofisticado
-        pass
+        """Agenda (ou reagenda) os lembretes de uma tarefa."""
+        self._cancel_reminders(task['id'])
+        self.reminders.schedule_many(self._reminder_entries(task))
+    
+    def _schedule_reminders_batch(self, tasks: List[Dict]):
+        """Agenda lembretes para várias tarefas de uma vez."""
+        self.reminders.schedule_many(
+            entry for task in tasks for entry in self._reminder_entries(task)
+        )
+    
+    def _reminder_entries(self, task: Dict) -> List[tuple]:
+        """Lembretes futuros de uma tarefa pendente, como (id, horário, payload)."""
+        if task['completed']:
+            return []
+        
+        try:
+            due = datetime.fromisoformat(task['due_date'])
+        except (TypeError, ValueError):
+            # Linhas antigas gravadas antes da validação de due_date
+            return []
+        now = datetime.fromtimestamp(self.reminders.clock.now())
+        return [
+            ((task['id'], offset), due - offset, task)
+            for offset in self.REMINDER_OFFSETS
+            if due - offset > now
+        ]
+    
+    def _cancel_reminders(self, task_id: int):
+        """Cancela os lembretes pendentes de uma tarefa."""
+        for offset in self.REMINDER_OFFSETS:
+            self.reminders.cancel((task_id, offset))
+    
+    def _send_reminder(self, reminder_id: tuple, task: Dict):
+        """Callback do motor de lembretes: envia o aviso da tarefa."""
+        self._send_email(*self._reminder_text(task))
+    
+    def _reminder_text(self, task: Dict) -> tuple:
+        """Assunto e corpo do lembrete de uma tarefa."""
+        due = datetime.fromisoformat(task['due_date'])
+        subject = f"🔔 Lembrete: {task['title']}"
+        body = f"{task['title']} ({task['course']}) vence em {due.strftime('%d/%m/%Y %H:%M')}."
+        return subject, body
     
     def _send_email(self, subject: str, body: str):
         """Envia email (simulado)."""
@@ -208,14 +417,18 @@ class AcademicScheduler:
             print(f"Corpo: {body}")
             return
         
+        msg = MIMEMultipart()
+        msg['From'] = self.email_config['sender']
+        msg['To'] = self.email_config['recipient']
+        msg['Subject'] = subject
+        
+        msg.attach(MIMEText(body, 'plain'))
+        
+        if self.mailer is not None:
+            self.mailer.submit(msg)
+            return
+        
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config['sender']
-            msg['To'] = self.email_config['recipient']
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
             server = smtplib.SMTP(self.email_config['smtp_server'], 587)
             server.starttls()
             server.login(self.email_config['username'], self.email_config['password'])
@@ -230,12 +443,22 @@ class AcademicScheduler:
 class TaskReminder:
     """
     Sistema de lembretes para tarefas específicas.
+    
+    Os lembretes ficam num ReminderEngine (min-heap por horário), então
+    check_reminders só visita os lembretes vencidos e os já enviados são
+    descartados.
     """
     
-    def __init__(self):
-        self.reminders = []
+    def __init__(self, clock=None):
+        self.engine = ReminderEngine(callback=self._notify, clock=clock)
+        self._ids = itertools.count(1)
+    
+    @property
+    def reminders(self) -> List[Dict]:
+        """Lembretes ainda não enviados, em ordem de horário."""
+        return [payload for _, _, payload in self.engine.pending()]
     
-    def add_reminder(self, task_name: str, reminder_time: datetime, message: str):
+    def add_reminder(self, task_name: str, reminder_time: datetime, message: str) -> int:
         """
         Adiciona um lembrete.
         
@@ -243,22 +466,28 @@ class TaskReminder:
             task_name: Nome da tarefa
             reminder_time: Quando lembrar
             message: Mensagem do lembrete
+        
+        Returns:
+            Id do lembrete (para cancel_reminder)
         """
-        self.reminders.append({
+        reminder_id = next(self._ids)
+        self.engine.schedule(reminder_id, reminder_time, {
             'task': task_name,
             'time': reminder_time,
-            'message': message,
-            'notified': False
+            'message': message
         })
+        return reminder_id
     
-    def check_reminders(self):
+    def cancel_reminder(self, reminder_id: int) -> bool:
+        """Cancela um lembrete ainda não enviado."""
+        return self.engine.cancel(reminder_id)
+    
+    def check_reminders(self) -> int:
         """Verifica e executa lembretes pendentes."""
-        now = datetime.now()
-        
-        for reminder in self.reminders:
-            if not reminder['notified'] and now >= reminder['time']:
-                print(f"🔔 LEMBRETE: {reminder['message']}")
-                reminder['notified'] = True
+        return self.engine.run_pending()
+    
+    def _notify(self, reminder_id: int, reminder: Dict):
+        print(f"🔔 LEMBRETE: {reminder['message']}")
 
 if __name__ == "__main__":
     # Exemplo de uso
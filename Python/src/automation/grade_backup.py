@@ -0,0 +1,222 @@
+import gzip
+import hashlib
+import json
+import os
+import zlib
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (idade máxima, intervalo): um snapshot por hora no último dia, um por dia no último mês
+DEFAULT_RETENTION = [(timedelta(days=1), timedelta(hours=1)), (timedelta(days=30), timedelta(days=1))]
+
+SNAPSHOT_FORMAT = "%Y%m%dT%H%M%S%f"
+
+class GradeBackupStore:
+    """
+    Backups incrementais de notas, endereçados por conteúdo.
+    
+    As notas de cada disciplina são serializadas, comprimidas (zlib) e
+    gravadas em objects/ com o nome do seu hash SHA-256; disciplinas
+    iguais a um backup anterior reaproveitam o objeto existente. Cada
+    backup é só um manifesto pequeno (snapshots/<timestamp>.json.gz)
+    mapeando disciplina -> hash, então o espaço em disco cresce com o
+    tamanho das mudanças, não com o volume total de notas.
+    """
+    
+    def __init__(self, root="backups", retention: List[Tuple[timedelta, timedelta]] = None,
+                 prune_interval: Optional[timedelta] = timedelta(hours=1),
+                 clock: Callable[[], datetime] = datetime.now):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.retention = retention if retention is not None else DEFAULT_RETENTION
+        self.prune_interval = prune_interval
+        self.clock = clock
+        
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        self._latest: Optional[Dict] = None
+        self._last_prune: Optional[datetime] = None
+    
+    def backup(self, grades_data: Dict[str, List[float]], changed: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Grava um backup incremental.
+        
+        Args:
+            grades_data: Dict {disciplina: notas}
+            changed: Disciplinas alteradas desde o último backup, se conhecidas.
+                As demais reaproveitam o hash anterior sem serem serializadas,
+                então o custo passa a depender só do tamanho da mudança.
+        
+        Returns:
+            Dict com snapshot (nome do manifesto, ou None se nada mudou),
+            written (objetos novos), reused e bytes_written
+        """
+        previous = self._latest_manifest()
+        previous_courses = previous['courses'] if previous else {}
+        
+        if changed is None or previous is None:
+            to_hash = list(grades_data)
+        else:
+            changed = set(changed)
+            to_hash = [course for course in grades_data
+                       if course in changed or course not in previous_courses]
+        
+        hashed = set(to_hash)
+        courses = {course: previous_courses[course] for course in grades_data if course not in hashed}
+        written = 0
+        bytes_written = 0
+        for course in to_hash:
+            digest, size = self._write_object(grades_data[course])
+            courses[course] = digest
+            if size:
+                written += 1
+                bytes_written += size
+        
+        result = {'snapshot': None, 'written': written, 'reused': len(courses) - written,
+                  'bytes_written': bytes_written}
+        if courses == previous_courses and previous is not None:
+            return result
+        
+        timestamp = self.clock()
+        manifest = {
+            'timestamp': timestamp.isoformat(),
+            'courses': {course: courses[course] for course in grades_data},
+            'total_courses': len(grades_data)
+        }
+        name = timestamp.strftime(SNAPSHOT_FORMAT)
+        data = gzip.compress(json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+        self._atomic_write(self.snapshots_dir / f"{name}.json.gz", data)
+        self._latest = manifest
+        
+        result['snapshot'] = name
+        result['bytes_written'] += len(data)
+        
+        if self.prune_interval is not None and (
+                self._last_prune is None or timestamp - self._last_prune >= self.prune_interval):
+            self.prune(timestamp)
+        return result
+    
+    def snapshots(self) -> List[datetime]:
+        """Horários dos backups disponíveis, em ordem crescente."""
+        return [datetime.strptime(name, SNAPSHOT_FORMAT) for name in self._snapshot_names()]
+    
+    def restore(self, at: Optional[datetime] = None) -> Dict[str, List[float]]:
+        """
+        Restaura as notas de um ponto no tempo.
+        
+        Args:
+            at: Momento desejado (padrão: o backup mais recente). Usa o último
+                backup feito até esse momento.
+        
+        Returns:
+            Dict {disciplina: notas}
+        
+        Raises:
+            LookupError: Se não houver backup até o momento pedido
+        """
+        names = self._snapshot_names()
+        if at is not None:
+            names = names[:bisect_right(names, at.strftime(SNAPSHOT_FORMAT))]
+        if not names:
+            raise LookupError("Nenhum backup disponível até o momento pedido")
+        
+        manifest = self._read_manifest(names[-1])
+        return {course: self._read_object(digest) for course, digest in manifest['courses'].items()}
+    
+    def prune(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Aplica a política de retenção e remove objetos sem referência.
+        
+        Em cada janela (idade máxima, intervalo) fica o backup mais recente de
+        cada intervalo; backups mais antigos que todas as janelas são
+        apagados. O backup mais recente é sempre mantido.
+        
+        Returns:
+            Dict com snapshots_removed e objects_removed
+        """
+        now = now or self.clock()
+        names = self._snapshot_names()
+        keep = set(names[-1:])
+        buckets = set()
+        
+        for name in reversed(names):
+            timestamp = datetime.strptime(name, SNAPSHOT_FORMAT)
+            for window, interval in self.retention:
+                if now - timestamp <= window:
+                    bucket = (window, timestamp.timestamp() // interval.total_seconds())
+                    if bucket not in buckets:
+                        buckets.add(bucket)
+                        keep.add(name)
+                    break
+        
+        removed = [name for name in names if name not in keep]
+        for name in removed:
+            (self.snapshots_dir / f"{name}.json.gz").unlink()
+        
+        # Marca e varre: objetos que nenhum backup mantido referencia
+        referenced = set()
+        for name in keep:
+            referenced.update(self._read_manifest(name)['courses'].values())
+        
+        objects_removed = 0
+        for path in self.objects_dir.glob("*/*"):
+            if path.name not in referenced:
+                path.unlink()
+                objects_removed += 1
+        
+        self._last_prune = now
+        return {'snapshots_removed': len(removed), 'objects_removed': objects_removed}
+    
+    def _snapshot_names(self) -> List[str]:
+        """Nomes dos manifestos (ordenáveis por tempo)."""
+        return sorted(path.name[:-len(".json.gz")] for path in self.snapshots_dir.glob("*.json.gz"))
+    
+    def _latest_manifest(self) -> Optional[Dict]:
+        """Manifesto mais recente (em cache depois da primeira leitura)."""
+        if self._latest is None:
+            names = self._snapshot_names()
+            if names:
+                self._latest = self._read_manifest(names[-1])
+        return self._latest
+    
+    def _read_manifest(self, name: str) -> Dict:
+        with gzip.open(self.snapshots_dir / f"{name}.json.gz", 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+    
+    def _write_object(self, grades: List[float]) -> Tuple[str, int]:
+        """Grava as notas de uma disciplina, se ainda não existirem; retorna (hash, bytes gravados)."""
+        raw = json.dumps(grades, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest)
+        if path.exists():
+            return digest, 0
+        
+        path.parent.mkdir(exist_ok=True)
+        data = zlib.compress(raw, 6)
+        self._atomic_write(path, data)
+        return digest, len(data)
+    
+    def _read_object(self, digest: str) -> List[float]:
+        return json.loads(zlib.decompress(self._object_path(digest).read_bytes()))
+    
+    def _atomic_write(self, path: Path, data: bytes):
+        """Grava num arquivo temporário e renomeia, para nunca deixar arquivos pela metade."""
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+if __name__ == "__main__":
+    # Exemplo de uso: só a disciplina alterada gera um novo objeto
+    store = GradeBackupStore("backups_exemplo")
+    grades = {"Cálculo I": [85, 90, 78], "Programação": [92, 88, 95], "Física": [75, 82, 80]}
+    
+    print(store.backup(grades))
+    grades["Física"].append(91)
+    print(store.backup(grades, changed=["Física"]))
+    print(store.restore())
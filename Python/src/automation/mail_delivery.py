@@ -0,0 +1,336 @@
+import queue
+import random
+import smtplib
+import socket
+import threading
+import time
+from collections import deque
+from email.message import Message
+from typing import Callable, Dict, List, Optional
+
+# Falhas que justificam nova tentativa (conexão caiu, servidor ocupado...)
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, socket.timeout)
+
+class SMTPConnectionPool:
+    """
+    Pool de conexões SMTP persistentes.
+    
+    Cada conexão faz STARTTLS e login uma única vez e é reutilizada para
+    várias mensagens, até max_messages_per_connection (depois é renovada,
+    já que muitos servidores limitam mensagens por sessão).
+    """
+    
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None,
+                 password: Optional[str] = None, starttls: bool = True, size: int = 4,
+                 timeout: float = 30.0, max_messages_per_connection: int = 100,
+                 smtp_factory: Callable = smtplib.SMTP):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.timeout = timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.smtp_factory = smtp_factory
+        self.connections_opened = 0
+        
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._sent: Dict[int, int] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, email_config: Dict, **kwargs) -> 'SMTPConnectionPool':
+        """
+        Cria o pool a partir do email_config do AcademicScheduler.
+        
+        Args:
+            email_config: Dict com smtp_server, username, password e,
+                opcionalmente, smtp_port e starttls
+        """
+        return cls(email_config['smtp_server'], email_config.get('smtp_port', 587),
+                   email_config.get('username'), email_config.get('password'),
+                   starttls=email_config.get('starttls', True), **kwargs)
+    
+    def acquire(self, timeout: Optional[float] = None) -> smtplib.SMTP:
+        """
+        Obtém uma conexão (ociosa ou nova), esperando se o pool estiver cheio.
+        
+        Raises:
+            TimeoutError: Se nenhuma conexão ficar livre a tempo
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Nenhuma conexão SMTP disponível")
+        
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        try:
+            return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+    
+    def release(self, connection: smtplib.SMTP, messages: int = 0, broken: bool = False):
+        """
+        Devolve uma conexão ao pool.
+        
+        Args:
+            connection: Conexão obtida com acquire
+            messages: Mensagens enviadas nesta posse da conexão
+            broken: Se a conexão falhou e deve ser descartada
+        """
+        with self._lock:
+            total = self._sent.get(id(connection), 0) + messages
+            retire = broken or total >= self.max_messages_per_connection
+            if retire:
+                self._sent.pop(id(connection), None)
+            else:
+                self._sent[id(connection)] = total
+        
+        if retire:
+            self._quit(connection)
+        else:
+            self._idle.put(connection)
+        self._slots.release()
+    
+    def close(self):
+        """Encerra as conexões ociosas."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._sent.pop(id(connection), None)
+            self._quit(connection)
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Abre uma conexão autenticada."""
+        connection = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password)
+        except BaseException:
+            self._quit(connection)
+            raise
+        
+        with self._lock:
+            self._sent[id(connection)] = 0
+            self.connections_opened += 1
+        return connection
+    
+    def _quit(self, connection: smtplib.SMTP):
+        """Fecha a conexão ignorando erros (ela pode já ter caído)."""
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+class MailDispatcher:
+    """
+    Envio de emails em segundo plano sobre um SMTPConnectionPool.
+    
+    As mensagens entram numa fila limitada (submit bloqueia quando ela está
+    cheia) e threads de trabalho as enviam em lotes, um lote por conexão
+    emprestada do pool. Falhas transitórias (conexão perdida, respostas 4xx)
+    são repetidas com backoff exponencial; falhas permanentes (5xx,
+    destinatário recusado) contam como failed.
+    """
+    
+    def __init__(self, pool: SMTPConnectionPool, workers: int = 4, queue_size: int = 10_000,
+                 batch_size: int = 50, max_retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30.0, sleep: Callable[[float], None] = time.sleep):
+        self.pool = pool
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.errors: deque = deque(maxlen=100)
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> 'MailDispatcher':
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def start(self):
+        """Inicia as threads de envio (chamado automaticamente por submit)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"mail-worker-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+    
+    def submit(self, message: Message, block: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Enfileira uma mensagem para envio.
+        
+        Args:
+            message: Mensagem com From, To e Subject
+            block: Esperar se a fila estiver cheia
+            timeout: Espera máxima (segundos)
+        
+        Returns:
+            False se a fila estava cheia e a mensagem não foi aceita
+        """
+        self.start()
+        try:
+            self._queue.put(message, block, timeout)
+        except queue.Full:
+            return False
+        return True
+    
+    def flush(self):
+        """Espera até todas as mensagens enfileiradas serem processadas."""
+        self._queue.join()
+    
+    def close(self):
+        """Envia o que estiver na fila, para as threads e fecha o pool."""
+        self.flush()
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.pool.close()
+    
+    def stats(self) -> Dict:
+        """
+        Retorna os contadores de envio.
+        
+        Returns:
+            Dict com sent, failed, retried, queued e connections_opened
+        """
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+            'queued': self._queue.qsize(),
+            'connections_opened': self.pool.connections_opened
+        }
+    
+    def _work(self):
+        """Laço das threads: retira um lote da fila e o envia."""
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.2)]
+            except queue.Empty:
+                continue
+            
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._send_batch(batch)
+            except Exception as e:
+                # Nunca deixa a thread morrer: flush/close dependem dela
+                self._record(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _send_batch(self, batch: List[Message]):
+        """Envia um lote, repetindo as mensagens com falha transitória."""
+        pending = [(message, 0) for message in batch]
+        
+        while pending:
+            retry = []
+            try:
+                connection = self.pool.acquire()
+            except Exception as e:
+                # Não conseguiu nem conectar: todo o lote volta para nova tentativa
+                retry = [(message, attempt + 1) for message, attempt in pending]
+                self._record(e)
+            else:
+                sent = 0
+                broken = False
+                try:
+                    for position, (message, attempt) in enumerate(pending):
+                        try:
+                            connection.send_message(message)
+                            sent += 1
+                            self._count('sent')
+                        except TRANSIENT_ERRORS as e:
+                            # A conexão não serve mais: o restante do lote vai para outra
+                            broken = True
+                            retry.append((message, attempt + 1))
+                            retry.extend(pending[position + 1:])
+                            self._record(e)
+                            break
+                        except smtplib.SMTPResponseException as e:
+                            if 400 <= e.smtp_code < 500:
+                                retry.append((message, attempt + 1))
+                            else:
+                                self._count('failed')
+                            self._record(e)
+                        except smtplib.SMTPException as e:
+                            self._count('failed')
+                            self._record(e)
+                        except Exception as e:
+                            # Mensagem malformada, OSError não transitório...: falha
+                            # permanente, e a conexão pode ter ficado num estado incerto
+                            broken = True
+                            self._count('failed')
+                            self._record(e)
+                            retry.extend(pending[position + 1:])
+                            break
+                finally:
+                    self.pool.release(connection, messages=sent, broken=broken)
+            
+            pending = []
+            for message, attempt in retry:
+                if attempt > self.max_retries:
+                    self._count('failed')
+                else:
+                    pending.append((message, attempt))
+            
+            if pending:
+                self._count('retried', len(pending))
+                attempt = max(attempt for _, attempt in pending)
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                self.sleep(delay * random.uniform(0.5, 1.0))
+    
+    def _count(self, counter: str, amount: int = 1):
+        """Incrementa um contador de forma segura entre threads."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+    
+    def _record(self, error: Exception):
+        """Guarda os erros mais recentes para diagnóstico."""
+        self.errors.append(repr(error))
+
+if __name__ == "__main__":
+    # Exemplo de uso: resumo diário para uma turma inteira
+    from email.mime.text import MIMEText
+    
+    pool = SMTPConnectionPool("smtp.gmail.com", 587, "seu_email@gmail.com", "sua_senha")
+    with MailDispatcher(pool, workers=4) as mailer:
+        for number in range(1000):
+            msg = MIMEText("Você tem 3 tarefas para esta semana.", 'plain')
+            msg['From'] = "seu_email@gmail.com"
+            msg['To'] = f"aluno{number}@universidade.edu"
+            msg['Subject'] = "📚 Resumo Acadêmico"
+            mailer.submit(msg)
+    print(mailer.stats())
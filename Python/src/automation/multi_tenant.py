@@ -0,0 +1,236 @@
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+if __package__ in (None, ""):
+    # Execução direta (python src/automation/multi_tenant.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automation.academic_scheduler import AcademicScheduler, render_daily_summary
+from automation.mail_delivery import MailDispatcher
+from automation.task_stats import TaskCounters
+from automation.task_store import TaskStore
+from utils.parallel import map_chunks
+
+class MultiTenantScheduler(AcademicScheduler):
+    """
+    AcademicScheduler que atende vários estudantes a partir de um único
+    armazenamento compartilhado (de preferência SQLiteTaskStore).
+    
+    Cada tarefa traz o student_id do seu dono e students mapeia cada
+    student_id para o seu email. O resumo diário de todos os estudantes sai
+    de uma única consulta agrupada por estudante; os corpos são montados em
+    paralelo, em blocos, e entregues pelo MailDispatcher. Lembretes também
+    vão para o email do dono da tarefa, nunca para um destinatário único.
+    """
+    
+    def __init__(self, store: TaskStore, students: Dict[str, str], email_config: Dict = None,
+                 mailer: MailDispatcher = None, workers: Optional[int] = None, chunk_size: int = 1000):
+        super().__init__(email_config=email_config, store=store, mailer=mailer)
+        self.students = students
+        self.workers = os.cpu_count() if workers is None else workers
+        self.chunk_size = chunk_size
+    
+    def add_task(self, task: Dict) -> bool:
+        """
+        Adiciona uma tarefa de um estudante.
+        
+        Args:
+            task: Dict com detalhes da tarefa, incluindo student_id
+        """
+        if task.get('student_id') not in self.students:
+            raise ValueError(f"Estudante desconhecido: {task.get('student_id')!r}")
+        return super().add_task(task)
+    
+    def add_tasks(self, tasks: Iterable[Dict]) -> Dict:
+        """
+        Adiciona tarefas de vários estudantes de uma vez (ver
+        AcademicScheduler.add_tasks); linhas de estudantes desconhecidos
+        entram no relatório de erros.
+        """
+        rows = []
+        valid = []
+        errors = []
+        for row, task in enumerate(tasks):
+            if task.get('student_id') not in self.students:
+                errors.append({'row': row, 'error': f"Estudante desconhecido: {task.get('student_id')!r}"})
+                continue
+            rows.append(row)
+            valid.append(task)
+        
+        result = super().add_tasks(valid)
+        errors.extend({'row': rows[error['row']], 'error': error['error']} for error in result['errors'])
+        result['errors'] = sorted(errors, key=lambda error: error['row'])
+        return result
+    
+    def get_upcoming_tasks(self, days_ahead: int = 7, student_id: Optional[str] = None) -> List[Dict]:
+        """
+        Retorna as tarefas próximas de um estudante.
+        
+        Args:
+            days_ahead: Dias a frente para buscar
+            student_id: Estudante (obrigatório: as tarefas de todos não se misturam)
+        
+        Returns:
+            Lista de tarefas do estudante
+        """
+        if student_id is None:
+            raise ValueError("Informe student_id (ou use upcoming_by_student)")
+        return [task for task in super().get_upcoming_tasks(days_ahead) if task.get('student_id') == student_id]
+    
+    def send_daily_summary(self) -> Dict:
+        """Resumo diário: um email por estudante (ver send_daily_summaries)."""
+        return self.send_daily_summaries(3)
+    
+    def generate_weekly_report(self, student_id: Optional[str] = None) -> str:
+        """
+        Gera o relatório semanal de um estudante ou, sem student_id, os de
+        todos os estudantes com tarefas, um após o outro.
+        
+        Args:
+            student_id: Estudante (padrão: todos)
+        
+        Returns:
+            String com o relatório
+        """
+        if student_id is not None:
+            return next(self.generate_weekly_reports([student_id]))[1]
+        return "\n".join(f"\n👤 ESTUDANTE {student_id}{report}" for student_id, report in self.generate_weekly_reports())
+    
+    def generate_weekly_reports(self, student_ids: Optional[Iterable[str]] = None,
+                                now: Optional[datetime] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Gera um relatório semanal por estudante, cada um só com as tarefas dele.
+        
+        Args:
+            student_ids: Estudantes incluídos, mesmo sem tarefas (padrão: todos
+                com tarefas)
+            now: Referência para atrasadas (padrão: datetime.now())
+        
+        Returns:
+            Iterador de (student_id, relatório), em ordem de student_id
+        """
+        now = now or datetime.now()
+        wanted = None if student_ids is None else set(student_ids)
+        tasks = defaultdict(list)
+        for task in self.store.all():
+            if task.get('student_id') is not None and (wanted is None or task['student_id'] in wanted):
+                tasks[task['student_id']].append(task)
+        upcoming = defaultdict(list)
+        for task in super().get_upcoming_tasks(7):
+            upcoming[task.get('student_id')].append(task)
+        
+        for student_id in sorted(tasks if wanted is None else wanted):
+            yield student_id, self._weekly_report(TaskCounters(tasks[student_id]).summary(now), upcoming[student_id])
+    
+    def upcoming_by_student(self, days_ahead: int = 3,
+                            now: Optional[datetime] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Equivalente a get_upcoming_tasks(days_ahead) para todos os estudantes,
+        numa única consulta.
+        
+        Returns:
+            Iterador de (student_id, tarefas em ordem de prazo)
+        """
+        now = now or datetime.now()
+        return self.store.pending_by_student((now + timedelta(days=days_ahead)).isoformat())
+    
+    def send_daily_summaries(self, days_ahead: int = 3, now: Optional[datetime] = None) -> Dict:
+        """
+        Envia o resumo diário para todos os estudantes com tarefas próximas.
+        
+        Args:
+            days_ahead: Janela de tarefas (como em send_daily_summary)
+            now: Referência de tempo (padrão: datetime.now())
+        
+        Returns:
+            Dict com summaries (emails enfileirados), skipped (estudantes sem
+            email cadastrado) e seconds
+        """
+        start = time.perf_counter()
+        now = now or datetime.now()
+        subject = f"📚 Resumo Acadêmico - {now.strftime('%d/%m/%Y')}"
+        sender = self.email_config.get('sender')
+        summaries = 0
+        skipped = 0
+        
+        groups = (
+            (student_id, [self._summary_fields(task) for task in tasks])
+            for student_id, tasks in self.upcoming_by_student(days_ahead, now)
+        )
+        for chunk in self.render_chunks(groups, now):
+            for student_id, body in chunk:
+                recipient = self.students.get(student_id)
+                if recipient is None:
+                    skipped += 1
+                    continue
+                
+                msg = MIMEText(body, 'plain')
+                msg['From'] = sender
+                msg['To'] = recipient
+                msg['Subject'] = subject
+                self._deliver(msg)
+                summaries += 1
+        
+        return {'summaries': summaries, 'skipped': skipped, 'seconds': time.perf_counter() - start}
+    
+    def render_chunks(self, groups: Iterable[Tuple[str, List[Dict]]],
+                      now: datetime) -> Iterator[List[Tuple[str, str]]]:
+        """
+        Monta os corpos dos resumos bloco a bloco, em paralelo quando workers > 1.
+        
+        Returns:
+            Iterador de listas (student_id, corpo), na ordem de entrada
+        """
+        return map_chunks(partial(_render_chunk, now=now), groups, self.chunk_size, self.workers)
+    
+    def _send_reminder(self, reminder_id: tuple, task: Dict):
+        """Callback do motor de lembretes: avisa o dono da tarefa."""
+        recipient = self.students.get(task.get('student_id'))
+        if recipient is None:
+            raise ValueError(f"Estudante sem email cadastrado: {task.get('student_id')!r}")
+        
+        subject, body = self._reminder_text(task)
+        msg = MIMEText(body, 'plain')
+        msg['From'] = self.email_config.get('sender')
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        self._deliver(msg)
+    
+    def _deliver(self, msg: MIMEText):
+        """Enfileira no mailer ou, sem mailer, só mostra o email."""
+        if self.mailer is not None:
+            self.mailer.submit(msg)
+        else:
+            print(f"Para: {msg['To']} | Assunto: {msg['Subject']}")
+    
+    def _summary_fields(self, task: Dict) -> Dict:
+        """Só os campos usados no resumo (menos dados enviados aos processos)."""
+        return {'title': task['title'], 'course': task['course'], 'due_date': task['due_date']}
+
+def _render_chunk(chunk: List[Tuple[str, List[Dict]]], now: datetime) -> List[Tuple[str, str]]:
+    """Monta os resumos de um bloco de estudantes (executado nos processos do pool)."""
+    return [(student_id, render_daily_summary(tasks, now)) for student_id, tasks in chunk]
+
+if __name__ == "__main__":
+    # Exemplo de uso: três estudantes num único banco
+    from automation.task_store import SQLiteTaskStore
+    
+    students = {f"2024{i:04d}": f"aluno{i}@universidade.edu" for i in range(3)}
+    scheduler = MultiTenantScheduler(SQLiteTaskStore(":memory:"), students, workers=1)
+    
+    for number, student_id in enumerate(students):
+        scheduler.add_task({
+            'title': f'Lista {number + 1} de Cálculo',
+            'due_date': (datetime.now() + timedelta(days=number + 1)).isoformat(),
+            'course': 'Cálculo I',
+            'type': 'assignment',
+            'student_id': student_id
+        })
+    
+    print(scheduler.send_daily_summaries())
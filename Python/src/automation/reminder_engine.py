@@ -0,0 +1,317 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+Moment = Union[datetime, float]
+
+class SystemClock:
+    """Relógio real (time.time), usado por padrão."""
+    
+    def now(self) -> float:
+        return time.time()
+    
+    def wait(self, condition: threading.Condition, seconds: Optional[float]):
+        """Espera até seconds ou até ser acordado por notify."""
+        condition.wait(seconds)
+    
+    async def wait_async(self, event: asyncio.Event, seconds: Optional[float]):
+        """Versão asyncio de wait."""
+        try:
+            await asyncio.wait_for(event.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+class FakeClock:
+    """
+    Relógio controlado manualmente, para testes. Esperas com prazo avançam o
+    relógio instantaneamente em vez de dormir; sem prazo, esperam um notify.
+    """
+    
+    def __init__(self, start: float = 0.0):
+        self.current = start
+    
+    def now(self) -> float:
+        return self.current
+    
+    def advance(self, seconds: float):
+        self.current += seconds
+    
+    def wait(self, condition: threading.Condition, seconds: Optional[float]):
+        if seconds is None:
+            # Nada agendado: espera de verdade por um notify (novo lembrete ou wake)
+            condition.wait()
+        else:
+            self.advance(seconds)
+    
+    async def wait_async(self, event: asyncio.Event, seconds: Optional[float]):
+        if seconds is not None:
+            self.advance(seconds)
+        await asyncio.sleep(0)
+
+class ReminderEngine:
+    """
+    Agendador de lembretes baseado em min-heap ordenado pelo horário de disparo.
+    
+    Inclusão e disparo custam O(log n). Cancelamentos marcam a entrada como
+    inativa (remoção preguiçosa) e o heap é compactado quando as entradas
+    inativas passam da metade. Os laços run_forever/run dormem até o próximo
+    lembrete em vez de varrer a lista periodicamente.
+    """
+    
+    def __init__(self, callback: Optional[Callable[[Hashable, Any], None]] = None,
+                 clock=None, compact_threshold: int = 1024):
+        self.callback = callback
+        self.clock = clock or SystemClock()
+        self.compact_threshold = compact_threshold
+        self.fired = 0
+        self.failed = 0
+        self.errors: deque = deque(maxlen=100)
+        
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._inactive = 0
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        self._condition = threading.Condition(self._lock)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, reminder_id: Hashable) -> bool:
+        return reminder_id in self._entries
+    
+    def schedule(self, reminder_id: Hashable, fire_at: Moment, payload: Any = None):
+        """
+        Agenda (ou reagenda, se o id já existir) um lembrete.
+        
+        Args:
+            reminder_id: Identificador do lembrete
+            fire_at: Quando disparar (datetime ou timestamp)
+            payload: Dados entregues ao callback
+        """
+        with self._lock:
+            self._discard(reminder_id)
+            entry = [_timestamp(fire_at), next(self._counter), reminder_id, payload, True]
+            self._entries[reminder_id] = entry
+            heapq.heappush(self._heap, entry)
+            self._notify(entry)
+            self._maybe_compact()
+    
+    def schedule_many(self, reminders: Iterable[Tuple[Hashable, Moment, Any]]):
+        """
+        Agenda vários lembretes de uma vez.
+        
+        Lotes pequenos em relação ao heap entram com heappush
+        (O(k log n)); cargas grandes, com um único heapify (O(n + k)).
+        
+        Args:
+            reminders: Iterável de (id, fire_at, payload)
+        """
+        with self._lock:
+            entries = []
+            for reminder_id, fire_at, payload in reminders:
+                self._discard(reminder_id)
+                entry = [_timestamp(fire_at), next(self._counter), reminder_id, payload, True]
+                self._entries[reminder_id] = entry
+                entries.append(entry)
+            if not entries:
+                return
+            
+            top = self._heap[0] if self._heap else None
+            if len(entries) * max(1, len(self._heap).bit_length()) < len(self._heap) + len(entries):
+                for entry in entries:
+                    heapq.heappush(self._heap, entry)
+            else:
+                self._heap.extend(entries)
+                heapq.heapify(self._heap)
+            if self._heap[0] is not top:
+                self._notify(self._heap[0])
+            self._maybe_compact()
+    
+    def cancel(self, reminder_id: Hashable) -> bool:
+        """
+        Cancela um lembrete pendente.
+        
+        Args:
+            reminder_id: Identificador do lembrete
+        
+        Returns:
+            True se o lembrete estava pendente
+        """
+        with self._lock:
+            cancelled = self._discard(reminder_id)
+            self._maybe_compact()
+            return cancelled
+    
+    def reschedule(self, reminder_id: Hashable, fire_at: Moment) -> bool:
+        """
+        Muda o horário de um lembrete pendente, mantendo o payload.
+        
+        Returns:
+            True se o lembrete existia
+        """
+        with self._lock:
+            entry = self._entries.get(reminder_id)
+            if entry is None:
+                return False
+            self.schedule(reminder_id, fire_at, entry[3])
+            return True
+    
+    def compact(self):
+        """Remove as entradas inativas do heap."""
+        with self._lock:
+            self._heap = [entry for entry in self._heap if entry[4]]
+            heapq.heapify(self._heap)
+            self._inactive = 0
+    
+    def next_fire_time(self) -> Optional[float]:
+        """Timestamp do próximo lembrete pendente, ou None."""
+        with self._lock:
+            self._drop_inactive_top()
+            return self._heap[0][0] if self._heap else None
+    
+    def pending(self) -> List[Tuple[Hashable, float, Any]]:
+        """Lembretes pendentes como (id, fire_at, payload), em ordem de disparo."""
+        with self._lock:
+            entries = sorted(self._entries.values())
+        return [(entry[2], entry[0], entry[3]) for entry in entries]
+    
+    def pop_due(self, now: Optional[Moment] = None) -> List[Tuple[Hashable, float, Any]]:
+        """
+        Remove e retorna os lembretes vencidos.
+        
+        Args:
+            now: Referência de tempo (padrão: o relógio do motor)
+        
+        Returns:
+            Lista de (id, fire_at, payload) em ordem de disparo
+        """
+        moment = self.clock.now() if now is None else _timestamp(now)
+        due = []
+        with self._lock:
+            self._drop_inactive_top()
+            while self._heap and self._heap[0][0] <= moment:
+                fire_at, _, reminder_id, payload, _ = heapq.heappop(self._heap)
+                del self._entries[reminder_id]
+                due.append((reminder_id, fire_at, payload))
+                self._drop_inactive_top()
+        return due
+    
+    def run_pending(self, now: Optional[Moment] = None) -> int:
+        """
+        Dispara o callback de todos os lembretes vencidos.
+        
+        Uma exceção no callback não interrompe os demais: ela conta em failed
+        e fica em errors.
+        
+        Returns:
+            Número de lembretes disparados
+        """
+        due = self.pop_due(now)
+        for reminder_id, _, payload in due:
+            try:
+                if self.callback is not None:
+                    self.callback(reminder_id, payload)
+            except Exception as e:
+                self.failed += 1
+                self.errors.append((reminder_id, repr(e)))
+            else:
+                self.fired += 1
+        return len(due)
+    
+    def run_forever(self, stop: threading.Event):
+        """
+        Laço bloqueante: dorme até o próximo lembrete (ou até um novo lembrete
+        mais cedo ser agendado) e dispara os vencidos, até stop ser sinalizado.
+        Depois de sinalizar stop de outra thread, chame wake().
+        """
+        while not stop.is_set():
+            self.run_pending()
+            with self._condition:
+                if stop.is_set():
+                    break
+                self.clock.wait(self._condition, self._delay())
+    
+    def wake(self):
+        """Acorda os laços de espera (por exemplo, depois de sinalizar stop)."""
+        with self._condition:
+            self._condition.notify_all()
+        self._wake_async()
+    
+    async def run(self, stop: asyncio.Event):
+        """Versão asyncio de run_forever."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        stopper = asyncio.ensure_future(self._wake_on(stop))
+        try:
+            while not stop.is_set():
+                self.run_pending()
+                self._wakeup.clear()
+                delay = self._delay()
+                if delay is None and isinstance(self.clock, FakeClock):
+                    break
+                await self.clock.wait_async(self._wakeup, delay)
+        finally:
+            stopper.cancel()
+            self._wakeup = None
+            self._loop = None
+    
+    async def _wake_on(self, stop: asyncio.Event):
+        """Acorda o laço asyncio quando stop for sinalizado."""
+        await stop.wait()
+        self._wakeup.set()
+    
+    def _delay(self) -> Optional[float]:
+        """Segundos até o próximo lembrete (None se não houver nenhum)."""
+        next_time = self.next_fire_time()
+        if next_time is None:
+            return None
+        return max(0.0, next_time - self.clock.now())
+    
+    def _discard(self, reminder_id: Hashable) -> bool:
+        """Marca a entrada atual do id como inativa."""
+        entry = self._entries.pop(reminder_id, None)
+        if entry is None:
+            return False
+        entry[4] = False
+        self._inactive += 1
+        return True
+    
+    def _maybe_compact(self):
+        """Compacta o heap quando as entradas inativas passam da metade."""
+        if self._inactive > self.compact_threshold and self._inactive > len(self._heap) // 2:
+            self.compact()
+    
+    def _drop_inactive_top(self):
+        """Descarta entradas inativas do topo do heap."""
+        while self._heap and not self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._inactive -= 1
+    
+    def _notify(self, entry: list):
+        """Acorda os laços de espera se o novo lembrete for o próximo."""
+        if self._heap and self._heap[0] is entry:
+            self._condition.notify_all()
+            self._wake_async()
+    
+    def _wake_async(self):
+        """Acorda o laço asyncio; asyncio.Event não é thread-safe, então o set roda no próprio loop."""
+        wakeup, loop = self._wakeup, self._loop
+        if wakeup is None or loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # Loop já encerrado
+            pass
+
+def _timestamp(moment: Moment) -> float:
+    """Converte datetime em timestamp; números passam direto."""
+    return moment.timestamp() if isinstance(moment, datetime) else float(moment)
@@ -0,0 +1,235 @@
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import schedule
+
+if __package__ in (None, ""):
+    # Execução direta (python src/automation/scheduler_service.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automation.academic_scheduler import AcademicScheduler
+from automation.task_store import JSONTaskStore, TaskStore, WriteBehindTaskStore
+
+# Agenda padrão de cada job (ver SchedulerService.add_job para o formato)
+DEFAULT_SCHEDULES = {
+    'daily_summary': "daily at 07:00",
+    'weekly_report': "monday at 08:00"
+}
+
+SCHEDULE_PATTERN = re.compile(
+    r"^(?:every (?P<interval>\d+) (?P<unit>seconds|minutes|hours|days)"
+    r"|(?P<day>daily|monday|tuesday|wednesday|thursday|friday|saturday|sunday) at (?P<time>\d{2}:\d{2}))$"
+)
+
+class SchedulerService:
+    """
+    Serviço residente que executa os jobs do AcademicScheduler.
+    
+    Substitui o cron: o processo sobe uma vez, mantém as tarefas em memória
+    (WriteBehindTaskStore) e dispara os jobs pelos horários configurados
+    usando a biblioteca schedule. Os jobs rodam num pool de threads. Os
+    lembretes não são um job periódico: rodam numa thread própria, no laço
+    do ReminderEngine, que dorme até o próximo lembrete; assim um job lento
+    não os atrasa. Para cada job são medidos a duração e o atraso (lag)
+    entre o horário previsto e o início da execução. Depois de stop(), o
+    serviço pode ser iniciado de novo com start().
+    """
+    
+    def __init__(self, scheduler: Optional[AcademicScheduler] = None, store: Optional[TaskStore] = None,
+                 schedules: Optional[Dict[str, str]] = None, workers: int = 4,
+                 flush_interval: Optional[float] = 5.0,
+                 on_report: Callable[[str], None] = print, reminders: bool = True):
+        if scheduler is None:
+            store = WriteBehindTaskStore(store or JSONTaskStore(), flush_interval)
+            scheduler = AcademicScheduler(store=store)
+        self.scheduler = scheduler
+        self.on_report = on_report
+        self.reminders = reminders
+        self.workers = workers
+        
+        self._schedule = schedule.Scheduler()
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        # Recriado sob demanda depois de stop()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        
+        schedules = {**DEFAULT_SCHEDULES, **(schedules or {})}
+        jobs = {
+            'daily_summary': self.scheduler.send_daily_summary,
+            'weekly_report': lambda: self.on_report(self.scheduler.generate_weekly_report())
+        }
+        for name, func in jobs.items():
+            if schedules.get(name):
+                self.add_job(name, func, schedules[name])
+    
+    def add_job(self, name: str, func: Callable, when: str, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Registra um job periódico.
+        
+        Args:
+            name: Nome do job (chave das métricas)
+            func: Função sem argumentos
+            when: "every N seconds|minutes|hours|days", "daily at HH:MM" ou
+                "<dia da semana em inglês> at HH:MM"
+            executor: Pool onde o job roda (padrão: o pool compartilhado)
+        """
+        match = SCHEDULE_PATTERN.match(when.strip().lower())
+        if match is None:
+            raise ValueError(f"Agenda inválida para {name}: {when!r}")
+        
+        if match['interval']:
+            job = getattr(self._schedule.every(int(match['interval'])), match['unit'])
+        else:
+            job = getattr(self._schedule.every(), 'day' if match['day'] == 'daily' else match['day'])
+            job = job.at(match['time'])
+        
+        self._jobs[name] = {
+            'func': func,
+            'executor': executor,
+            'running': False,
+            'metrics': {'runs': 0, 'failures': 0, 'skipped': 0, 'last_duration': None,
+                        'max_duration': 0.0, 'total_duration': 0.0, 'last_lag': None,
+                        'max_lag': 0.0, 'last_error': None}
+        }
+        self._jobs[name]['job'] = job.do(self._dispatch, name)
+    
+    def run_pending(self):
+        """Dispara os jobs vencidos (sem esperar que terminem)."""
+        self._schedule.run_pending()
+    
+    def run_forever(self):
+        """Laço principal: dorme até o próximo job, até stop()."""
+        while not self._stop.is_set():
+            self.run_pending()
+            idle = self._schedule.idle_seconds
+            self._stop.wait(1.0 if idle is None else min(max(idle, 0.0), 1.0))
+    
+    def start(self):
+        """
+        Roda run_forever e o laço de lembretes em threads em segundo plano.
+        
+        Raises:
+            RuntimeError: Se o serviço já estiver rodando
+        """
+        if self._threads:
+            raise RuntimeError("Serviço já iniciado")
+        self._stop.clear()
+        store = self.scheduler.store
+        if isinstance(store, WriteBehindTaskStore):
+            store.start()
+        
+        self._threads = [threading.Thread(target=self.run_forever, name="scheduler-service", daemon=True)]
+        if self.reminders:
+            self._threads.append(threading.Thread(target=self.scheduler.reminders.run_forever, args=(self._stop,),
+                                                  name="scheduler-reminders", daemon=True))
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self, wait: bool = True):
+        """Para os laços, espera os jobs em execução e grava as tarefas pendentes."""
+        self._stop.set()
+        self.scheduler.reminders.wake()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+        
+        store = self.scheduler.store
+        if isinstance(store, WriteBehindTaskStore):
+            store.close()
+    
+    def metrics(self) -> Dict[str, Dict]:
+        """
+        Retorna as métricas de cada job.
+        
+        Returns:
+            Dict {job: {runs, failures, skipped, last_duration, max_duration,
+            avg_duration, last_lag, max_lag, last_error, next_run}}, com
+            durações e atrasos em segundos, mais reminders: {runs (lembretes
+            disparados), failures, last_error, pending, next_run}
+        """
+        with self._lock:
+            result = {}
+            for name, entry in self._jobs.items():
+                metrics = dict(entry['metrics'])
+                metrics['avg_duration'] = metrics['total_duration'] / metrics['runs'] if metrics['runs'] else None
+                metrics['next_run'] = entry['job'].next_run
+                result[name] = metrics
+        
+        engine = self.scheduler.reminders
+        next_fire = engine.next_fire_time()
+        result['reminders'] = {
+            'runs': engine.fired,
+            'failures': engine.failed,
+            'last_error': engine.errors[-1][1] if engine.errors else None,
+            'pending': len(engine),
+            'next_run': datetime.fromtimestamp(next_fire) if next_fire is not None else None
+        }
+        return result
+    
+    def _dispatch(self, name: str):
+        """Callback do schedule: envia o job ao pool, pulando se a execução anterior não terminou."""
+        entry = self._jobs[name]
+        planned = entry['job'].next_run
+        
+        with self._lock:
+            if entry['running']:
+                entry['metrics']['skipped'] += 1
+                return
+            entry['running'] = True
+            executor = entry['executor'] or self._shared_pool()
+        executor.submit(self._run, name, planned)
+    
+    def _shared_pool(self) -> ThreadPoolExecutor:
+        """Pool compartilhado dos jobs (chamar com _lock), criado no primeiro uso."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler-job")
+        return self._pool
+    
+    def _run(self, name: str, planned: datetime):
+        """Executa o job e registra duração e atraso."""
+        entry = self._jobs[name]
+        lag = max(0.0, (datetime.now() - planned).total_seconds())
+        start = time.perf_counter()
+        error = None
+        try:
+            entry['func']()
+        except Exception as e:
+            error = repr(e)
+        duration = time.perf_counter() - start
+        
+        with self._lock:
+            metrics = entry['metrics']
+            metrics['runs'] += 1
+            metrics['last_duration'] = duration
+            metrics['max_duration'] = max(metrics['max_duration'], duration)
+            metrics['total_duration'] += duration
+            metrics['last_lag'] = lag
+            metrics['max_lag'] = max(metrics['max_lag'], lag)
+            if error is not None:
+                metrics['failures'] += 1
+                metrics['last_error'] = error
+            entry['running'] = False
+
+if __name__ == "__main__":
+    # Exemplo de uso: python -m automation.scheduler_service (Ctrl+C para sair)
+    service = SchedulerService()
+    service.start()
+    try:
+        while True:
+            time.sleep(60)
+            print(service.metrics())
+    except KeyboardInterrupt:
+        service.stop()
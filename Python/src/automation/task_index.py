@@ -0,0 +1,102 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import ChainMap
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+class DueDateIndex:
+    """
+    Índice em memória das tarefas pendentes, ordenado pelo prazo.
+    
+    Os prazos são convertidos com datetime.fromisoformat uma única vez, na
+    inclusão da tarefa. As consultas por janela usam bisect e devolvem
+    visões somente leitura das tarefas, sem copiar nem alterar os dicts.
+    """
+    
+    def __init__(self, tasks: Iterable[Dict] = ()):
+        self._tasks: Dict[int, Dict] = {}
+        self._due: Dict[int, datetime] = {}
+        
+        for task in tasks:
+            if not task['completed']:
+                self._tasks[task['id']] = dict(task)
+                self._due[task['id']] = datetime.fromisoformat(task['due_date'])
+        
+        self._keys: List[Tuple[datetime, int]] = sorted((due, task_id) for task_id, due in self._due.items())
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._tasks
+    
+    def add(self, task: Dict):
+        """
+        Inclui ou atualiza uma tarefa; tarefas concluídas saem do índice.
+        
+        Args:
+            task: Tarefa com id, due_date e completed
+        """
+        self.remove(task['id'])
+        if task['completed']:
+            return
+        
+        due = datetime.fromisoformat(task['due_date'])
+        self._tasks[task['id']] = dict(task)
+        self._due[task['id']] = due
+        insort(self._keys, (due, task['id']))
+    
+    def remove(self, task_id: int) -> bool:
+        """
+        Remove uma tarefa do índice (por exemplo, ao concluí-la).
+        
+        Args:
+            task_id: Id da tarefa
+        
+        Returns:
+            True se a tarefa estava no índice
+        """
+        due = self._due.pop(task_id, None)
+        if due is None:
+            return False
+        
+        del self._tasks[task_id]
+        position = bisect_left(self._keys, (due, task_id))
+        del self._keys[position]
+        return True
+    
+    def get(self, task_id: int) -> Optional[Mapping]:
+        """Retorna uma visão somente leitura da tarefa, ou None."""
+        task = self._tasks.get(task_id)
+        return MappingProxyType(task) if task is not None else None
+    
+    def due_date(self, task_id: int) -> Optional[datetime]:
+        """Retorna o prazo já convertido de uma tarefa pendente."""
+        return self._due.get(task_id)
+    
+    def due_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    now: Optional[datetime] = None) -> List[Mapping]:
+        """
+        Retorna as tarefas pendentes com prazo na janela [start, end].
+        
+        Args:
+            start: Início da janela (None = sem limite, inclui atrasadas)
+            end: Fim da janela (None = sem limite)
+            now: Referência para days_until_due (padrão: datetime.now())
+        
+        Returns:
+            Visões somente leitura das tarefas, em ordem de prazo, com o campo
+            days_until_due calculado
+        """
+        now = now or datetime.now()
+        low = 0 if start is None else bisect_left(self._keys, (start,))
+        high = len(self._keys) if end is None else bisect_right(self._keys, (end, float('inf')))
+        
+        return [
+            MappingProxyType(ChainMap({'days_until_due': (due - now).days}, self._tasks[task_id]))
+            for due, task_id in self._keys[low:high]
+        ]
+    
+    def count_before(self, moment: datetime) -> int:
+        """Número de tarefas pendentes com prazo anterior a moment."""
+        return bisect_left(self._keys, (moment,))
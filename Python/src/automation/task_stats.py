@@ -0,0 +1,125 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class TaskCounters:
+    """
+    Contadores de tarefas por disciplina, mantidos incrementalmente.
+    
+    Cada inclusão, conclusão ou alteração de tarefa ajusta os contadores
+    (total, concluídas) da disciplina. Os prazos das tarefas pendentes ficam
+    ordenados por disciplina, então as atrasadas são contadas com bisect. Um
+    resumo custa O(disciplinas · log n), sem percorrer as tarefas.
+    """
+    
+    def __init__(self, tasks: Iterable[Dict] = ()):
+        self._courses: Dict[str, Dict] = {}
+        self._state: Dict[int, Tuple[str, datetime, bool]] = {}
+        
+        for task in tasks:
+            self._add(task, sort=False)
+        for counters in self._courses.values():
+            counters['pending_due'].sort()
+    
+    def __len__(self) -> int:
+        return len(self._state)
+    
+    def add(self, task: Dict):
+        """
+        Inclui uma tarefa ou atualiza uma já contada (mesmo id).
+        
+        Args:
+            task: Tarefa com id, course, due_date e completed
+        """
+        self.remove(task['id'])
+        self._add(task)
+    
+    def remove(self, task_id: int) -> bool:
+        """
+        Retira uma tarefa dos contadores (por exemplo, ao excluí-la).
+        
+        Returns:
+            True se a tarefa estava contada
+        """
+        state = self._state.pop(task_id, None)
+        if state is None:
+            return False
+        
+        course, due, completed = state
+        counters = self._courses[course]
+        counters['total'] -= 1
+        if completed:
+            counters['completed'] -= 1
+        else:
+            pending_due = counters['pending_due']
+            del pending_due[bisect_left(pending_due, due)]
+        
+        if counters['total'] == 0:
+            del self._courses[course]
+        return True
+    
+    def course(self, course: str, now: Optional[datetime] = None) -> Dict:
+        """
+        Retorna os contadores de uma disciplina.
+        
+        Args:
+            course: Nome da disciplina
+            now: Referência para atrasadas (padrão: datetime.now())
+        
+        Returns:
+            Dict com total, completed, pending e overdue
+        """
+        counters = self._courses.get(course)
+        if counters is None:
+            return {'total': 0, 'completed': 0, 'pending': 0, 'overdue': 0}
+        
+        now = now or datetime.now()
+        return {
+            'total': counters['total'],
+            'completed': counters['completed'],
+            'pending': len(counters['pending_due']),
+            'overdue': bisect_left(counters['pending_due'], now)
+        }
+    
+    def courses(self) -> List[str]:
+        """Disciplinas com pelo menos uma tarefa, em ordem de inclusão."""
+        return list(self._courses)
+    
+    def summary(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Retorna os contadores gerais e por disciplina.
+        
+        Args:
+            now: Referência para atrasadas (padrão: datetime.now())
+        
+        Returns:
+            Dict com total, completed, pending, overdue e courses
+            ({disciplina: contadores})
+        """
+        now = now or datetime.now()
+        courses = {course: self.course(course, now) for course in self._courses}
+        
+        summary = {key: sum(counters[key] for counters in courses.values())
+                   for key in ('total', 'completed', 'pending', 'overdue')}
+        summary['courses'] = courses
+        return summary
+    
+    def _add(self, task: Dict, sort: bool = True):
+        """Conta uma tarefa ainda não contada."""
+        course = task['course']
+        due = datetime.fromisoformat(task['due_date'])
+        completed = bool(task['completed'])
+        
+        counters = self._courses.get(course)
+        if counters is None:
+            counters = self._courses[course] = {'total': 0, 'completed': 0, 'pending_due': []}
+        
+        counters['total'] += 1
+        if completed:
+            counters['completed'] += 1
+        elif sort:
+            insort(counters['pending_due'], due)
+        else:
+            counters['pending_due'].append(due)
+        
+        self._state[task['id']] = (course, due, completed)
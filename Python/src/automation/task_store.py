@@ -0,0 +1,494 @@
+import json
+import os
+import sqlite3
+import threading
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+class TaskStore:
+    """
+    Interface de armazenamento das tarefas do AcademicScheduler.
+    
+    As tarefas são dicts com pelo menos title, due_date, course, type e
+    completed; o campo id é atribuído pelo armazenamento na inserção. No modo
+    multiusuário, cada tarefa traz também o student_id do seu dono.
+    """
+    
+    def all(self) -> List[Dict]:
+        """Retorna todas as tarefas."""
+        raise NotImplementedError
+    
+    def get(self, task_id: int) -> Optional[Dict]:
+        """Retorna uma tarefa pelo id, ou None."""
+        raise NotImplementedError
+    
+    def insert(self, task: Dict) -> Dict:
+        """Insere uma tarefa, atribui task['id'] e a retorna."""
+        raise NotImplementedError
+    
+    def insert_many(self, tasks: Iterable[Dict]) -> List[Dict]:
+        """Insere várias tarefas numa única escrita."""
+        raise NotImplementedError
+    
+    def update(self, task_id: int, changes: Dict) -> Optional[Dict]:
+        """Atualiza campos de uma tarefa e retorna a tarefa atualizada, ou None."""
+        raise NotImplementedError
+    
+    def delete(self, task_id: int) -> bool:
+        """Remove uma tarefa; retorna True se ela existia."""
+        raise NotImplementedError
+    
+    def replace_all(self, tasks: List[Dict]):
+        """Substitui todo o conteúdo do armazenamento."""
+        raise NotImplementedError
+    
+    def apply_changes(self, upserts: List[Dict], deleted: Iterable[int]):
+        """
+        Grava tarefas que já têm id (inserindo ou substituindo) e remove ids,
+        numa única escrita.
+        
+        Args:
+            upserts: Tarefas completas, com id
+            deleted: Ids a remover
+        """
+        deleted = set(deleted)
+        tasks = {task['id']: task for task in self.all() if task['id'] not in deleted}
+        tasks.update((task['id'], task) for task in upserts)
+        self.replace_all(sorted(tasks.values(), key=lambda x: x['id']))
+    
+    def query(self, course: Optional[str] = None, completed: Optional[bool] = None,
+              due_before: Optional[str] = None, due_after: Optional[str] = None) -> List[Dict]:
+        """
+        Filtra tarefas, ordenadas por due_date.
+        
+        Args:
+            course: Disciplina
+            completed: Situação da tarefa
+            due_before: Prazo máximo (ISO 8601, inclusivo)
+            due_after: Prazo mínimo (ISO 8601, inclusivo)
+        
+        Returns:
+            Lista de tarefas
+        """
+        tasks = [
+            task for task in self.all()
+            if (course is None or task['course'] == course)
+            and (completed is None or bool(task['completed']) == completed)
+            and (due_before is None or task['due_date'] <= due_before)
+            and (due_after is None or task['due_date'] >= due_after)
+        ]
+        return sorted(tasks, key=lambda x: x['due_date'])
+    
+    def pending_by_student(self, due_before: str) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Agrupa as tarefas pendentes com prazo até due_before por estudante.
+        
+        Args:
+            due_before: Prazo máximo (ISO 8601, inclusivo)
+        
+        Returns:
+            Iterador de (student_id, tarefas em ordem de prazo), em ordem de
+            student_id; tarefas sem student_id são ignoradas
+        """
+        tasks = [task for task in self.query(completed=False, due_before=due_before)
+                 if task.get('student_id') is not None]
+        tasks.sort(key=lambda x: (x['student_id'], x['due_date']))
+        for student_id, group in groupby(tasks, key=lambda x: x['student_id']):
+            yield student_id, list(group)
+
+class JSONTaskStore(TaskStore):
+    """
+    Formato legado: todas as tarefas num único arquivo JSON, reescrito a cada
+    alteração. Mantido por compatibilidade e como formato de importação.
+    """
+    
+    def __init__(self, path: str = "academic_tasks.json"):
+        self.path = path
+    
+    def all(self) -> List[Dict]:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            return []
+        except Exception as e:
+            print(f"Erro ao carregar tarefas: {e}")
+            return []
+    
+    def get(self, task_id: int) -> Optional[Dict]:
+        return next((task for task in self.all() if task['id'] == task_id), None)
+    
+    def insert(self, task: Dict) -> Dict:
+        return self.insert_many([task])[0]
+    
+    def insert_many(self, tasks: Iterable[Dict]) -> List[Dict]:
+        stored = self.all()
+        # max + 1 continua livre de colisões mesmo depois de remoções
+        next_id = max((task['id'] for task in stored), default=0) + 1
+        inserted = []
+        for task in tasks:
+            task['id'] = next_id
+            next_id += 1
+            stored.append(task)
+            inserted.append(task)
+        self.replace_all(stored)
+        return inserted
+    
+    def update(self, task_id: int, changes: Dict) -> Optional[Dict]:
+        tasks = self.all()
+        for task in tasks:
+            if task['id'] == task_id:
+                task.update(changes)
+                self.replace_all(tasks)
+                return task
+        return None
+    
+    def delete(self, task_id: int) -> bool:
+        tasks = self.all()
+        remaining = [task for task in tasks if task['id'] != task_id]
+        if len(remaining) == len(tasks):
+            return False
+        self.replace_all(remaining)
+        return True
+    
+    def replace_all(self, tasks: List[Dict]):
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(tasks, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"Erro ao salvar tarefas: {e}")
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Armazenamento em SQLite com índices em due_date, course e completed.
+    
+    Cada inserção ou atualização é uma transação, então vários processos
+    podem escrever no mesmo banco sem perder tarefas. A tarefa completa fica
+    na coluna data (JSON); os campos consultados são replicados em colunas
+    indexadas.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        due_date TEXT NOT NULL,
+        course TEXT NOT NULL,
+        type TEXT NOT NULL,
+        completed INTEGER NOT NULL DEFAULT 0,
+        priority TEXT,
+        created_at TEXT,
+        data TEXT NOT NULL,
+        student_id TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+    CREATE INDEX IF NOT EXISTS idx_tasks_course ON tasks (course);
+    CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, due_date);
+    """
+    
+    # Criado depois da migração, já que bancos antigos não têm student_id
+    STUDENT_INDEX = "CREATE INDEX IF NOT EXISTS idx_tasks_student ON tasks (student_id, completed, due_date)"
+    
+    def __init__(self, path: str = "academic_tasks.db", timeout: float = 30.0):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")]
+        if 'student_id' not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN student_id TEXT")
+        self._conn.execute(self.STUDENT_INDEX)
+    
+    def close(self):
+        """Fecha a conexão com o banco."""
+        self._conn.close()
+    
+    def all(self) -> List[Dict]:
+        return self._select("SELECT id, data FROM tasks ORDER BY id")
+    
+    def get(self, task_id: int) -> Optional[Dict]:
+        tasks = self._select("SELECT id, data FROM tasks WHERE id = ?", (task_id,))
+        return tasks[0] if tasks else None
+    
+    def insert(self, task: Dict) -> Dict:
+        return self.insert_many([task])[0]
+    
+    def insert_many(self, tasks: Iterable[Dict]) -> List[Dict]:
+        with self._lock, self._conn:
+            inserted = []
+            for task in tasks:
+                # Como nos outros armazenamentos, o id é sempre atribuído aqui
+                task.pop('id', None)
+                inserted.append(self._insert(task))
+            return inserted
+    
+    def update(self, task_id: int, changes: Dict) -> Optional[Dict]:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id, data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return None
+            
+            task = self._deserialize(row)
+            task.update(changes)
+            task['id'] = task_id
+            self._conn.execute(
+                "UPDATE tasks SET title = ?, due_date = ?, course = ?, type = ?, completed = ?,"
+                " priority = ?, created_at = ?, student_id = ?, data = ? WHERE id = ?",
+                self._columns(task) + (self._serialize(task), task_id)
+            )
+            return task
+    
+    def delete(self, task_id: int) -> bool:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount > 0
+    
+    def replace_all(self, tasks: List[Dict]):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            for task in tasks:
+                self._insert(task)
+    
+    def apply_changes(self, upserts: List[Dict], deleted: Iterable[int]):
+        # Só as linhas alteradas, numa transação
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in deleted])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tasks (id, title, due_date, course, type, completed, priority,"
+                " created_at, student_id, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(task['id'],) + self._columns(task) + (self._serialize(task),) for task in upserts]
+            )
+    
+    def query(self, course: Optional[str] = None, completed: Optional[bool] = None,
+              due_before: Optional[str] = None, due_after: Optional[str] = None) -> List[Dict]:
+        conditions = []
+        params = []
+        for clause, value in (("course = ?", course), ("completed = ?", completed),
+                              ("due_date <= ?", due_before), ("due_date >= ?", due_after)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(int(value) if isinstance(value, bool) else value)
+        
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._select(f"SELECT id, data FROM tasks{where} ORDER BY due_date", params)
+    
+    def pending_by_student(self, due_before: str) -> Iterator[Tuple[str, List[Dict]]]:
+        # Uma única consulta pelo índice (student_id, completed, due_date)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT student_id, id, data FROM tasks"
+                " WHERE student_id IS NOT NULL AND completed = 0 AND due_date <= ?"
+                " ORDER BY student_id, due_date",
+                (due_before,)
+            ).fetchall()
+        
+        for student_id, group in groupby(rows, key=lambda row: row[0]):
+            yield student_id, [self._deserialize(row[1:]) for row in group]
+    
+    def import_json(self, path: str) -> int:
+        """
+        Importa tarefas do formato legado (academic_tasks.json).
+        
+        Os ids do arquivo são preservados quando estão livres; os que já
+        existem no banco recebem um id novo, então importar num banco não
+        vazio não falha nem sobrescreve tarefas.
+        
+        Args:
+            path: Caminho do arquivo JSON
+        
+        Returns:
+            Número de tarefas importadas
+        """
+        tasks = JSONTaskStore(path).all()
+        with self._lock, self._conn:
+            taken = {row[0] for row in self._conn.execute("SELECT id FROM tasks")}
+            for task in tasks:
+                if task.get('id') in taken:
+                    del task['id']
+                self._insert(task)
+                taken.add(task['id'])
+        return len(tasks)
+    
+    def export_json(self, path: str):
+        """Exporta todas as tarefas para o formato legado."""
+        JSONTaskStore(path).replace_all(self.all())
+    
+    def _insert(self, task: Dict) -> Dict:
+        """Insere uma tarefa dentro da transação corrente."""
+        cursor = self._conn.execute(
+            "INSERT INTO tasks (id, title, due_date, course, type, completed, priority, created_at,"
+            " student_id, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (task.get('id'),) + self._columns(task) + (self._serialize(task),)
+        )
+        task['id'] = cursor.lastrowid
+        return task
+    
+    def _select(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        """Executa uma consulta e desserializa as tarefas."""
+        with self._lock:
+            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        return [self._deserialize(row) for row in rows]
+    
+    def _serialize(self, task: Dict) -> str:
+        """Serializa a tarefa sem o id, que fica na própria coluna."""
+        return json.dumps({key: value for key, value in task.items() if key != 'id'}, ensure_ascii=False)
+    
+    def _deserialize(self, row: tuple) -> Dict:
+        """Reconstrói a tarefa a partir de (id, data)."""
+        task = json.loads(row[1])
+        task['id'] = row[0]
+        return task
+    
+    def _columns(self, task: Dict) -> tuple:
+        """Valores das colunas indexadas (title até student_id)."""
+        return (
+            task['title'],
+            task['due_date'],
+            task['course'],
+            task['type'],
+            int(bool(task.get('completed', False))),
+            task.get('priority'),
+            task.get('created_at'),
+            task.get('student_id')
+        )
+
+class WriteBehindTaskStore(TaskStore):
+    """
+    Mantém as tarefas em memória e grava no armazenamento de apoio em segundo
+    plano.
+    
+    Leituras e escritas acontecem só em memória; as tarefas alteradas e
+    removidas desde a última gravação são gravadas de uma vez
+    (apply_changes) a cada flush_interval segundos e em close(). Indicado
+    para um processo residente (SchedulerService), que é o único a escrever
+    no armazenamento enquanto roda.
+    """
+    
+    def __init__(self, backing: TaskStore, flush_interval: Optional[float] = 5.0):
+        self.backing = backing
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        
+        self._lock = threading.RLock()
+        # Serializa as gravações, para um snapshot antigo nunca sobrescrever um novo
+        self._flush_lock = threading.Lock()
+        self._tasks: Dict[int, Dict] = {task['id']: task for task in backing.all()}
+        self._next_id = max(self._tasks, default=0) + 1
+        self._changed = set()
+        self._deleted = set()
+        # Depois de replace_all, a próxima gravação substitui tudo
+        self._replaced = False
+        self._stop = threading.Event()
+        self._thread = None
+        self.start()
+    
+    def start(self):
+        """Inicia a gravação periódica (de novo, se close() a parou)."""
+        if self.flush_interval is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="task-store-flush", daemon=True)
+        self._thread.start()
+    
+    @property
+    def dirty(self) -> bool:
+        """Se há alterações ainda não gravadas."""
+        return bool(self._changed or self._deleted or self._replaced)
+    
+    def all(self) -> List[Dict]:
+        with self._lock:
+            return [dict(task) for task in self._tasks.values()]
+    
+    def get(self, task_id: int) -> Optional[Dict]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return dict(task) if task is not None else None
+    
+    def insert(self, task: Dict) -> Dict:
+        return self.insert_many([task])[0]
+    
+    def insert_many(self, tasks: Iterable[Dict]) -> List[Dict]:
+        with self._lock:
+            inserted = []
+            for task in tasks:
+                task['id'] = self._next_id
+                self._next_id += 1
+                self._tasks[task['id']] = dict(task)
+                self._changed.add(task['id'])
+                inserted.append(task)
+            return inserted
+    
+    def update(self, task_id: int, changes: Dict) -> Optional[Dict]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            task.update(changes)
+            task['id'] = task_id
+            self._changed.add(task_id)
+            return dict(task)
+    
+    def delete(self, task_id: int) -> bool:
+        with self._lock:
+            if self._tasks.pop(task_id, None) is None:
+                return False
+            self._changed.discard(task_id)
+            self._deleted.add(task_id)
+            return True
+    
+    def replace_all(self, tasks: List[Dict]):
+        with self._lock:
+            self._tasks = {task['id']: dict(task) for task in tasks if 'id' in task}
+            self._next_id = max(self._tasks, default=0) + 1
+            self.insert_many([task for task in tasks if 'id' not in task])
+            self._replaced = True
+    
+    def flush(self) -> bool:
+        """
+        Grava as alterações pendentes no armazenamento de apoio.
+        
+        Returns:
+            True se havia algo a gravar
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self.dirty:
+                    return False
+                replaced = self._replaced
+                changed, deleted = self._changed, self._deleted
+                if replaced:
+                    upserts = [dict(task) for task in self._tasks.values()]
+                else:
+                    upserts = [dict(self._tasks[task_id]) for task_id in sorted(changed)]
+                self._changed, self._deleted, self._replaced = set(), set(), False
+            
+            try:
+                if replaced:
+                    self.backing.replace_all(upserts)
+                else:
+                    self.backing.apply_changes(upserts, sorted(deleted))
+            except Exception:
+                with self._lock:
+                    # Devolve o que não foi gravado (sem desfazer alterações mais novas)
+                    self._changed |= {task_id for task_id in changed if task_id in self._tasks}
+                    self._deleted |= deleted - set(self._tasks)
+                    self._replaced = self._replaced or replaced
+                raise
+            self.flushes += 1
+            return True
+    
+    def close(self):
+        """Para a gravação periódica e grava o que estiver pendente."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+    
+    def _flush_loop(self):
+        """Grava periodicamente até close()."""
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Erro ao salvar tarefas: {e}")
@@ -0,0 +1,138 @@
+import os
+import sys
+import pandas as pd
+from typing import Dict, List, Optional
+
+if __package__ in (None, ""):
+    # Execução direta (python src/data_analysis/cohort_statistics.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis.grade_calculator import GradeCalculator
+
+class CohortStatistics:
+    """
+    Estatísticas de semestre para uma turma ou campus inteiro.
+    
+    Trabalha sobre uma tabela em formato longo (estudante, disciplina, nota)
+    e calcula, com um único agrupamento colunar, as mesmas estatísticas de
+    GradeCalculator.calculate_semester_statistics para todos os estudantes.
+    
+    Uma nota NaN marca uma disciplina sem notas (como uma lista vazia em
+    calculate_semester_statistics): a disciplina conta em total_subjects,
+    mas a linha fica fora de todas as outras estatísticas. Estudantes sem
+    nenhuma nota não aparecem no resultado.
+    """
+    
+    STATISTICS = ['total_grades', 'average_grade', 'median_grade', 'std_deviation',
+                  'min_grade', 'max_grade', 'gpa']
+    
+    def __init__(self, calculator: Optional[GradeCalculator] = None,
+                 student_column: str = 'student',
+                 subject_column: str = 'subject',
+                 grade_column: str = 'grade'):
+        self.calculator = calculator or GradeCalculator()
+        self.student_column = student_column
+        self.subject_column = subject_column
+        self.grade_column = grade_column
+    
+    def student_statistics(self, grades: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcula as estatísticas do semestre de cada estudante.
+        
+        Args:
+            grades: DataFrame em formato longo (estudante, disciplina, nota)
+        
+        Returns:
+            DataFrame indexado pelo estudante, com as mesmas chaves de
+            calculate_semester_statistics como colunas
+        """
+        data = self._prepare(grades)
+        stats = self._aggregate(self._graded(data), [self.student_column])
+        
+        # Conta também as disciplinas sem notas, como len(grades_data)
+        subjects = data.groupby(self.student_column, sort=False)[self.subject_column].nunique()
+        stats.insert(0, 'total_subjects', subjects.loc[stats.index])
+        return stats
+    
+    def subject_statistics(self, grades: pd.DataFrame, by_student: bool = True) -> pd.DataFrame:
+        """
+        Calcula as estatísticas por disciplina.
+        
+        Args:
+            grades: DataFrame em formato longo (estudante, disciplina, nota)
+            by_student: Se True agrupa por (estudante, disciplina); se False
+                agrega cada disciplina sobre toda a turma
+        
+        Returns:
+            DataFrame indexado pela disciplina (ou estudante e disciplina)
+        """
+        data = self._graded(self._prepare(grades))
+        keys = [self.student_column, self.subject_column] if by_student else [self.subject_column]
+        return self._aggregate(data, keys)
+    
+    def to_long_format(self, students: Dict[str, Dict[str, List[float]]]) -> pd.DataFrame:
+        """
+        Converte dados por estudante para o formato longo.
+        
+        Args:
+            students: Dict estudante -> {disciplina: notas}, o mesmo formato
+                aceito por calculate_semester_statistics
+        
+        Returns:
+            DataFrame com as colunas estudante, disciplina e nota; disciplinas
+            sem notas viram uma linha com nota NaN
+        """
+        rows = [
+            (student, subject, grade)
+            for student, grades_data in students.items()
+            for subject, grades in grades_data.items()
+            for grade in (grades if len(grades) else [float('nan')])
+        ]
+        return pd.DataFrame(rows, columns=[self.student_column, self.subject_column, self.grade_column])
+    
+    def _prepare(self, grades: pd.DataFrame) -> pd.DataFrame:
+        """Valida as colunas e converte as notas para float."""
+        columns = [self.student_column, self.subject_column, self.grade_column]
+        missing = [column for column in columns if column not in grades.columns]
+        if missing:
+            raise ValueError(f"Colunas obrigatórias faltando: {missing}")
+        
+        data = grades[columns].copy()
+        data[self.grade_column] = data[self.grade_column].astype(float)
+        return data
+    
+    def _graded(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Descarta as linhas sem nota (NaN) e anexa os pontos GPA de cada nota."""
+        data = data[data[self.grade_column].notna()].copy()
+        data['_points'] = self.calculator.grades_to_points(data[self.grade_column].to_numpy())
+        return data
+    
+    def _aggregate(self, data: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        """Agrupa uma única vez e aplica todas as reduções colunares."""
+        grouped = data.groupby(keys, sort=False)
+        grade = grouped[self.grade_column]
+        
+        stats = pd.DataFrame({
+            'total_grades': grade.size(),
+            'average_grade': grade.mean(),
+            'median_grade': grade.median(),
+            # np.std usa ddof=0
+            'std_deviation': grade.std(ddof=0),
+            'min_grade': grade.min(),
+            'max_grade': grade.max(),
+            'gpa': grouped['_points'].mean()
+        })
+        return stats[self.STATISTICS]
+
+if __name__ == "__main__":
+    # Exemplo de uso
+    cohort = CohortStatistics()
+    
+    students = {
+        "João Silva": {"Cálculo I": [85, 90, 78], "Programação": [92, 88, 95]},
+        "Maria Souza": {"Cálculo I": [70, 65], "Física": [80, 82, 91]}
+    }
+    
+    grades = cohort.to_long_format(students)
+    print(cohort.student_statistics(grades))
+    print(cohort.subject_statistics(grades, by_student=False))
@@ -0,0 +1,225 @@
+import math
+import os
+import sys
+import numpy as np
+from typing import Dict, List, Optional
+
+if __package__ in (None, ""):
+    # Execução direta (python src/data_analysis/grade_book.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis.grade_calculator import GradeCalculator, GRADE_REPORT_TEMPLATE, SUBJECT_LINE_TEMPLATE
+
+class GradeBook:
+    """
+    Caderno de notas de um estudante com estatísticas em cache.
+    
+    As estatísticas de cada disciplina ficam em cache e só são recalculadas
+    quando a disciplina é alterada (nota incluída, editada ou removida). As
+    estatísticas gerais são combinadas a partir dos resumos das disciplinas,
+    sem percorrer novamente as disciplinas que não mudaram.
+    """
+    
+    def __init__(self, student_name: str = "", grades_data: Optional[Dict[str, List[float]]] = None,
+                 calculator: Optional[GradeCalculator] = None):
+        self.student_name = student_name
+        self.calculator = calculator or GradeCalculator()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        self._grades: Dict[str, List[float]] = {}
+        self._subject_cache: Dict[str, Dict] = {}
+        self._overall: Optional[Dict] = None
+        
+        for subject, grades in (grades_data or {}).items():
+            self._grades[subject] = list(grades)
+    
+    def add_grade(self, subject: str, grade: float):
+        """
+        Inclui uma nota numa disciplina (criando a disciplina se necessário).
+        
+        Args:
+            subject: Nome da disciplina
+            grade: Nota
+        """
+        self._grades.setdefault(subject, []).append(grade)
+        self._invalidate(subject)
+    
+    def edit_grade(self, subject: str, index: int, grade: float):
+        """
+        Altera uma nota existente.
+        
+        Args:
+            subject: Nome da disciplina
+            index: Posição da nota na disciplina
+            grade: Nova nota
+        """
+        self._grades[subject][index] = grade
+        self._invalidate(subject)
+    
+    def remove_grade(self, subject: str, index: int = -1) -> float:
+        """
+        Remove uma nota de uma disciplina.
+        
+        Args:
+            subject: Nome da disciplina
+            index: Posição da nota (padrão: a última)
+        
+        Returns:
+            A nota removida
+        """
+        grade = self._grades[subject].pop(index)
+        self._invalidate(subject)
+        return grade
+    
+    def remove_subject(self, subject: str):
+        """Remove uma disciplina e todas as suas notas."""
+        del self._grades[subject]
+        self._invalidate(subject)
+    
+    @property
+    def grades_data(self) -> Dict[str, List[float]]:
+        """Cópia das notas no formato aceito por GradeCalculator."""
+        return {subject: list(grades) for subject, grades in self._grades.items()}
+    
+    def subject_statistics(self, subject: str) -> Dict:
+        """
+        Retorna as estatísticas de uma disciplina, usando o cache.
+        
+        Args:
+            subject: Nome da disciplina
+        
+        Returns:
+            Dict com total_grades, average_grade, median_grade, std_deviation,
+            min_grade, max_grade e gpa
+        """
+        summary = self._subject_summary(subject)
+        return {key: value for key, value in summary.items() if not key.startswith('_')}
+    
+    def statistics(self) -> Dict:
+        """
+        Retorna as estatísticas gerais, equivalentes a calculate_semester_statistics.
+        
+        Returns:
+            Dict com as estatísticas (vazio se não houver notas)
+        """
+        if self._overall is not None:
+            self.cache_hits += 1
+            return dict(self._overall)
+        
+        self.cache_misses += 1
+        summaries = [self._subject_summary(subject) for subject in self._grades]
+        summaries = [summary for summary in summaries if summary['total_grades']]
+        
+        if not summaries:
+            self._overall = {}
+            return {}
+        
+        total = sum(summary['total_grades'] for summary in summaries)
+        mean = sum(summary['_sum'] for summary in summaries) / total
+        # Combina as variâncias das disciplinas (Chan et al.)
+        m2 = sum(summary['_m2'] + summary['total_grades'] * (summary['average_grade'] - mean) ** 2
+                 for summary in summaries)
+        
+        self._overall = {
+            'total_subjects': len(self._grades),
+            'total_grades': total,
+            'average_grade': mean,
+            'median_grade': np.median(np.concatenate([summary['_sorted'] for summary in summaries])),
+            'std_deviation': math.sqrt(m2 / total),
+            'min_grade': min(summary['min_grade'] for summary in summaries),
+            'max_grade': max(summary['max_grade'] for summary in summaries),
+            'gpa': sum(summary['_points'] for summary in summaries) / total
+        }
+        return dict(self._overall)
+    
+    def report(self) -> str:
+        """
+        Gera o relatório de desempenho, equivalente a create_grade_report.
+        
+        Returns:
+            String formatada com o relatório
+        """
+        report = GRADE_REPORT_TEMPLATE.format(student_name=self.student_name, **self.statistics())
+        
+        for subject in self._grades:
+            summary = self._subject_summary(subject)
+            report += SUBJECT_LINE_TEMPLATE.format(subject=subject, average=summary['average_grade'],
+                                                   gpa=summary['gpa'])
+        
+        return report
+    
+    def cache_info(self) -> Dict:
+        """
+        Retorna os contadores do cache.
+        
+        Returns:
+            Dict com hits, misses e o número de disciplinas em cache
+        """
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'cached_subjects': len(self._subject_cache)
+        }
+    
+    def _invalidate(self, subject: str):
+        """Marca uma disciplina (e o resumo geral) como desatualizada."""
+        self._subject_cache.pop(subject, None)
+        self._overall = None
+    
+    def _subject_summary(self, subject: str) -> Dict:
+        """Retorna o resumo da disciplina, recalculando só se estiver sujo."""
+        summary = self._subject_cache.get(subject)
+        if summary is not None:
+            self.cache_hits += 1
+            return summary
+        
+        self.cache_misses += 1
+        values = np.sort(np.asarray(self._grades[subject], dtype=float))
+        points = float(self.calculator.grades_to_points(values).sum())
+        
+        if values.size:
+            mean = values.mean()
+            summary = {
+                'total_grades': values.size,
+                'average_grade': mean,
+                'median_grade': np.median(values),
+                'std_deviation': values.std(),
+                'min_grade': values[0],
+                'max_grade': values[-1],
+                'gpa': points / values.size,
+                '_sum': values.sum(),
+                '_m2': float(((values - mean) ** 2).sum()),
+                '_points': points,
+                '_sorted': values
+            }
+        else:
+            summary = {
+                'total_grades': 0,
+                'average_grade': np.nan,
+                'median_grade': np.nan,
+                'std_deviation': np.nan,
+                'min_grade': np.nan,
+                'max_grade': np.nan,
+                'gpa': 0.0,
+                '_sum': 0.0,
+                '_m2': 0.0,
+                '_points': 0.0,
+                '_sorted': values
+            }
+        
+        self._subject_cache[subject] = summary
+        return summary
+
+if __name__ == "__main__":
+    # Exemplo de uso: painel que recalcula após cada nota lançada
+    book = GradeBook("João Silva", {
+        "Cálculo I": [85, 90, 78],
+        "Programação": [92, 88, 95],
+        "Física": [75, 82, 80]
+    })
+    
+    print(book.report())
+    book.add_grade("Física", 91)
+    print(book.report())
+    print(book.cache_info())
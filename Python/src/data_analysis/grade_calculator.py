@@ -1,13 +1,41 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional
+from itertools import chain
+from typing import List, Dict, Optional, Sequence, Union
+
+if __package__ in (None, ""):
+    # Execução direta (python src/data_analysis/grade_calculator.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis.grade_scale import GradeScale
+
+GRADE_REPORT_TEMPLATE = """
+=== RELATÓRIO DE DESEMPENHO ACADÊMICO ===
+Estudante: {student_name}
+
+ESTATÍSTICAS GERAIS:
+- Disciplinas: {total_subjects}
+- Total de avaliações: {total_grades}
+- Média geral: {average_grade:.2f}
+- Mediana: {median_grade:.2f}
+- Desvio padrão: {std_deviation:.2f}
+- Nota mínima: {min_grade:.2f}
+- Nota máxima: {max_grade:.2f}
+- GPA: {gpa:.2f}
+
+DESEMPENHO POR DISCIPLINA:
+"""
+
+SUBJECT_LINE_TEMPLATE = "{subject}: Média {average:.2f} (GPA: {gpa:.2f})\n"
 
 class GradeCalculator:
     """
     Calculadora de notas acadêmicas com funcionalidades avançadas.
     """
     
-    def __init__(self):
+    def __init__(self, grade_scale: Optional[GradeScale] = None):
         self.grade_weights = {}
         self.gpa_scale = {
             range(90, 101): 4.0,
@@ -19,6 +47,18 @@ class GradeCalculator:
             range(60, 65): 2.0,
             range(0, 60): 0.0
         }
+        self._grade_scale = grade_scale
+    
+    @property
+    def grade_scale(self) -> GradeScale:
+        """
+        Escala GPA usada nas conversões. A escala passada no construtor tem
+        precedência; sem ela, gpa_scale é compilado (e reaproveitado pelo cache
+        de GradeScale enquanto não mudar).
+        """
+        if self._grade_scale is not None:
+            return self._grade_scale
+        return GradeScale.from_ranges(self.gpa_scale)
     
     def calculate_weighted_average(self, grades: List[float], weights: List[float]) -> float:
         """
@@ -39,6 +79,45 @@ class GradeCalculator:
         
         return np.average(grades, weights=weights)
     
+    def calculate_weighted_average_matrix(self, grade_matrix, weights: List[float]) -> np.ndarray:
+        """
+        Calcula a média ponderada de uma turma inteira com um único produto
+        matriz-vetor.
+        
+        Avaliações ausentes (NaN ou posições mascaradas de um np.ma.MaskedArray)
+        são ignoradas e os pesos restantes do estudante são renormalizados.
+        
+        Args:
+            grade_matrix: Matriz de notas (estudantes x avaliações)
+            weights: Pesos das avaliações, comuns a todos os estudantes
+            
+        Returns:
+            Array com a média de cada estudante (NaN se não houver nenhuma nota)
+        """
+        if isinstance(grade_matrix, np.ma.MaskedArray):
+            missing = np.ma.getmaskarray(grade_matrix)
+            grades = np.ma.getdata(grade_matrix).astype(float)
+        else:
+            grades = np.asarray(grade_matrix, dtype=float)
+            missing = np.isnan(grades)
+        
+        grades = np.atleast_2d(grades)
+        missing = np.atleast_2d(missing)
+        weights = np.asarray(weights, dtype=float)
+        
+        if grades.shape[1] != len(weights):
+            raise ValueError("Grades and weights must have the same length")
+        
+        if abs(weights.sum() - 1.0) > 0.01:
+            raise ValueError("Weights must sum to 1.0")
+        
+        if not missing.any():
+            return grades @ weights / weights.sum()
+        
+        available = (~missing) @ weights
+        weighted = np.where(missing, 0.0, grades) @ weights
+        return np.divide(weighted, available, out=np.full(len(grades), np.nan), where=available > 0)
+    
     def simulate_final_grade_needed(self, current_grades: List[float], 
                                   current_weights: List[float], 
                                   desired_final_grade: float, 
@@ -64,6 +143,47 @@ class GradeCalculator:
         
         return max(0, min(100, needed_final))
     
+    def simulate_final_grade_needed_batch(self, current_grades, current_weights: List[float],
+                                          desired_final_grades, final_exam_weights) -> np.ndarray:
+        """
+        Calcula a nota necessária na prova final para uma turma inteira,
+        sobre uma grade de médias desejadas e pesos da prova final.
+        
+        Os pesos atuais são validados uma única vez e tratados como proporções
+        da parte não final da nota (np.average já normaliza na versão escalar),
+        o que permite variar o peso da final sem redefinir os demais pesos.
+        
+        Args:
+            current_grades: Matriz de notas atuais (estudantes x avaliações)
+            current_weights: Pesos das avaliações atuais, comuns a todos
+            desired_final_grades: Médias desejadas (escalar ou array)
+            final_exam_weights: Pesos da prova final (escalar ou array, em (0, 1])
+        
+        Returns:
+            Array (estudantes x médias desejadas x pesos da final) com a nota
+            necessária, limitada entre 0 e 100
+        """
+        grades = np.atleast_2d(np.asarray(current_grades, dtype=float))
+        weights = np.asarray(current_weights, dtype=float)
+        
+        if grades.shape[1] != len(weights):
+            raise ValueError("Grades and weights must have the same length")
+        
+        if np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError("Weights must be non-negative and sum to a positive value")
+        
+        targets = np.atleast_1d(np.asarray(desired_final_grades, dtype=float))
+        final_weights = np.atleast_1d(np.asarray(final_exam_weights, dtype=float))
+        
+        if np.any((final_weights <= 0) | (final_weights > 1)):
+            raise ValueError("Final exam weights must be in (0, 1]")
+        
+        contribution = grades @ (weights / weights.sum())
+        needed = (targets[np.newaxis, :, np.newaxis]
+                  - contribution[:, np.newaxis, np.newaxis] * (1 - final_weights)) / final_weights
+        
+        return np.clip(needed, 0, 100)
+    
     def calculate_gpa(self, grades: List[float]) -> float:
         """
         Calcula GPA baseado no sistema 4.0 americano.
@@ -73,20 +193,71 @@ class GradeCalculator:
             
         Returns:
             GPA calculado
+            
+        Raises:
+            ValueError: Se alguma nota for NaN (notas ausentes: calculate_gpa_batch)
         """
-        if not grades:
+        if len(grades) == 0:
             return 0.0
         
-        points = []
-        for grade in grades:
-            for grade_range, point in self.gpa_scale.items():
-                if int(grade) in grade_range:
-                    points.append(point)
-                    break
-            else:
-                points.append(0.0)
+        if np.isnan(np.asarray(grades, dtype=float)).any():
+            raise ValueError("Nota NaN não pode ser convertida em pontos GPA")
+        
+        return np.mean(self.grades_to_points(grades))
+    
+    def grades_to_points(self, grades) -> np.ndarray:
+        """
+        Converte notas em pontos GPA de forma vetorizada.
+        
+        Usa a mesma regra de calculate_gpa (int(nota) dentro da faixa);
+        notas fora da escala ou NaN valem 0.0. Veja GradeScale.points.
         
-        return np.mean(points)
+        Args:
+            grades: Notas (lista, array ou Series, qualquer formato)
+            
+        Returns:
+            Array com os pontos de cada nota, no mesmo formato da entrada
+        """
+        return self.grade_scale.points(grades)
+    
+    def calculate_gpa_batch(self, grades_by_student: Union[np.ndarray, pd.Series, Sequence[Sequence[float]]]):
+        """
+        Calcula o GPA de vários estudantes em uma única chamada.
+        
+        Args:
+            grades_by_student: Uma das formas:
+                - array 2D (estudantes x notas), com NaN para notas ausentes
+                - Series de notas indexada pelo estudante (formato longo)
+                - Series ou lista de listas de notas (uma lista por estudante)
+                
+        Returns:
+            Array com o GPA de cada estudante (Series quando a entrada é Series).
+            Estudantes sem notas recebem 0.0, como em calculate_gpa.
+        """
+        if isinstance(grades_by_student, pd.Series):
+            if grades_by_student.dtype == object:
+                gpas = self.calculate_gpa_batch(list(grades_by_student))
+                return pd.Series(gpas, index=grades_by_student.index)
+            
+            points = pd.Series(self.grades_to_points(grades_by_student.to_numpy()),
+                               index=grades_by_student.index)
+            return points.groupby(level=0, sort=False).mean()
+        
+        if isinstance(grades_by_student, np.ndarray):
+            matrix = np.atleast_2d(np.asarray(grades_by_student, dtype=float))
+            present = ~np.isnan(matrix)
+            points = np.where(present, self.grades_to_points(matrix), 0.0)
+            counts = present.sum(axis=1)
+            return np.divide(points.sum(axis=1), counts,
+                             out=np.zeros(len(matrix)), where=counts > 0)
+        
+        students = list(grades_by_student)
+        lengths = np.fromiter((len(grades) for grades in students), dtype=np.intp, count=len(students))
+        flat = np.fromiter(chain.from_iterable(students), dtype=float, count=int(lengths.sum()))
+        
+        owner = np.repeat(np.arange(len(students)), lengths)
+        totals = np.bincount(owner, weights=self.grades_to_points(flat), minlength=len(students))
+        return np.divide(totals, lengths, out=np.zeros(len(students)), where=lengths > 0)
     
     def calculate_semester_statistics(self, grades_data: Dict[str, List[float]]) -> Dict:
         """
@@ -129,27 +300,12 @@ class GradeCalculator:
         """
         stats = self.calculate_semester_statistics(grades_data)
         
-        report = f"""
-=== RELATÓRIO DE DESEMPENHO ACADÊMICO ===
-Estudante: {student_name}
-
-ESTATÍSTICAS GERAIS:
-- Disciplinas: {stats['total_subjects']}
-- Total de avaliações: {stats['total_grades']}
-- Média geral: {stats['average_grade']:.2f}
-- Mediana: {stats['median_grade']:.2f}
-- Desvio padrão: {stats['std_deviation']:.2f}
-- Nota mínima: {stats['min_grade']:.2f}
-- Nota máxima: {stats['max_grade']:.2f}
-- GPA: {stats['gpa']:.2f}
-
-DESEMPENHO POR DISCIPLINA:
-"""
+        report = GRADE_REPORT_TEMPLATE.format(student_name=student_name, **stats)
         
         for subject, grades in grades_data.items():
             subject_avg = np.mean(grades)
             subject_gpa = self.calculate_gpa(grades)
-            report += f"{subject}: Média {subject_avg:.2f} (GPA: {subject_gpa:.2f})\n"
+            report += SUBJECT_LINE_TEMPLATE.format(subject=subject, average=subject_avg, gpa=subject_gpa)
         
         return report
 
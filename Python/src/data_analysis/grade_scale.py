@@ -0,0 +1,167 @@
+import numpy as np
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+Band = Tuple[float, float, float]
+
+class GradeScale:
+    """
+    Escala de conversão nota -> pontos GPA compilada numa tabela densa.
+    
+    A escala é definida por faixas [mínimo, máximo) com os pontos de cada uma e
+    compilada uma única vez num array indexado por trunc(nota * resolution), o
+    que torna cada consulta O(1) e vetorizável. Escalas com a mesma definição
+    são compiladas uma vez só e reaproveitadas (uma por campus, por exemplo).
+    """
+    
+    _cache: Dict[Tuple[Tuple[Band, ...], int], 'GradeScale'] = {}
+    
+    def __init__(self, bands: Iterable[Band], resolution: int = 1):
+        """
+        Compila a escala. Prefira from_bands, from_thresholds ou from_ranges,
+        que reaproveitam escalas já compiladas.
+        
+        Args:
+            bands: Faixas (nota mínima, nota máxima exclusiva, pontos)
+            resolution: Subdivisões por ponto de nota (1 = notas inteiras,
+                como int(nota); 10 = décimos)
+        """
+        if resolution < 1:
+            raise ValueError("resolution must be >= 1")
+        
+        self.bands = tuple(sorted(bands))
+        self.resolution = resolution
+        
+        if any(lower < 0 or upper <= lower for lower, upper, _ in self.bands):
+            raise ValueError("Bands must satisfy 0 <= lower < upper")
+        
+        edges = [(self._to_index(lower), self._to_index(upper), points) for lower, upper, points in self.bands]
+        table = np.zeros(max((upper for _, upper, _ in edges), default=0))
+        for lower, upper, points in edges:
+            table[lower:upper] = points
+        
+        table.setflags(write=False)
+        self.table = table
+    
+    @classmethod
+    def from_bands(cls, bands: Iterable[Band], resolution: int = 1) -> 'GradeScale':
+        """
+        Retorna a escala compilada para as faixas dadas, usando o cache.
+        
+        Args:
+            bands: Faixas (nota mínima, nota máxima exclusiva, pontos)
+            resolution: Subdivisões por ponto de nota
+        
+        Returns:
+            GradeScale compilada
+        """
+        key = (tuple(sorted((float(lower), float(upper), float(points))
+                            for lower, upper, points in bands)), resolution)
+        scale = cls._cache.get(key)
+        if scale is None:
+            scale = cls._cache[key] = cls(key[0], resolution)
+        return scale
+    
+    @classmethod
+    def from_thresholds(cls, thresholds: Mapping[float, float], max_grade: float = 100.0,
+                        resolution: int = 1) -> 'GradeScale':
+        """
+        Cria a escala a partir de notas mínimas, como numa cadeia if/elif.
+        
+        Args:
+            thresholds: Dict nota mínima -> pontos (ex: {90: 4.0, 85: 3.7})
+            max_grade: Maior nota da escala
+            resolution: Subdivisões por ponto de nota
+        
+        Returns:
+            GradeScale compilada
+        """
+        lowers = sorted(thresholds)
+        uppers = lowers[1:] + [max_grade + 1.0 / resolution]
+        return cls.from_bands(((lower, upper, thresholds[lower]) for lower, upper in zip(lowers, uppers)),
+                              resolution)
+    
+    @classmethod
+    def from_ranges(cls, gpa_scale: Mapping[range, float]) -> 'GradeScale':
+        """
+        Cria a escala a partir do formato de GradeCalculator.gpa_scale.
+        
+        Args:
+            gpa_scale: Dict range de notas inteiras -> pontos
+        
+        Returns:
+            GradeScale compilada
+        """
+        return cls.from_bands((grade_range.start, grade_range.stop, points)
+                              for grade_range, points in gpa_scale.items())
+    
+    @classmethod
+    def default(cls) -> 'GradeScale':
+        """Escala 4.0 americana usada por GradeCalculator e utils.helpers."""
+        return cls.from_thresholds({90: 4.0, 85: 3.7, 80: 3.3, 75: 3.0, 70: 2.7, 65: 2.3, 60: 2.0, 0: 0.0})
+    
+    @property
+    def max_grade(self) -> float:
+        """Maior nota coberta pela tabela."""
+        return (len(self.table) - 1) / self.resolution
+    
+    def _to_index(self, grade: float) -> int:
+        """Converte um limite de faixa em índice da tabela."""
+        index = round(grade * self.resolution)
+        if abs(grade * self.resolution - index) > 1e-9:
+            raise ValueError(f"Band limit {grade} is not a multiple of 1/{self.resolution}")
+        return index
+    
+    def points(self, grades, clip: bool = False) -> np.ndarray:
+        """
+        Converte notas em pontos GPA.
+        
+        Args:
+            grades: Notas (lista, array ou Series, qualquer formato)
+            clip: Se True, notas acima ou abaixo da escala usam os pontos das
+                faixas extremas; se False valem 0.0 (assim como NaN)
+        
+        Returns:
+            Array de pontos no mesmo formato da entrada
+        """
+        scaled = np.asarray(grades, dtype=float) * self.resolution
+        if self.resolution != 1:
+            # Evita que 0.29 * 100 = 28.999... caia na faixa anterior
+            scaled = np.round(scaled, 9)
+        if clip:
+            scaled = np.clip(scaled, 0, len(self.table) - 1)
+        
+        valid = np.isfinite(scaled) & (scaled > -1) & (scaled < len(self.table))
+        # astype trunca em direção a zero, como int()
+        index = np.where(valid, scaled, 0).astype(np.intp)
+        return np.where(valid, self.table[index], 0.0)
+    
+    def gpa(self, grades, credit_hours: Optional[Iterable[float]] = None, clip: bool = False):
+        """
+        Calcula o GPA, opcionalmente ponderado por créditos.
+        
+        Args:
+            grades: Notas (1D) ou matriz estudantes x disciplinas (2D)
+            credit_hours: Créditos de cada nota, com formato compatível
+            clip: Repassado para points
+        
+        Returns:
+            GPA (float para 1D, array por estudante para 2D)
+        """
+        points = self.points(grades, clip=clip)
+        if points.size == 0:
+            return 0.0
+        
+        if credit_hours is None:
+            return points.mean(axis=-1)
+        
+        weights = np.asarray(credit_hours, dtype=float)
+        return (points * weights).sum(axis=-1) / np.broadcast_to(weights, points.shape).sum(axis=-1)
+
+if __name__ == "__main__":
+    # Exemplo de uso: escalas de dois campi compiladas uma única vez
+    campus_a = GradeScale.default()
+    campus_b = GradeScale.from_thresholds({9.0: 4.0, 7.0: 3.0, 5.0: 2.0, 0: 0.0}, max_grade=10, resolution=10)
+    
+    print(campus_a.gpa([95, 87, 72], credit_hours=[4, 2, 4]))
+    print(campus_b.gpa([9.5, 6.8, 5.0]))
+    print(GradeScale.default() is campus_a)
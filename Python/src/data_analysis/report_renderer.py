@@ -0,0 +1,270 @@
+import os
+import re
+import sys
+import time
+import numpy as np
+from functools import partial
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+if __package__ in (None, ""):
+    # Execução direta (python src/data_analysis/report_renderer.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis.grade_calculator import GradeCalculator, GRADE_REPORT_TEMPLATE, SUBJECT_LINE_TEMPLATE
+from utils.helpers import STUDENT_REPORT_TEMPLATE, performance_analysis, validate_student_data
+from utils.parallel import map_chunks
+
+class BulkReportRenderer:
+    """
+    Renderização em lote de relatórios acadêmicos.
+    
+    Os estudantes são processados em blocos: as estatísticas de cada bloco são
+    calculadas de uma vez com NumPy e os relatórios são preenchidos a partir dos
+    mesmos templates usados por GradeCalculator.create_grade_report ('grade') e
+    utils.helpers.create_student_report ('student'). Os blocos podem ser
+    distribuídos num pool de processos e a saída é gravada à medida que chega.
+    """
+    
+    FORMATS = ('grade', 'student')
+    
+    def __init__(self, calculator: Optional[GradeCalculator] = None,
+                 report_format: str = 'grade', workers: Optional[int] = None,
+                 chunk_size: int = 1000):
+        if report_format not in self.FORMATS:
+            raise ValueError(f"Formato de relatório inválido: {report_format}")
+        
+        self.calculator = calculator or GradeCalculator()
+        self.report_format = report_format
+        self.workers = os.cpu_count() if workers is None else workers
+        self.chunk_size = chunk_size
+    
+    def render(self, students: Iterable, output: str, per_file: bool = False) -> Dict:
+        """
+        Renderiza os relatórios de todos os estudantes.
+        
+        Args:
+            students: Iterável de (nome, grades_data) no formato 'grade' ou de
+                dicts de estudante (name, student_id, grades) no formato 'student'
+            output: Arquivo de saída, ou diretório quando per_file=True
+            per_file: Grava um arquivo .txt por estudante em vez de um único
+                arquivo; nomes repetidos recebem a posição do estudante na
+                entrada como sufixo
+        
+        Returns:
+            Dict com reports, errors, seconds e reports_per_second
+        """
+        start = time.perf_counter()
+        reports = 0
+        errors = 0
+        row = -1
+        used = set()
+        
+        if per_file:
+            os.makedirs(output, exist_ok=True)
+            sink = None
+        else:
+            directory = os.path.dirname(output)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            sink = open(output, 'w', encoding='utf-8')
+        
+        try:
+            for chunk in self.render_chunks(students):
+                for key, report in chunk:
+                    row += 1
+                    if report is None:
+                        errors += 1
+                        continue
+                    
+                    if per_file:
+                        filename = _safe_filename(key)
+                        while filename.lower() in used:
+                            filename = f"{filename}_{row}"
+                        used.add(filename.lower())
+                        filepath = os.path.join(output, f"{filename}.txt")
+                        with open(filepath, 'w', encoding='utf-8') as f:
+                            f.write(report)
+                    else:
+                        sink.write(report)
+                        sink.write("\n")
+                    reports += 1
+        finally:
+            if sink is not None:
+                sink.close()
+        
+        elapsed = time.perf_counter() - start
+        return {
+            'reports': reports,
+            'errors': errors,
+            'seconds': elapsed,
+            'reports_per_second': reports / elapsed if elapsed > 0 else 0.0
+        }
+    
+    def render_chunks(self, students: Iterable) -> Iterator[List[Tuple[str, Optional[str]]]]:
+        """
+        Gera os relatórios bloco a bloco, na ordem de entrada.
+        
+        Args:
+            students: Mesmo formato aceito por render
+        
+        Returns:
+            Iterador de listas (chave, relatório); relatório é None quando os
+            dados do estudante são inválidos
+        """
+        render = partial(_render_chunk, self.calculator, self.report_format)
+        return map_chunks(render, students, self.chunk_size, self.workers)
+
+def segment_statistics(values: np.ndarray, lengths: np.ndarray, points: np.ndarray,
+                       full: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Calcula estatísticas de vários segmentos contíguos de um array de uma vez.
+    
+    Args:
+        values: Notas de todos os segmentos concatenadas
+        lengths: Tamanho de cada segmento
+        points: Pontos GPA correspondentes a values
+        full: Se False calcula apenas contagem, média e GPA
+    
+    Returns:
+        Dict de arrays (um valor por segmento); segmentos vazios ficam com NaN
+        nas estatísticas e 0.0 no GPA
+    """
+    segments = len(lengths)
+    owner = np.repeat(np.arange(segments), lengths)
+    present = lengths > 0
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(owner, weights=values, minlength=segments) / lengths
+        gpa = np.divide(np.bincount(owner, weights=points, minlength=segments), lengths,
+                        out=np.zeros(segments), where=present)
+        stats = {'count': lengths, 'mean': mean, 'gpa': gpa}
+        
+        if not full:
+            return stats
+        
+        squared = (values - mean[owner]) ** 2
+        stats['std'] = np.sqrt(np.bincount(owner, weights=squared, minlength=segments) / lengths)
+    
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.intp)
+    ordered = values[np.lexsort((values, owner))]
+    
+    median = np.full(segments, np.nan)
+    minimum = np.full(segments, np.nan)
+    maximum = np.full(segments, np.nan)
+    first = starts[present]
+    last = first + lengths[present] - 1
+    
+    median[present] = (ordered[first + (lengths[present] - 1) // 2] + ordered[first + lengths[present] // 2]) / 2
+    minimum[present] = ordered[first]
+    maximum[present] = ordered[last]
+    
+    stats.update({'median': median, 'min': minimum, 'max': maximum})
+    return stats
+
+def _render_chunk(calculator: GradeCalculator, report_format: str,
+                  chunk: List) -> List[Tuple[str, Optional[str]]]:
+    """Calcula as estatísticas de um bloco e preenche os templates."""
+    if report_format == 'student':
+        return _render_student_chunk(calculator, chunk)
+    return _render_grade_chunk(calculator, chunk)
+
+def _render_grade_chunk(calculator: GradeCalculator, chunk: List) -> List[Tuple[str, Optional[str]]]:
+    """Relatórios no formato de GradeCalculator.create_grade_report."""
+    subject_lengths = np.fromiter(
+        (len(grades) for _, grades_data in chunk for grades in grades_data.values()), dtype=np.intp
+    )
+    values = np.fromiter(
+        chain.from_iterable(grades for _, grades_data in chunk for grades in grades_data.values()),
+        dtype=float, count=int(subject_lengths.sum())
+    )
+    points = calculator.grades_to_points(values)
+    
+    subjects_per_student = np.fromiter((len(grades_data) for _, grades_data in chunk), dtype=np.intp,
+                                       count=len(chunk))
+    subject_owner = np.repeat(np.arange(len(chunk)), subjects_per_student)
+    student_lengths = np.bincount(subject_owner, weights=subject_lengths, minlength=len(chunk)).astype(np.intp)
+    
+    student_stats = segment_statistics(values, student_lengths, points)
+    subject_stats = segment_statistics(values, subject_lengths, points, full=False)
+    
+    rendered = []
+    slot = 0
+    for index, (student_name, grades_data) in enumerate(chunk):
+        if student_lengths[index] == 0:
+            rendered.append((student_name, None))
+            slot += len(grades_data)
+            continue
+        
+        report = GRADE_REPORT_TEMPLATE.format(
+            student_name=student_name,
+            total_subjects=len(grades_data),
+            total_grades=student_lengths[index],
+            average_grade=student_stats['mean'][index],
+            median_grade=student_stats['median'][index],
+            std_deviation=student_stats['std'][index],
+            min_grade=student_stats['min'][index],
+            max_grade=student_stats['max'][index],
+            gpa=student_stats['gpa'][index]
+        )
+        lines = [report]
+        for subject in grades_data:
+            lines.append(SUBJECT_LINE_TEMPLATE.format(
+                subject=subject, average=subject_stats['mean'][slot], gpa=subject_stats['gpa'][slot]
+            ))
+            slot += 1
+        rendered.append((student_name, ''.join(lines)))
+    
+    return rendered
+
+def _render_student_chunk(calculator: GradeCalculator, chunk: List[Dict]) -> List[Tuple[str, Optional[str]]]:
+    """Relatórios no formato de utils.helpers.create_student_report."""
+    valid = [student for student in chunk if validate_student_data(student) and student['grades']]
+    lengths = np.fromiter((len(student['grades']) for student in valid), dtype=np.intp, count=len(valid))
+    values = np.fromiter(chain.from_iterable(student['grades'] for student in valid),
+                         dtype=float, count=int(lengths.sum()))
+    stats = segment_statistics(values, lengths, calculator.grades_to_points(values), full=False)
+    
+    rendered = []
+    index = 0
+    for student in chunk:
+        key = str(student.get('student_id', student.get('name', '')))
+        if index >= len(valid) or student is not valid[index]:
+            rendered.append((key, None))
+            continue
+        
+        average = stats['mean'][index]
+        report = STUDENT_REPORT_TEMPLATE.format(
+            name=student['name'],
+            student_id=student['student_id'],
+            average=average,
+            gpa=stats['gpa'][index],
+            # As notas originais, formatadas como em create_student_report (85 ou 85.0)
+            highest=max(student['grades']),
+            lowest=min(student['grades']),
+            total=lengths[index],
+            analysis=performance_analysis(average)
+        )
+        rendered.append((key, report.strip()))
+        index += 1
+    
+    return rendered
+
+def _safe_filename(name: str) -> str:
+    """Converte um nome de estudante num nome de arquivo seguro."""
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('_') or 'relatorio'
+
+if __name__ == "__main__":
+    # Exemplo de uso: 10 mil relatórios em um único arquivo
+    rng = np.random.default_rng(42)
+    subjects = ["Cálculo I", "Programação", "Física", "Química"]
+    
+    students = (
+        (f"Estudante {i}", {subject: list(rng.integers(40, 101, 3)) for subject in subjects})
+        for i in range(10_000)
+    )
+    
+    renderer = BulkReportRenderer(workers=4)
+    result = renderer.render(students, os.path.join("reports", "relatorios.txt"))
+    print(f"{result['reports']} relatórios em {result['seconds']:.2f}s "
+          f"({result['reports_per_second']:.0f} relatórios/s)")
@@ -0,0 +1,164 @@
+import math
+import os
+import sys
+import numpy as np
+from typing import Dict, Optional
+
+if __package__ in (None, ""):
+    # Execução direta (python src/data_analysis/streaming_statistics.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis.grade_calculator import GradeCalculator
+
+class StreamingGradeStatistics:
+    """
+    Acumulador incremental de estatísticas de notas com memória constante.
+    
+    Mantém média, variância (Welford/Chan), mínimo, máximo e o total de pontos
+    GPA sem guardar as notas. Mediana e quantis vêm de um histograma de largura
+    fixa sobre [0, max_grade]: para notas dentro desse intervalo o erro absoluto
+    é no máximo bin_width / 2. Notas fora do intervalo entram nas faixas das
+    pontas e não têm essa garantia. Acumuladores de workers paralelos podem ser
+    combinados com merge.
+    """
+    
+    def __init__(self, calculator: Optional[GradeCalculator] = None,
+                 bin_width: float = 0.1, max_grade: float = 100.0):
+        if bin_width <= 0:
+            raise ValueError("bin_width must be positive")
+        
+        self.calculator = calculator or GradeCalculator()
+        self.bin_width = bin_width
+        self.max_grade = max_grade
+        
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.gpa_points_total = 0.0
+        self._histogram = np.zeros(int(math.floor(max_grade / bin_width)) + 1, dtype=np.int64)
+    
+    @property
+    def error_bound(self) -> float:
+        """Erro absoluto máximo da mediana e dos quantis para notas em [0, max_grade]."""
+        return self.bin_width / 2
+    
+    def update(self, grades) -> 'StreamingGradeStatistics':
+        """
+        Acrescenta um lote de notas ao acumulador.
+        
+        Args:
+            grades: Notas (lista, array ou Series); NaN é ignorado
+        
+        Returns:
+            O próprio acumulador
+        """
+        values = np.asarray(grades, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        
+        batch_mean = values.mean()
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._combine(values.size, batch_mean, batch_m2, values.min(), values.max())
+        
+        bins = np.clip((values / self.bin_width).astype(np.intp), 0, len(self._histogram) - 1)
+        self._histogram += np.bincount(bins, minlength=len(self._histogram))
+        self.gpa_points_total += float(self.calculator.grades_to_points(values).sum())
+        
+        return self
+    
+    def merge(self, other: 'StreamingGradeStatistics') -> 'StreamingGradeStatistics':
+        """
+        Combina outro acumulador (por exemplo, de outro worker) neste.
+        
+        Args:
+            other: Acumulador com a mesma configuração de histograma
+        
+        Returns:
+            O próprio acumulador
+        """
+        if other.bin_width != self.bin_width or other.max_grade != self.max_grade:
+            raise ValueError("Accumulators must share bin_width and max_grade")
+        
+        if other.count:
+            self._combine(other.count, other.mean, other._m2, other.min, other.max)
+            self._histogram += other._histogram
+            self.gpa_points_total += other.gpa_points_total
+        
+        return self
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estima um quantil das notas acumuladas (interpolação linear, como np.quantile).
+        
+        Args:
+            q: Quantil entre 0 e 1
+        
+        Returns:
+            Valor estimado, com erro máximo de error_bound
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return float('nan')
+        
+        position = (self.count - 1) * q
+        lower = self._order_statistic(math.floor(position))
+        upper = self._order_statistic(math.ceil(position))
+        return lower + (upper - lower) * (position - math.floor(position))
+    
+    def result(self) -> Dict:
+        """
+        Retorna as estatísticas acumuladas até agora.
+        
+        Returns:
+            Dict com as mesmas chaves de calculate_semester_statistics (exceto
+            total_subjects), mais gpa_points_total e median_error_bound
+        """
+        if not self.count:
+            return {}
+        
+        return {
+            'total_grades': self.count,
+            'average_grade': self.mean,
+            'median_grade': self.quantile(0.5),
+            'std_deviation': math.sqrt(self._m2 / self.count),
+            'min_grade': self.min,
+            'max_grade': self.max,
+            'gpa': self.gpa_points_total / self.count,
+            'gpa_points_total': self.gpa_points_total,
+            'median_error_bound': self.error_bound
+        }
+    
+    def _combine(self, count: int, mean: float, m2: float, minimum: float, maximum: float):
+        """Combina momentos de dois conjuntos (algoritmo paralelo de Chan)."""
+        total = self.count + count
+        delta = mean - self.mean
+        
+        self.mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(minimum))
+        self.max = max(self.max, float(maximum))
+    
+    def _order_statistic(self, k: int) -> float:
+        """Estima a k-ésima menor nota (base 0) pelo centro da faixa que a contém."""
+        cumulative = np.cumsum(self._histogram)
+        index = int(np.searchsorted(cumulative, k, side='right'))
+        estimate = (index + 0.5) * self.bin_width
+        return min(max(estimate, self.min), self.max)
+
+if __name__ == "__main__":
+    # Exemplo de uso: dois workers processando partes do fluxo
+    rng = np.random.default_rng(42)
+    grades = rng.uniform(0, 100, 100_000)
+    
+    worker_a = StreamingGradeStatistics().update(grades[:50_000])
+    worker_b = StreamingGradeStatistics().update(grades[50_000:])
+    stats = worker_a.merge(worker_b).result()
+    
+    print(f"Média: {stats['average_grade']:.2f} (exata: {np.mean(grades):.2f})")
+    print(f"Mediana: {stats['median_grade']:.2f} (exata: {np.median(grades):.2f}, erro máx. {stats['median_error_bound']})")
+    print(f"GPA: {stats['gpa']:.2f}")
@@ -1,9 +1,17 @@
 import os
+import sys
 import json
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+import numpy as np
 import pandas as pd
 
+if __package__ in (None, ""):
+    # Execução direta (python src/utils/helpers.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis.grade_scale import GradeScale
+
 def save_to_json(data: Any, filename: str, directory: str = "data") -> str:
     """
     Salva dados em formato JSON.
@@ -81,46 +89,29 @@ def format_date(date_str: str, input_format: str = "%Y-%m-%d", output_format: st
     except ValueError:
         return date_str
 
-def calculate_gpa(grades: List[float], credit_hours: List[int] = None) -> float:
+def calculate_gpa(grades: List[float], credit_hours: List[int] = None,
+                  grade_scale: Optional[GradeScale] = None) -> float:
     """
     Calcula GPA (Grade Point Average).
     
     Args:
         grades: Lista de notas (0-100)
         credit_hours: Lista de créditos (opcional)
+        grade_scale: Escala GPA compilada (padrão: GradeScale.default())
         
     Returns:
         GPA calculado
     """
-    if not grades:
+    if len(grades) == 0:
         return 0.0
     
-    # Converter notas para sistema 4.0
-    def grade_to_gpa(grade):
-        if grade >= 90:
-            return 4.0
-        elif grade >= 85:
-            return 3.7
-        elif grade >= 80:
-            return 3.3
-        elif grade >= 75:
-            return 3.0
-        elif grade >= 70:
-            return 2.7
-        elif grade >= 65:
-            return 2.3
-        elif grade >= 60:
-            return 2.0
-        else:
-            return 0.0
-    
-    gpa_values = [grade_to_gpa(grade) for grade in grades]
-    
-    if credit_hours:
-        weighted_gpa = sum(g * c for g, c in zip(gpa_values, credit_hours))
-        return weighted_gpa / sum(credit_hours)
+    # Converter notas para sistema 4.0; notas acima da escala contam como a faixa máxima
+    scale = grade_scale or GradeScale.default()
+    
+    if credit_hours is not None and len(credit_hours):
+        return float(scale.gpa(grades, credit_hours, clip=True))
     else:
-        return sum(gpa_values) / len(gpa_values)
+        return float(scale.gpa(grades, clip=True))
 
 def validate_student_data(data: Dict) -> bool:
     """
@@ -146,6 +137,42 @@ def validate_student_data(data: Dict) -> bool:
     
     return True
 
+STUDENT_REPORT_TEMPLATE = """
+    📋 RELATÓRIO DO ESTUDANTE
+    
+    Nome: {name}
+    Matrícula: {student_id}
+    
+    📊 DESEMPENHO:
+    - Média das notas: {average:.2f}
+    - GPA: {gpa:.2f}
+    - Maior nota: {highest}
+    - Menor nota: {lowest}
+    - Total de avaliações: {total}
+    
+    📈 ANÁLISE:
+    {analysis}
+    """
+
+def performance_analysis(average: float) -> str:
+    """
+    Retorna a análise textual do desempenho a partir da média.
+    
+    Args:
+        average: Média das notas
+        
+    Returns:
+        Frase de análise usada no relatório do estudante
+    """
+    if average >= 90:
+        return "Excelente desempenho!"
+    elif average >= 75:
+        return "Bom desempenho, continue assim!"
+    elif average >= 60:
+        return "Precisa melhorar, busque ajuda!"
+    else:
+        return "Atenção urgente necessária!"
+
 def create_student_report(student_data: Dict) -> str:
     """
     Cria relatório formatado para estudante.
@@ -168,25 +195,16 @@ def create_student_report(student_data: Dict) -> str:
     highest = max(grades)
     lowest = min(grades)
     
-    report = f"""
-    📋 RELATÓRIO DO ESTUDANTE
-    
-    Nome: {name}
-    Matrícula: {student_id}
-    
-    📊 DESEMPENHO:
-    - Média das notas: {average:.2f}
-    - GPA: {gpa:.2f}
-    - Maior nota: {highest}
-    - Menor nota: {lowest}
-    - Total de avaliações: {len(grades)}
-    
-    📈 ANÁLISE:
-    {"Excelente desempenho!" if average >= 90 else 
-     "Bom desempenho, continue assim!" if average >= 75 else
-     "Precisa melhorar, busque ajuda!" if average >= 60 else
-     "Atenção urgente necessária!"}
-    """
+    report = STUDENT_REPORT_TEMPLATE.format(
+        name=name,
+        student_id=student_id,
+        average=average,
+        gpa=gpa,
+        highest=highest,
+        lowest=lowest,
+        total=len(grades),
+        analysis=performance_analysis(average)
+    )
     
     return report.strip()
 
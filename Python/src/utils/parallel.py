@@ -0,0 +1,51 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Divide um iterável em listas de até size elementos."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def map_chunks(func: Callable[[List[T]], R], iterable: Iterable[T], chunk_size: int,
+               workers: int) -> Iterator[R]:
+    """
+    Aplica func a cada bloco de até chunk_size itens, na ordem de entrada.
+    
+    Com workers > 1 os blocos rodam num pool de processos (func precisa ser
+    serializável: uma função de módulo ou um functools.partial dela). No
+    máximo workers * 2 blocos ficam em voo, então a entrada é consumida aos
+    poucos e nunca materializada inteira.
+    
+    Args:
+        func: Função que recebe um bloco (lista de itens)
+        iterable: Itens de entrada
+        chunk_size: Tamanho máximo de cada bloco
+        workers: Número de processos (1 ou menos: no processo atual)
+    
+    Returns:
+        Iterador com o resultado de cada bloco
+    """
+    chunks = chunked(iterable, chunk_size)
+    
+    if workers <= 1:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,18 +1,56 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import json
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 from datetime import datetime
 import os
+import sys
+
+if __package__ in (None, ""):
+    # Execução direta (python src/web_scraping/course_scraper.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraping.crawl_frontier import CrawlFrontier
+from web_scraping.crawler import CrawlEngine
+from web_scraping.csv_export import export_csv, iter_jsonl
+from web_scraping.downloader import MaterialDownloader, safe_filename, url_digest
+from web_scraping.http_cache import CachedSession, HTTPCache
+from web_scraping.parsers import PageParser
+from web_scraping.segment_store import SegmentStore
+from web_scraping.vacancy_watcher import VacancyWatcher
 
 class CourseScraper:
     """
     Web scraper para coletar informações educacionais de plataformas acadêmicas.
+    
+    Com cache_dir, as páginas ficam num cache HTTP em disco (HTTPCache):
+    cache_ttls define por quanto tempo cada endpoint vale sem revalidar
+    ({regex da URL: segundos}) e, depois disso, a página é revalidada com
+    GET condicional (ETag / Last-Modified). Os contadores ficam em
+    self.cache.stats().
+    
+    self.parser extrai só os trechos relevantes das páginas (tabela de
+    turmas, lista de materiais) com o backend mais rápido disponível, ou com
+    parser_backend; self.parser.extractor('timetable') serve de parse para
+    crawl.
+    
+    Com segment_dir, _save_data acrescenta os registros a segmentos JSON
+    Lines (SegmentStore) em vez de escrever um arquivo por entidade;
+    export_saved recria o layout de um arquivo por entidade. Chame close()
+    ao terminar para gravar o que estiver no buffer.
+    
+    Com frontier_path, crawl registra numa CrawlFrontier (SQLite) o que já
+    foi coletado: uma coleta interrompida continua de onde parou e páginas
+    coletadas há menos de frontier_stale_after segundos não são baixadas de
+    novo.
     """
     
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, cache_dir: Optional[str] = None, cache_ttls: Optional[Dict[str, float]] = None,
+                 cache_max_bytes: int = 100 * 1024 * 1024, parser_backend: Optional[str] = None,
+                 segment_dir: Optional[str] = None, frontier_path: Optional[str] = None,
+                 frontier_stale_after: Optional[float] = None):
+        self.cache = HTTPCache(cache_dir, max_bytes=cache_max_bytes, ttls=cache_ttls) if cache_dir else None
+        self.session = CachedSession(self.cache) if self.cache is not None else requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -21,6 +59,34 @@ class CourseScraper:
             'moodle': 'https://moodle.ufpb.br',
             'drive': 'https://drive.google.com'
         }
+        self.crawl_engine = None
+        self.parser = PageParser(parser_backend)
+        self.store = SegmentStore(segment_dir) if segment_dir else None
+        self.frontier = CrawlFrontier(frontier_path, frontier_stale_after) if frontier_path else None
+    
+    def crawl(self, urls: Iterable[str], parse: Optional[Callable] = None, **options) -> Iterator[Dict]:
+        """
+        Coleta várias páginas em paralelo (por exemplo, todas as turmas do SIGAA).
+        
+        Args:
+            urls: URLs a baixar
+            parse: Função aplicada a cada resposta (padrão: o texto da página)
+            **options: Limites do CrawlEngine (max_workers, per_host, rate, retries...)
+            
+        Returns:
+            Iterador de resultados (url, status, data, attempts, elapsed, error);
+            as métricas ficam em self.crawl_engine.stats(). Com frontier_path,
+            só as URLs pendentes (inclusive as de coletas anteriores) são
+            baixadas
+        """
+        if self.cache is not None:
+            options.setdefault('session_factory', lambda: CachedSession(self.cache))
+        self.crawl_engine = CrawlEngine(headers=dict(self.session.headers), **options)
+        
+        if self.frontier is None:
+            return self.crawl_engine.crawl(urls, parse)
+        self.frontier.add(urls)
+        return self.frontier.track(self.crawl_engine.crawl(self.frontier.claimed(), parse))
     
     def scrape_course_schedule(self, semester: str) -> Dict:
         """
@@ -100,12 +166,41 @@ class CourseScraper:
         self._save_data(mock_materials, f"materials_{course_code}.json")
         return mock_materials
     
-    def monitor_course_vacancies(self, course_code: str) -> Dict:
+    def download_materials(self, course_code: str, directory: str = "materials",
+                           **options) -> Iterator[Dict]:
+        """
+        Baixa os arquivos dos materiais de uma disciplina para directory/<código>/.
+        
+        Args:
+            course_code: Código da disciplina
+            directory: Diretório raiz dos materiais
+            **options: Parâmetros do MaterialDownloader (max_workers, per_host, retries...)
+        
+        Returns:
+            Iterador dos resultados de MaterialDownloader.download; arquivos
+            já baixados e inalterados são pulados
+        """
+        options.setdefault('headers', dict(self.session.headers))
+        downloader = MaterialDownloader(directory, **options)
+        items = []
+        for material in self.scrape_course_materials(course_code):
+            # Títulos se repetem numa disciplina; o resumo da URL desempata
+            name = f"{safe_filename(material['title'])}_{url_digest(material['url'])}"
+            if material.get('type'):
+                name += f".{material['type'].lower()}"
+            items.append({'url': material['url'], 'filename': os.path.join(course_code, name)})
+        try:
+            yield from downloader.download_all(items)
+        finally:
+            downloader.close()
+    
+    def monitor_course_vacancies(self, course_code: str, save: bool = True) -> Dict:
         """
         Monitora vagas disponíveis em uma turma.
         
         Args:
             course_code: Código da turma
+            save: Se False, não grava vacancy_<código>.json
             
         Returns:
             Informações sobre vagas
@@ -120,9 +215,31 @@ class CourseScraper:
             "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        self._save_data(mock_vacancy, f"vacancy_{course_code}.json")
+        if save:
+            self._save_data(mock_vacancy, f"vacancy_{course_code}.json")
         return mock_vacancy
     
+    def watch_vacancies(self, course_codes: Iterable[str], **options) -> VacancyWatcher:
+        """
+        Cria um VacancyWatcher para várias turmas.
+        
+        O arquivo vacancy_<código>.json só é regravado quando as vagas mudam.
+        
+        Args:
+            course_codes: Códigos das turmas
+            **options: Parâmetros do VacancyWatcher (budget, min_interval, max_interval...)
+        
+        Returns:
+            VacancyWatcher pronto para run_pending / run_forever
+        """
+        watcher = VacancyWatcher(
+            lambda code: self.monitor_course_vacancies(code, save=False),
+            save=lambda code, data: self._save_data(data, f"vacancy_{code}.json"),
+            **options
+        )
+        watcher.watch(course_codes)
+        return watcher
+    
     def scrape_professor_reviews(self, professor_name: str) -> List[Dict]:
         """
         Coleta avaliações de professores (simulado).
@@ -199,6 +316,10 @@ class CourseScraper:
             data: Dados a serem salvos
             filename: Nome do arquivo
         """
+        if self.store is not None:
+            self.store.append(os.path.splitext(filename)[0], data)
+            return
+        
         save_dir = "scraped_data"
         os.makedirs(save_dir, exist_ok=True)
         
@@ -206,17 +327,54 @@ class CourseScraper:
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
     
-    def export_to_csv(self, data: List[Dict], filename: str):
+    def export_saved(self, directory: str = "scraped_data") -> int:
         """
-        Exporta dados para CSV.
+        Exporta os dados dos segmentos no layout de um arquivo por entidade.
         
         Args:
-            data: Lista de dicionários
-            filename: Nome do arquivo CSV
+            directory: Diretório de destino
+        
+        Returns:
+            Número de arquivos escritos
+        """
+        if self.store is None:
+            raise ValueError("CourseScraper criado sem segment_dir")
+        return self.store.export(directory)
+    
+    def close(self):
+        """Grava os registros pendentes e fecha o cache HTTP e a fronteira."""
+        if self.store is not None:
+            self.store.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.frontier is not None:
+            self.frontier.close()
+    
+    def export_to_csv(self, data: Union[Iterable[Dict], str], filename: str,
+                      columns: Optional[List[str]] = None, compress: Optional[bool] = None) -> Dict:
+        """
+        Exporta dados para CSV, em blocos e com memória constante.
+        
+        Args:
+            data: Lista ou gerador de dicionários, ou o caminho de um arquivo
+                JSON Lines / diretório de segmentos (ver iter_jsonl; só a versão
+                mais recente de cada entidade)
+            filename: Nome do arquivo CSV (.csv.gz grava comprimido)
+            columns: Colunas fixas (padrão: inferidas dos primeiros registros)
+            compress: Força (ou desliga) o gzip
+        
+        Returns:
+            Dict com rows, columns, seconds e rows_per_second
         """
-        df = pd.DataFrame(data)
-        df.to_csv(filename, index=False, encoding='utf-8')
-        print(f"Dados exportados para {filename}")
+        if self.store is not None and isinstance(data, str):
+            if os.path.abspath(data) == os.path.abspath(self.store.root):
+                # O que ainda está no buffer deste processo entra na exportação
+                self.store.flush()
+        records = iter_jsonl(data) if isinstance(data, str) else data
+        result = export_csv(records, filename, columns=columns, compress=compress)
+        print(f"Dados exportados para {filename} ({result['rows']} linhas, "
+              f"{result['rows_per_second']:,.0f} linhas/s)")
+        return result
 
 if __name__ == "__main__":
     scraper = CourseScraper()
@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+if __package__ in (None, ""):
+    # Execução direta (python src/web_scraping/crawl_frontier.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUEUED = 'queued'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+STATES = (QUEUED, IN_FLIGHT, DONE, FAILED)
+
+class CrawlFrontier:
+    """
+    Fronteira de coleta persistente em SQLite.
+    
+    Cada URL (ou chave de entidade, como "materials:MAT001") tem um estado:
+    queued, in_flight, done ou failed. add ignora o que já está na fila ou
+    foi coletado há menos de stale_after segundos, e recoloca na fila as
+    entradas vencidas e as falhas com menos de max_attempts tentativas.
+    Entradas in_flight de um processo interrompido voltam para a fila na
+    abertura, então reiniciar a coleta custa só o trabalho restante.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS frontier (
+        url TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        queued_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL,
+        status INTEGER,
+        error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_frontier_state ON frontier (state, queued_at);
+    """
+    
+    def __init__(self, path: str = "crawl_frontier.db", stale_after: Optional[float] = None,
+                 max_attempts: int = 3, timeout: float = 30.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self.recovered = self.recover()
+    
+    def close(self):
+        """Fecha a conexão com o banco."""
+        self._conn.close()
+    
+    def add(self, urls: Iterable[str], batch_size: int = 1000) -> int:
+        """
+        Enfileira URLs, sem duplicar as que já estão na fronteira.
+        
+        Args:
+            urls: URLs ou chaves (aceita geradores; gravadas em lotes)
+            batch_size: Entradas por transação
+        
+        Returns:
+            Número de entradas novas ou recolocadas na fila
+        """
+        urls = (normalize_url(url) for url in urls)
+        queued = 0
+        while True:
+            batch = list(islice(urls, batch_size))
+            if not batch:
+                return queued
+            
+            now = self.clock()
+            stale_cutoff = now - self.stale_after if self.stale_after is not None else None
+            with self._lock, self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT INTO frontier (url, state, queued_at) VALUES (?, 'queued', ?)"
+                    " ON CONFLICT(url) DO UPDATE SET state = 'queued', queued_at = excluded.queued_at"
+                    " WHERE (state = 'failed' AND attempts < ?)"
+                    " OR (state IN ('done', 'failed') AND finished_at <= ?)",
+                    [(url, now, self.max_attempts, stale_cutoff) for url in batch]
+                )
+                queued += self._conn.total_changes - before
+    
+    def claim(self, limit: int = 100) -> List[str]:
+        """
+        Retira até limit entradas da fila, marcando-as como in_flight.
+        
+        Returns:
+            URLs na ordem em que foram enfileiradas
+        """
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT url FROM frontier WHERE state = 'queued' ORDER BY queued_at, rowid LIMIT ?", (limit,)
+            ).fetchall()
+            urls = [row[0] for row in rows]
+            self._conn.executemany(
+                "UPDATE frontier SET state = 'in_flight', started_at = ?, attempts = attempts + 1 WHERE url = ?",
+                [(self.clock(), url) for url in urls]
+            )
+            return urls
+    
+    def claimed(self, batch_size: int = 100) -> Iterator[str]:
+        """Iterador que vai retirando a fila em lotes até esvaziá-la."""
+        while True:
+            urls = self.claim(batch_size)
+            if not urls:
+                return
+            yield from urls
+    
+    def complete(self, url: str, status: Optional[int] = None):
+        """Marca uma entrada como coletada (zerando as tentativas)."""
+        self._finish(normalize_url(url), DONE, status, None)
+    
+    def fail(self, url: str, error: str, status: Optional[int] = None):
+        """Marca uma entrada como falha (volta à fila no próximo add, até max_attempts)."""
+        self._finish(normalize_url(url), FAILED, status, error)
+    
+    def record(self, result: Dict):
+        """Registra um resultado de CrawlEngine.fetch (done ou failed)."""
+        if result['error'] is None:
+            self.complete(result['url'], result['status'])
+        else:
+            self.fail(result['url'], result['error'], result['status'])
+    
+    def track(self, results: Iterable[Dict]) -> Iterator[Dict]:
+        """Repassa resultados de CrawlEngine.crawl registrando cada um."""
+        for result in results:
+            self.record(result)
+            yield result
+    
+    def recover(self) -> int:
+        """
+        Devolve à fila as entradas in_flight (coleta interrompida).
+        
+        Returns:
+            Número de entradas recolocadas
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE frontier SET state = 'queued', attempts = MAX(attempts - 1, 0) WHERE state = 'in_flight'"
+            ).rowcount
+    
+    def requeue_stale(self) -> int:
+        """
+        Recoloca na fila as entradas coletadas há mais de stale_after segundos.
+        
+        Returns:
+            Número de entradas recolocadas
+        """
+        if self.stale_after is None:
+            return 0
+        now = self.clock()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE frontier SET state = 'queued', queued_at = ? WHERE state IN ('done', 'failed')"
+                " AND finished_at <= ?",
+                (now, now - self.stale_after)
+            ).rowcount
+    
+    def state(self, url: str) -> Optional[Dict]:
+        """Estado, tentativas, status e erro de uma entrada."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, attempts, status, error, finished_at FROM frontier WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('state', 'attempts', 'status', 'error', 'finished_at'), row))
+    
+    def counts(self) -> Dict[str, int]:
+        """Número de entradas em cada estado."""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(rows)
+        return counts
+    
+    def _finish(self, url: str, state: str, status: Optional[int], error: Optional[str]):
+        with self._lock, self._conn:
+            # Um sucesso encerra a sequência de falhas: max_attempts vale por ciclo
+            self._conn.execute(
+                "UPDATE frontier SET state = ?, finished_at = ?, status = ?, error = ?,"
+                " attempts = CASE WHEN ? = 'done' THEN 0 ELSE attempts END WHERE url = ?",
+                (state, self.clock(), status, error, state, url)
+            )
+
+def normalize_url(url: str) -> str:
+    """
+    Forma canônica para deduplicação: esquema e host em minúsculas, sem
+    fragmento e sem porta padrão. Chaves que não são URLs ficam como estão.
+    """
+    if "://" not in url:
+        return url
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, parts.port) in (('http', 80), ('https', 443)):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+if __name__ == "__main__":
+    # Exemplo de uso: interrompa com Ctrl+C e rode de novo para continuar
+    from web_scraping.crawler import CrawlEngine
+    
+    frontier = CrawlFrontier("crawl_frontier.db", stale_after=24 * 3600)
+    codes = [f"MAT{number:03d}" for number in range(1, 501)]
+    print("Novas:", frontier.add(f"https://sigaa.ufpb.br/sigaa/public/turmas/listar.jsf?codigo={code}"
+                                 for code in codes))
+    
+    engine = CrawlEngine(max_workers=16, per_host=4, rate=10)
+    for result in frontier.track(engine.crawl(frontier.claimed())):
+        print(result['url'], result['status'], result['error'])
+    print(frontier.counts())
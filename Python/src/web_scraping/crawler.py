@@ -0,0 +1,273 @@
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+# Respostas que valem nova tentativa
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """
+    Limitador de taxa: rate fichas por segundo, acumulando até capacity.
+    
+    acquire bloqueia até haver uma ficha; a espera é calculada, não
+    consultada em laço.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Consome fichas, esperando se necessário.
+        
+        Returns:
+            Segundos esperados
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            # Saldo negativo = reserva: quem chega depois espera também por esta ficha
+            wait_time = max(0.0, -self._tokens / self.rate)
+        
+        if wait_time:
+            self.sleep(wait_time)
+        return wait_time
+
+class HostLimits:
+    """
+    Limites por host, criados no primeiro uso: no máximo per_host requisições
+    simultâneas e, com rate, um token bucket (rate requisições/s, até burst).
+    """
+    
+    def __init__(self, per_host: int, rate: Optional[float] = None, burst: Optional[float] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+    
+    @contextmanager
+    def slot(self, host: str):
+        """Ocupa uma vaga do host (e uma ficha do bucket) durante o bloco with."""
+        with self._lock:
+            slots = self._slots.get(host)
+            if slots is None:
+                slots = self._slots[host] = threading.BoundedSemaphore(self.per_host)
+                if self.rate:
+                    self._buckets[host] = TokenBucket(self.rate, self.burst, sleep=self.sleep)
+            bucket = self._buckets.get(host)
+        
+        with slots:
+            if bucket is not None:
+                bucket.acquire()
+            yield
+
+class ThreadSessions:
+    """Uma requests.Session por thread (requests.Session não é segura entre threads)."""
+    
+    def __init__(self, factory: Callable[[], requests.Session] = requests.Session,
+                 headers: Optional[Dict] = None):
+        self.factory = factory
+        self.headers = headers if headers is not None else {}
+        self._local = threading.local()
+    
+    def get(self) -> requests.Session:
+        """Sessão da thread atual, criada no primeiro uso com os headers padrão."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self.factory()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+class CrawlEngine:
+    """
+    Motor de coleta concorrente sobre requests, com um pool de threads.
+    
+    Limita as requisições simultâneas no total (max_workers) e por host
+    (per_host), aplica um token bucket por host (rate requisições/s) e
+    repete falhas transitórias (erros de conexão, timeouts, 429 e 5xx) com
+    backoff exponencial com jitter, respeitando Retry-After. Mede a vazão de
+    todas as requisições e a latência das últimas LATENCY_WINDOW.
+    """
+    
+    # Latências guardadas para os percentis (memória constante em coletas longas)
+    LATENCY_WINDOW = 10_000
+    
+    def __init__(self, max_workers: int = 16, per_host: int = 4, rate: Optional[float] = None,
+                 burst: Optional[float] = None, retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 10.0, timeout: float = 10.0, headers: Optional[Dict] = None,
+                 session_factory: Callable[[], requests.Session] = requests.Session,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.session_factory = session_factory
+        self.sleep = sleep
+        
+        self._sessions = ThreadSessions(session_factory, self.headers)
+        self._hosts = HostLimits(per_host, rate, burst, sleep=sleep)
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+        self._counters = {'requests': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'bytes': 0}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+    
+    def fetch(self, url: str, parse: Optional[Callable[[requests.Response], Any]] = None) -> Dict:
+        """
+        Baixa uma URL respeitando os limites e repetindo falhas transitórias.
+        
+        Args:
+            url: Endereço
+            parse: Função aplicada à resposta (padrão: guarda response.text)
+        
+        Returns:
+            Dict com url, status, data (resultado de parse), attempts,
+            elapsed (segundos, todas as tentativas) e error (None se deu certo)
+        """
+        if self._started is None:
+            self._started = time.perf_counter()
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        result = {'url': url, 'status': None, 'data': None, 'attempts': 0, 'elapsed': 0.0, 'error': None}
+        
+        for attempt in range(self.retries + 1):
+            result['attempts'] = attempt + 1
+            retry_after = None
+            try:
+                response = self._request(host, url)
+                result['status'] = response.status_code
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = _retry_after(response)
+                    result['error'] = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    result['data'] = parse(response) if parse is not None else response.text
+                    result['error'] = None
+                    self._count('bytes', len(response.content))
+                    break
+            except (requests.ConnectionError, requests.Timeout) as e:
+                result['error'] = repr(e)
+            except Exception as e:
+                # Erros permanentes (4xx, falha no parse) não são repetidos
+                result['error'] = repr(e)
+                break
+            
+            if attempt < self.retries:
+                self._count('retries')
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                self.sleep(max(delay, retry_after or 0.0))
+        
+        self._finished = time.perf_counter()
+        result['elapsed'] = self._finished - start
+        self._count('failed' if result['error'] else 'succeeded')
+        return result
+    
+    def crawl(self, urls: Iterable[str], parse: Optional[Callable[[requests.Response], Any]] = None) -> Iterator[Dict]:
+        """
+        Baixa várias URLs em paralelo.
+        
+        A entrada é consumida aos poucos (no máximo 2 * max_workers URLs em
+        voo), então aceita geradores com milhões de URLs.
+        
+        Args:
+            urls: URLs a baixar
+            parse: Função aplicada a cada resposta (executada nas threads)
+        
+        Returns:
+            Iterador dos resultados de fetch, na ordem em que terminam
+        """
+        urls = iter(urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawler") as executor:
+            pending = set()
+            for url in urls:
+                pending.add(executor.submit(self.fetch, url, parse))
+                if len(pending) >= self.max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in pending:
+                yield future.result()
+    
+    def stats(self) -> Dict:
+        """
+        Retorna vazão e latência das requisições feitas até agora.
+        
+        Returns:
+            Dict com requests (tentativas HTTP), succeeded, failed, retries,
+            bytes, seconds, throughput (URLs/s), latency_p50, latency_p95 e
+            latency_max (segundos por requisição HTTP, nas últimas
+            LATENCY_WINDOW requisições)
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            latencies = sorted(self._latencies)
+        
+        seconds = self._finished - self._started if self._finished is not None else 0.0
+        finished = stats['succeeded'] + stats['failed']
+        stats['seconds'] = seconds
+        stats['throughput'] = finished / seconds if seconds > 0 else 0.0
+        stats['latency_p50'] = statistics.median(latencies) if latencies else None
+        stats['latency_p95'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        stats['latency_max'] = latencies[-1] if latencies else None
+        return stats
+    
+    def _request(self, host: str, url: str) -> requests.Response:
+        """Uma requisição HTTP dentro dos limites do host."""
+        with self._hosts.slot(host):
+            start = time.perf_counter()
+            try:
+                return self._sessions.get().get(url, timeout=self.timeout)
+            finally:
+                latency = time.perf_counter() - start
+                with self._lock:
+                    self._counters['requests'] += 1
+                    self._latencies.append(latency)
+    
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Segundos pedidos pelo servidor em Retry-After (só o formato numérico)."""
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+if __name__ == "__main__":
+    # Exemplo de uso: todas as turmas de uma lista de códigos
+    engine = CrawlEngine(max_workers=32, per_host=8, rate=20)
+    codes = [f"MAT{number:03d}" for number in range(1, 51)]
+    urls = [f"https://sigaa.ufpb.br/sigaa/public/turmas/listar.jsf?codigo={code}" for code in codes]
+    
+    for result in engine.crawl(urls, parse=lambda response: len(response.text)):
+        print(result['url'], result['status'], result['error'])
+    print(engine.stats())
@@ -0,0 +1,144 @@
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+if __package__ in (None, ""):
+    # Execução direta (python src/web_scraping/csv_export.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraping.segment_store import is_segment_record
+
+def iter_jsonl(*paths: str, unwrap: bool = True, latest_only: bool = True) -> Iterator[Dict]:
+    """
+    Lê registros de arquivos JSON Lines (.jsonl ou .jsonl.gz) um a um.
+    
+    Um diretório é lido como um SegmentStore, sem abri-lo para escrita:
+    inclui o segmento ativo (.jsonl.open), cuja última linha pode estar
+    incompleta e é ignorada. Registros gravados depois da leitura começar
+    podem ficar de fora.
+    
+    Args:
+        *paths: Arquivos ou diretórios (de um diretório, os segmentos do
+            SegmentStore, em ordem)
+        unwrap: Se True, registros do SegmentStore (marcados com
+            "__segment_record__") viram o próprio data; um data lista vira
+            um registro por item; outros registros passam como estão
+        latest_only: Se True, só a versão mais recente de cada chave do
+            SegmentStore (como SegmentStore.get); exige uma passada extra
+            que guarda só a posição de cada chave
+    
+    Returns:
+        Iterador de Dicts
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                           if name.endswith((".jsonl", ".jsonl.open")))
+        else:
+            files = [path]
+        
+        latest = None
+        if latest_only:
+            latest = {}
+            for number, filename in enumerate(files):
+                for position, record in _read_jsonl(filename):
+                    if is_segment_record(record):
+                        latest[record['key']] = (number, position)
+        
+        for number, filename in enumerate(files):
+            for position, record in _read_jsonl(filename):
+                if not is_segment_record(record):
+                    yield record
+                    continue
+                if latest is not None and latest.get(record['key']) != (number, position):
+                    continue
+                if not unwrap:
+                    yield record
+                    continue
+                data = record['data']
+                yield from (item for item in (data if isinstance(data, list) else [data])
+                            if isinstance(item, dict))
+
+def export_csv(records: Iterable[Dict], filename: str, columns: Optional[List[str]] = None,
+               chunk_size: int = 1000, infer_rows: int = 1000, compress: Optional[bool] = None) -> Dict:
+    """
+    Escreve registros num CSV em blocos, sem carregar tudo na memória.
+    
+    Sem columns, o esquema é a união das chaves dos primeiros infer_rows
+    registros, na ordem em que aparecem; chaves que só surgem depois são
+    ignoradas e campos ausentes ficam vazios. Listas e dicts viram JSON.
+    
+    Args:
+        records: Qualquer iterável de Dicts (lista, gerador, iter_jsonl...)
+        filename: Arquivo de saída
+        columns: Esquema fixo de colunas
+        chunk_size: Registros por escrita
+        infer_rows: Registros usados para inferir o esquema
+        compress: Gzip; por padrão, se filename termina em .gz
+    
+    Returns:
+        Dict com rows, columns, seconds e rows_per_second
+    """
+    start = time.perf_counter()
+    records = iter(records)
+    if columns is None:
+        head = list(islice(records, infer_rows))
+        columns = list(dict.fromkeys(key for record in head for key in record))
+        records = chain(head, records)
+    
+    if compress is None:
+        compress = filename.endswith(".gz")
+    opener = gzip.open if compress else open
+    
+    rows = 0
+    with opener(filename, 'wt', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='', extrasaction='ignore')
+        writer.writeheader()
+        while True:
+            chunk = [_flatten(record) for record in islice(records, chunk_size)]
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            rows += len(chunk)
+    
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'columns': columns,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else 0.0
+    }
+
+def _read_jsonl(filename: str) -> Iterator[Tuple[int, Dict]]:
+    """(número da linha, registro) de um arquivo JSON Lines."""
+    if filename.endswith(".open") and not os.path.exists(filename):
+        # Segmento fechado (renomeado) entre a listagem e a leitura
+        filename = filename[:-len(".open")]
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, 'rt', encoding='utf-8') as f:
+        for position, line in enumerate(f):
+            if not line.endswith("\n") and filename.endswith(".open"):
+                # Escrita em andamento no segmento ativo
+                return
+            if line.strip():
+                yield position, json.loads(line)
+
+def _flatten(record: Dict) -> Dict:
+    """Valores aninhados como JSON, o resto como está."""
+    return {
+        key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+        for key, value in record.items()
+    }
+
+if __name__ == "__main__":
+    # Exemplo de uso: um milhão de materiais gerados sob demanda
+    materials = (
+        {'course': f"MAT{number % 500:03d}", 'title': f"Material {number}", 'type': 'PDF'}
+        for number in range(1_000_000)
+    )
+    print(export_csv(materials, "materials.csv.gz"))
@@ -0,0 +1,343 @@
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, Iterator, Optional, Union
+from urllib.parse import unquote, urlsplit
+
+import requests
+
+if __package__ in (None, ""):
+    # Execução direta (python src/web_scraping/downloader.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraping.crawler import RETRY_STATUSES, HostLimits, ThreadSessions
+
+class MaterialDownloader:
+    """
+    Baixa arquivos (PDFs, slides) em paralelo, direto para o disco.
+    
+    O corpo é gravado em blocos de chunk_size num arquivo .part, com o
+    SHA-256 calculado durante a escrita, e só vira o arquivo final (via
+    os.replace) quando termina. Um .part deixado por uma falha ou
+    interrupção é retomado com Range (e If-Range, para não emendar uma
+    versão nova numa antiga). Arquivos já baixados são revalidados com GET
+    condicional e pulados se o ETag, ou o tamanho e o Last-Modified, não
+    mudaram. Conteúdo idêntico vindo de outra URL (mesmo SHA-256) vira um
+    hard link para o arquivo existente; ETags não servem para isso, já que
+    só identificam versões de uma mesma URL. O estado de cada URL fica num
+    manifesto SQLite no diretório.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS downloads (
+        url TEXT PRIMARY KEY,
+        path TEXT NOT NULL,
+        size INTEGER,
+        etag TEXT,
+        last_modified TEXT,
+        sha256 TEXT,
+        complete INTEGER NOT NULL DEFAULT 0,
+        downloaded_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_downloads_sha256 ON downloads (sha256);
+    """
+    
+    def __init__(self, directory: str = "materials", max_workers: int = 8, per_host: int = 2,
+                 chunk_size: int = 1024 * 1024, timeout: float = 30.0, retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 30.0, headers: Optional[Dict] = None,
+                 session_factory: Callable[[], requests.Session] = requests.Session,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.directory = directory
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers = dict(headers or {})
+        self.session_factory = session_factory
+        self.sleep = sleep
+        
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(directory, ".downloads.db"), check_same_thread=False)
+        self._conn.executescript(self.SCHEMA)
+        self._sessions = ThreadSessions(session_factory, self.headers)
+        self._hosts = HostLimits(per_host)
+        self._counters = {'downloaded': 0, 'resumed': 0, 'unchanged': 0, 'duplicate': 0, 'failed': 0,
+                          'bytes': 0}
+    
+    def download(self, url: str, filename: Optional[str] = None) -> Dict:
+        """
+        Baixa uma URL (ou confirma que a cópia local está atualizada).
+        
+        Args:
+            url: Endereço do arquivo
+            filename: Caminho relativo ao diretório (padrão: o nome na URL)
+        
+        Returns:
+            Dict com url, path, result ('downloaded', 'resumed', 'unchanged',
+            'duplicate' ou 'failed'), bytes (baixados nesta chamada), size,
+            sha256 e error
+        """
+        known = self._entry(url)
+        path = self._target(url, filename, known)
+        result = {'url': url, 'path': path, 'result': None, 'bytes': 0, 'size': None, 'sha256': None,
+                  'error': None}
+        
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                with self._hosts.slot(urlsplit(url).netloc):
+                    self._transfer(url, path, known, result)
+                break
+            except _RetryableStatus as e:
+                result['error'] = f"HTTP {e.status}"
+                retry_after = e.retry_after
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                # O .part fica no disco: a próxima tentativa continua de onde parou
+                result['error'] = repr(e)
+            except Exception as e:
+                result['error'] = repr(e)
+                break
+            
+            if attempt < self.retries:
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                self.sleep(max(delay, retry_after or 0.0))
+            known = self._entry(url)
+        
+        if result['result'] is None:
+            result['result'] = 'failed'
+        else:
+            result['error'] = None
+        self._count(result['result'], result['bytes'])
+        return result
+    
+    def download_all(self, items: Iterable[Union[str, Dict]]) -> Iterator[Dict]:
+        """
+        Baixa várias URLs em paralelo (no máximo per_host por servidor).
+        
+        Args:
+            items: URLs ou Dicts com url e, opcionalmente, filename (aceita
+                geradores; URLs repetidas são baixadas uma vez)
+        
+        Returns:
+            Iterador dos resultados de download, na ordem em que terminam; uma
+            URL cujo caminho já é de outra URL da mesma chamada falha sem ser
+            baixada
+        """
+        owners = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="downloader") as executor:
+            pending = set()
+            for item in items:
+                url, filename = (item, None) if isinstance(item, str) else (item['url'], item.get('filename'))
+                if url in owners.values():
+                    continue
+                path = self._target(url, filename, self._entry(url))
+                if path in owners:
+                    self._count('failed', 0)
+                    yield {'url': url, 'path': path, 'result': 'failed', 'bytes': 0, 'size': None,
+                           'sha256': None, 'error': f"Caminho já usado por {owners[path]}"}
+                    continue
+                owners[path] = url
+                pending.add(executor.submit(self.download, url, filename))
+                if len(pending) >= self.max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in pending:
+                yield future.result()
+    
+    def stats(self) -> Dict:
+        """
+        Retorna os contadores de downloads.
+        
+        Returns:
+            Dict com downloaded, resumed, unchanged, duplicate, failed e bytes
+            (baixados pela rede)
+        """
+        with self._lock:
+            return dict(self._counters)
+    
+    def close(self):
+        """Fecha o manifesto."""
+        self._conn.close()
+    
+    def _target(self, url: str, filename: Optional[str], known: Optional[Dict]) -> str:
+        """Caminho local: filename, o já registrado para a URL ou um derivado dela."""
+        return os.path.join(self.directory, filename or (known['path'] if known else _filename_from_url(url)))
+    
+    def _transfer(self, url: str, path: str, known: Optional[Dict], result: Dict):
+        """Uma tentativa: revalida, retoma ou baixa do zero."""
+        part = path + ".part"
+        headers = {}
+        offset = 0
+        complete = known is not None and known['complete'] and os.path.exists(path)
+        
+        if complete:
+            if known['etag']:
+                headers['If-None-Match'] = known['etag']
+            if known['last_modified']:
+                headers['If-Modified-Since'] = known['last_modified']
+        elif known is not None and os.path.exists(part) and (known['etag'] or known['last_modified']):
+            offset = os.path.getsize(part)
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = known['etag'] or known['last_modified']
+        
+        with self._sessions.get().get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code in RETRY_STATUSES:
+                raise _RetryableStatus(response)
+            if response.status_code == 304 and complete:
+                self._unchanged(known, result)
+                return
+            response.raise_for_status()
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            length = _content_length(response)
+            
+            if complete and response.status_code == 200 and _same_version(known, etag, last_modified, length):
+                # Servidor ignorou o GET condicional, mas é a mesma versão
+                self._unchanged(known, result)
+                return
+            
+            if response.status_code == 200:
+                offset = 0
+            elif response.status_code != 206 or _range_start(response) != offset:
+                raise ValueError(f"Resposta inesperada a Range: {response.status_code}")
+            
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._save(url, path, None, etag, last_modified, None, complete=False)
+            digest = hashlib.sha256()
+            if offset:
+                with open(part, 'rb') as f:
+                    for block in iter(lambda: f.read(self.chunk_size), b""):
+                        digest.update(block)
+            
+            with open(part, 'ab' if offset else 'wb') as f:
+                for block in response.iter_content(self.chunk_size):
+                    f.write(block)
+                    digest.update(block)
+                    result['bytes'] += len(block)
+        
+        size = os.path.getsize(part)
+        expected = offset + length if length is not None else size
+        if size != expected:
+            raise requests.exceptions.ChunkedEncodingError(f"Download incompleto: {size} de {expected} bytes")
+        
+        sha256 = digest.hexdigest()
+        twin = self._twin(url, sha256)
+        if twin is not None and os.path.abspath(twin['path']) != os.path.abspath(path):
+            os.remove(part)
+            self._link(twin['path'], path)
+            outcome = 'duplicate'
+        else:
+            os.replace(part, path)
+            outcome = 'resumed' if offset else 'downloaded'
+        self._save(url, path, size, etag, last_modified, sha256, complete=True)
+        result.update(result=outcome, size=size, sha256=sha256)
+    
+    def _unchanged(self, known: Dict, result: Dict):
+        result.update(result='unchanged', size=known['size'], sha256=known['sha256'])
+    
+    def _link(self, source: str, path: str):
+        """Hard link para o arquivo existente (cópia se o sistema não permitir)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+        try:
+            os.link(source, path)
+        except OSError:
+            with open(source, 'rb') as src, open(path + ".part", 'wb') as dst:
+                for block in iter(lambda: src.read(self.chunk_size), b""):
+                    dst.write(block)
+            os.replace(path + ".part", path)
+    
+    def _entry(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, size, etag, last_modified, sha256, complete FROM downloads WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(('path', 'size', 'etag', 'last_modified', 'sha256', 'complete'), row))
+        entry['path'] = os.path.relpath(entry['path'], self.directory)
+        return entry
+    
+    def _twin(self, url: str, sha256: str) -> Optional[Dict]:
+        """Outra URL já baixada com o mesmo conteúdo, se o arquivo ainda existir."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM downloads WHERE sha256 = ? AND complete = 1 AND url != ?", (sha256, url)
+            ).fetchall()
+        for (path,) in rows:
+            if os.path.exists(path):
+                return {'path': path}
+        return None
+    
+    def _save(self, url: str, path: str, size: Optional[int], etag: Optional[str],
+              last_modified: Optional[str], sha256: Optional[str], complete: bool):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downloads (url, path, size, etag, last_modified, sha256, complete,"
+                " downloaded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, path, size, etag, last_modified, sha256, int(complete), time.time())
+            )
+    
+    def _count(self, outcome: str, transferred: int):
+        with self._lock:
+            self._counters[outcome] += 1
+            self._counters['bytes'] += transferred
+
+class _RetryableStatus(Exception):
+    
+    def __init__(self, response: requests.Response):
+        super().__init__(response.status_code)
+        self.status = response.status_code
+        value = response.headers.get('Retry-After')
+        self.retry_after = float(value) if value and value.isdigit() else None
+
+def _same_version(known: Dict, etag: Optional[str], last_modified: Optional[str], length: Optional[int]) -> bool:
+    """Mesmo ETag, ou (sem ETag) mesmo tamanho e Last-Modified."""
+    if etag and known['etag']:
+        return etag == known['etag']
+    return length is not None and length == known['size'] and last_modified == known['last_modified']
+
+def _content_length(response: requests.Response) -> Optional[int]:
+    value = response.headers.get('Content-Length')
+    return int(value) if value and value.isdigit() and 'Content-Encoding' not in response.headers else None
+
+def _range_start(response: requests.Response) -> Optional[int]:
+    match = re.match(r"bytes (\d+)-", response.headers.get('Content-Range', ""))
+    return int(match.group(1)) if match else None
+
+def _filename_from_url(url: str) -> str:
+    parts = urlsplit(url)
+    name = os.path.basename(unquote(parts.path)) or "index"
+    # Caminhos como /c1/slides.pdf e /c2/slides.pdf (ou .../uc?id=...) só diferem antes do nome
+    stem, extension = os.path.splitext(name)
+    return safe_filename(f"{parts.netloc}_{stem}_{url_digest(url)}{extension}")
+
+def url_digest(url: str) -> str:
+    """Resumo curto do caminho e da query de uma URL, para nomes de arquivo únicos."""
+    parts = urlsplit(url)
+    return hashlib.sha1(f"{parts.path}?{parts.query}".encode('utf-8')).hexdigest()[:10]
+
+def safe_filename(name: str) -> str:
+    """Nome de arquivo sem separadores nem caracteres problemáticos."""
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", name).strip("._") or "arquivo"
+
+if __name__ == "__main__":
+    # Exemplo de uso: espelha os materiais de algumas disciplinas
+    downloader = MaterialDownloader("materials", max_workers=8, per_host=2)
+    urls = [f"https://drive.google.com/uc?export=download&id=example_MAT00{number}" for number in range(1, 4)]
+    
+    for result in downloader.download_all(urls):
+        print(result['result'], result['path'], result['error'])
+    print(downloader.stats())
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Cabeçalhos que não valem para o corpo guardado (já decodificado)
+DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive'}
+
+class HTTPCache:
+    """
+    Cache de respostas HTTP em disco.
+    
+    Os corpos ficam em arquivos (bodies/) e os metadados (status, cabeçalhos,
+    ETag, Last-Modified, validade, último acesso) num índice SQLite. Cada
+    endpoint pode ter o seu TTL (ttls: {regex da URL: segundos}); quando o
+    total passa de max_bytes, as entradas menos usadas recentemente são
+    removidas.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        url TEXT PRIMARY KEY,
+        status INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        expires_at REAL NOT NULL,
+        last_access REAL NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+    """
+    
+    def __init__(self, directory: str = "http_cache", max_bytes: int = 100 * 1024 * 1024,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = 0.0,
+                 clock: Callable[[], float] = time.time):
+        self.directory = directory
+        self.bodies_dir = os.path.join(directory, "bodies")
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls or {}).items()]
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0,
+                         'bytes_saved': 0}
+        
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+        self._conn.executescript(self.SCHEMA)
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    
+    def ttl_for(self, url: str) -> float:
+        """TTL (segundos) do primeiro padrão que casa com a URL."""
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        Retorna a entrada da URL (com fresh indicando se ainda vale), ou None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, etag, last_modified, expires_at, size FROM entries WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        status, headers, etag, last_modified, expires_at, size = row
+        return {
+            'status': status,
+            'headers': json.loads(headers),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fresh': self.clock() < expires_at,
+            'size': size
+        }
+    
+    def load(self, url: str, entry: Dict) -> Optional[requests.Response]:
+        """Monta a resposta a partir da entrada (None se o corpo sumiu)."""
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            self.discard(url)
+            return None
+        
+        with self._lock:
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (self.clock(), url))
+            self._conn.commit()
+        return _cached_response(url, entry['status'], entry['headers'], body)
+    
+    def store(self, url: str, response: requests.Response):
+        """Guarda uma resposta 200 (a menos que o servidor proíba com no-store)."""
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        
+        body = response.content
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in DROPPED_HEADERS}
+        path = self._body_path(url)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(body)
+        os.replace(temporary, path)
+        
+        now = self.clock()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (url, status, headers, etag, last_modified, expires_at,"
+                " last_access, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(headers), response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), now + self.ttl_for(url), now, len(body))
+            )
+            self._conn.commit()
+            self._total += len(body) - (previous[0] if previous else 0)
+            self.counters['stores'] += 1
+            self._evict()
+    
+    def refresh(self, url: str, response: requests.Response):
+        """Renova a validade após um 304, atualizando os validadores enviados."""
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET expires_at = ?, last_access = ?, etag = COALESCE(?, etag),"
+                " last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now + self.ttl_for(url), now, response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), url)
+            )
+            self._conn.commit()
+    
+    def discard(self, url: str):
+        """Remove uma entrada e o seu corpo."""
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._conn.commit()
+            self._total -= row[0]
+        try:
+            os.remove(self._body_path(url))
+        except FileNotFoundError:
+            pass
+    
+    def count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.counters[counter] += amount
+    
+    def stats(self) -> Dict:
+        """
+        Retorna os contadores do cache.
+        
+        Returns:
+            Dict com hits (respostas servidas sem ir à rede), revalidated
+            (304), misses, stores, evictions, bytes_saved, entries, bytes e
+            hit_rate (hits + revalidated sobre o total de consultas)
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            stats['bytes'] = self._total
+        
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats
+    
+    def close(self):
+        self._conn.close()
+    
+    def _evict(self):
+        """Remove as entradas menos usadas recentemente até caber em max_bytes."""
+        while self._total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT url, size FROM entries ORDER BY last_access LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            for url, size in rows:
+                if self._total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._total -= size
+                self.counters['evictions'] += 1
+                try:
+                    os.remove(self._body_path(url))
+                except FileNotFoundError:
+                    pass
+            self._conn.commit()
+    
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.bodies_dir, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+class CachedSession(requests.Session):
+    """
+    requests.Session que responde GETs a partir de um HTTPCache.
+    
+    Entradas dentro do TTL são servidas direto do disco (hit). Entradas
+    vencidas com ETag ou Last-Modified são revalidadas com um GET
+    condicional; um 304 conta como acerto (revalidated) e devolve o corpo
+    guardado. As respostas servidas do cache têm from_cache = True.
+    """
+    
+    def __init__(self, cache: HTTPCache):
+        super().__init__()
+        self.cache = cache
+    
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET' or kwargs.get('stream') or kwargs.get('params'):
+            return super().request(method, url, *args, **kwargs)
+        
+        entry = self.cache.lookup(url)
+        if entry is not None and entry['fresh']:
+            response = self.cache.load(url, entry)
+            if response is not None:
+                self.cache.count('hits')
+                self.cache.count('bytes_saved', entry['size'])
+                return response
+            entry = None
+        
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        
+        response = super().request(method, url, *args, headers=headers, **kwargs)
+        
+        if response.status_code == 304 and entry is not None:
+            cached = self.cache.load(url, entry)
+            if cached is not None:
+                self.cache.refresh(url, response)
+                self.cache.count('revalidated')
+                self.cache.count('bytes_saved', entry['size'])
+                return cached
+        
+        self.cache.count('misses')
+        self.cache.store(url, response)
+        return response
+
+def _cached_response(url: str, status: int, headers: Dict, body: bytes) -> requests.Response:
+    """Cria um requests.Response com o conteúdo guardado."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.url = url
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+if __name__ == "__main__":
+    # Exemplo de uso: a segunda busca sai do cache (ou de um 304)
+    cache = HTTPCache("http_cache", ttls={r"/turmas/": 3600, r"/materiais/": 86400})
+    session = CachedSession(cache)
+    
+    for _ in range(2):
+        response = session.get("https://sigaa.ufpb.br/sigaa/public/turmas/listar.jsf")
+        print(response.status_code, getattr(response, 'from_cache', False))
+    print(cache.stats())
@@ -0,0 +1,274 @@
+import importlib.util
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Colunas da tabela de turmas abertas do SIGAA, na ordem da página
+TIMETABLE_COLUMNS = ('code', 'name', 'professor', 'schedule', 'room', 'vacancies')
+TIMETABLE_ID = 'turmasAbertas'
+
+# Classe dos itens de atividade/recurso numa página de disciplina do Moodle
+MATERIAL_CLASS = 'activity'
+# O SoupStrainer vê o atributo class ainda como texto ("activity resource ...")
+MATERIAL_STRAINER = SoupStrainer('li', class_=re.compile(rf'(^|\s){MATERIAL_CLASS}(\s|$)'))
+
+# Do mais rápido para o mais lento; os indisponíveis são pulados
+BACKENDS = ('lxml', 'stream', 'html.parser')
+
+def available_backends() -> List[str]:
+    """Backends utilizáveis neste ambiente, na ordem de preferência."""
+    return [backend for backend in BACKENDS
+            if backend != 'lxml' or importlib.util.find_spec('lxml') is not None]
+
+class PageParser:
+    """
+    Extratores das páginas coletadas pelo CourseScraper.
+    
+    Backends:
+        lxml: parser em C do lxml e XPath direto no fragmento (sem
+            BeautifulSoup); só se o lxml estiver instalado
+        stream: HTMLParser da biblioteca padrão que ignora tudo fora do
+            fragmento e não monta árvore nenhuma
+        html.parser: BeautifulSoup com SoupStrainer, que só monta a árvore
+            do fragmento
+    
+    Sem backend, usa o mais rápido disponível; um backend conhecido mas não
+    instalado cai para o próximo da lista.
+    """
+    
+    def __init__(self, backend: Optional[str] = None):
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Backend desconhecido: {backend!r} (opções: {', '.join(BACKENDS)})")
+        
+        available = available_backends()
+        if backend in available:
+            self.backend = backend
+        else:
+            candidates = BACKENDS[BACKENDS.index(backend):] if backend else BACKENDS
+            self.backend = next(name for name in candidates if name in available)
+    
+    def timetable(self, html: str) -> List[Dict]:
+        """
+        Extrai as turmas da tabela de turmas abertas do SIGAA.
+        
+        Args:
+            html: Página de listagem de turmas
+        
+        Returns:
+            Lista de Dicts com code, name, professor, schedule, room e vacancies
+        """
+        if self.backend == 'lxml':
+            rows = _lxml_timetable(html)
+        elif self.backend == 'stream':
+            rows = _feed(_TimetableStream(), html)
+        else:
+            soup = BeautifulSoup(html, self.backend, parse_only=SoupStrainer('table', id=TIMETABLE_ID))
+            table = soup.find('table', id=TIMETABLE_ID)
+            rows = []
+            if table is not None:
+                for tr in table.find_all('tr'):
+                    cells = [" ".join(td.get_text(" ").split()) for td in tr.find_all('td')]
+                    if cells:
+                        rows.append(cells)
+        return [_timetable_row(cells) for cells in rows if len(cells) >= len(TIMETABLE_COLUMNS)]
+    
+    def materials(self, html: str) -> List[Dict]:
+        """
+        Extrai os materiais de uma página de disciplina do Moodle.
+        
+        Args:
+            html: Página da disciplina
+        
+        Returns:
+            Lista de Dicts com title, type e url
+        """
+        if self.backend == 'lxml':
+            return _lxml_materials(html)
+        if self.backend == 'stream':
+            return _feed(_MaterialsStream(), html)
+        
+        soup = BeautifulSoup(html, self.backend, parse_only=MATERIAL_STRAINER)
+        materials = []
+        for item in soup.find_all('li', class_=MATERIAL_CLASS):
+            link = item.find('a', href=True)
+            name = item.find('span', class_='instancename')
+            if link is None or name is None:
+                continue
+            hidden = name.find('span', class_='accesshide')
+            kind = hidden.extract().get_text(strip=True) if hidden is not None else ""
+            materials.append({'title': " ".join(name.get_text(" ").split()), 'type': kind, 'url': link['href']})
+        return materials
+    
+    def extractor(self, page: str) -> Callable:
+        """
+        Função response -> dados, para usar como parse em CourseScraper.crawl.
+        
+        Args:
+            page: 'timetable' ou 'materials'
+        """
+        extract = getattr(self, page)
+        return lambda response: extract(response.text)
+
+class _TimetableStream(HTMLParser):
+    """Células de cada linha da tabela de turmas, sem montar árvore."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.result: List[List[str]] = []
+        self._depth = 0
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+    
+    def handle_starttag(self, tag, attrs):
+        if self._depth == 0:
+            if tag == 'table' and dict(attrs).get('id') == TIMETABLE_ID:
+                self._depth = 1
+            return
+        
+        if tag == 'table':
+            self._depth += 1
+        elif tag == 'tr':
+            # </tr> e </td> são opcionais em HTML
+            self._end_row()
+            self._row = []
+        elif tag == 'td' and self._row is not None:
+            self._end_cell()
+            self._cell = []
+        elif tag == 'br' and self._cell is not None:
+            self._cell.append(" ")
+    
+    def handle_endtag(self, tag):
+        if self._depth == 0:
+            return
+        
+        if tag == 'td':
+            self._end_cell()
+        elif tag in ('tr', 'thead', 'tbody', 'tfoot', 'table'):
+            self._end_row()
+            if tag == 'table':
+                self._depth -= 1
+    
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+    
+    def _end_cell(self):
+        if self._cell is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._cell = None
+    
+    def _end_row(self):
+        self._end_cell()
+        if self._row:
+            self.result.append(self._row)
+        self._row = None
+
+class _MaterialsStream(HTMLParser):
+    """Título, tipo e link de cada atividade do Moodle, sem montar árvore."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.result: List[Dict] = []
+        self._item: Optional[Dict] = None
+        self._li_depth = 0
+        self._spans: List[str] = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'li':
+            if self._item is not None:
+                self._li_depth += 1
+            elif MATERIAL_CLASS in (dict(attrs).get('class') or "").split():
+                self._item = {'title': [], 'type': [], 'url': None}
+                self._li_depth = 1
+            return
+        
+        if self._item is None:
+            return
+        if tag == 'a' and self._item['url'] is None:
+            self._item['url'] = dict(attrs).get('href')
+        elif tag == 'span':
+            classes = (dict(attrs).get('class') or "").split()
+            if 'accesshide' in classes:
+                self._spans.append('type')
+            elif 'instancename' in classes:
+                self._spans.append('title')
+            else:
+                self._spans.append(self._spans[-1] if self._spans else None)
+    
+    def handle_endtag(self, tag):
+        if self._item is None:
+            return
+        
+        if tag == 'span' and self._spans:
+            self._spans.pop()
+        elif tag == 'li':
+            self._li_depth -= 1
+            if self._li_depth == 0:
+                item, self._item, self._spans = self._item, None, []
+                title = " ".join("".join(item['title']).split())
+                if item['url'] and title:
+                    self.result.append({'title': title, 'type': "".join(item['type']).strip(),
+                                        'url': item['url']})
+    
+    def handle_data(self, data):
+        if self._item is not None and self._spans and self._spans[-1] is not None:
+            self._item[self._spans[-1]].append(data)
+
+def _feed(parser, html: str):
+    parser.feed(html)
+    parser.close()
+    return parser.result
+
+def _timetable_row(cells: List[str]) -> Dict:
+    return dict(zip(TIMETABLE_COLUMNS, cells))
+
+def _lxml_timetable(html: str) -> List[List[str]]:
+    from lxml import html as lxml_html
+    
+    if not html.strip():
+        return []
+    tables = lxml_html.fromstring(html).xpath(f"//table[@id='{TIMETABLE_ID}']")
+    if not tables:
+        return []
+    for br in tables[0].iter('br'):
+        br.tail = " " + (br.tail or "")
+    rows = []
+    for tr in tables[0].iter('tr'):
+        cells = [" ".join(td.text_content().split()) for td in tr.findall('td')]
+        if cells:
+            rows.append(cells)
+    return rows
+
+def _lxml_materials(html: str) -> List[Dict]:
+    from lxml import html as lxml_html
+    
+    if not html.strip():
+        return []
+    items = lxml_html.fromstring(html).xpath(
+        f"//li[contains(concat(' ', normalize-space(@class), ' '), ' {MATERIAL_CLASS} ')]"
+    )
+    materials = []
+    for item in items:
+        links = item.xpath(".//a[@href]")
+        names = item.xpath(".//span[contains(concat(' ', normalize-space(@class), ' '), ' instancename ')]")
+        if not links or not names:
+            continue
+        kind = ""
+        for hidden in names[0].xpath(".//span[contains(concat(' ', normalize-space(@class), ' '), ' accesshide ')]"):
+            kind = hidden.text_content().strip()
+            hidden.drop_tree()
+        materials.append({'title': " ".join(names[0].text_content().split()), 'type': kind,
+                          'url': links[0].get('href')})
+    return materials
+
+if __name__ == "__main__":
+    # Exemplo de uso: extrai as turmas de uma página salva
+    import sys
+    
+    parser = PageParser()
+    print(f"Backend: {parser.backend} (disponíveis: {', '.join(available_backends())})")
+    with open(sys.argv[1], encoding='utf-8') as f:
+        for row in parser.timetable(f.read()):
+            print(row)
@@ -0,0 +1,290 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Segmentos fechados: 000001.jsonl; o segmento ativo fica como 000002.jsonl.open
+SEGMENT_PATTERN = re.compile(r"^(\d{6})\.jsonl(\.open)?$")
+
+# Campo reservado que marca as linhas gravadas pelo SegmentStore, para não
+# confundi-las com registros comuns que também tenham key e data
+RECORD_MARKER = "__segment_record__"
+
+class SegmentStore:
+    """
+    Armazenamento append-only dos dados coletados em segmentos JSON Lines.
+    
+    Cada registro ({"__segment_record__": 1, "key", "saved_at", "data"}) é
+    uma linha. append só acumula em memória; o buffer é gravado no segmento
+    ativo quando passa de flush_bytes, a cada flush_interval segundos (em
+    segundo plano) e em close(). Quando o segmento ativo passa de segment_bytes ele é fechado:
+    o índice do segmento (chave -> posição) é gravado ao lado e o arquivo
+    é renomeado com os.replace, de .jsonl.open para .jsonl. Um segmento
+    .open deixado por um processo interrompido é recuperado na abertura,
+    descartando a última linha se ela ficou incompleta.
+    
+    get(key) devolve o registro mais recente da chave; export recria o
+    layout antigo, um arquivo JSON por entidade.
+    """
+    
+    def __init__(self, root: str = os.path.join("scraped_data", "segments"), segment_bytes: int = 64 * 1024 * 1024,
+                 flush_bytes: int = 1024 * 1024, flush_interval: Optional[float] = 5.0):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.RLock()
+        self._buffer: List[Tuple[str, bytes]] = []
+        self._buffered = 0
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._segment_index: Dict[str, List[int]] = {}
+        self._file = None
+        self._size = 0
+        self._segment = self._recover() + 1
+        
+        self._stop = threading.Event()
+        self._thread = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(target=self._flush_loop, name="segment-store-flush", daemon=True)
+            self._thread.start()
+    
+    def append(self, key: str, data: Any):
+        """
+        Acrescenta um registro (a versão mais recente da chave passa a ser esta).
+        
+        Args:
+            key: Chave da entidade (ex: "materials_MAT001")
+            data: Dados serializáveis em JSON
+        """
+        record = {RECORD_MARKER: 1, 'key': key, 'saved_at': datetime.now().isoformat(), 'data': data}
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n"
+        with self._lock:
+            self._buffer.append((key, line))
+            self._buffered += len(line)
+            if self._buffered >= self.flush_bytes:
+                self.flush()
+    
+    def flush(self) -> int:
+        """
+        Grava o buffer no segmento ativo, com uma única escrita.
+        
+        Returns:
+            Número de registros gravados
+        """
+        with self._lock:
+            if not self._buffer:
+                return 0
+            
+            if self._file is None:
+                self._file = open(self._path(self._segment, active=True), 'ab')
+                self._size = self._file.tell()
+            self._file.write(b"".join(line for _, line in self._buffer))
+            self._file.flush()
+            
+            offset = self._size
+            for key, line in self._buffer:
+                self._index[key] = (self._segment, offset, len(line))
+                self._segment_index[key] = [offset, len(line)]
+                offset += len(line)
+            
+            written = len(self._buffer)
+            self._size = offset
+            self._buffer = []
+            self._buffered = 0
+            self.flushes += 1
+            
+            if self._size >= self.segment_bytes:
+                self.rotate()
+            return written
+    
+    def rotate(self):
+        """Fecha o segmento ativo (índice gravado e renomeação atômica) e inicia outro."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+            self._finalize(self._segment, self._segment_index)
+            self._segment += 1
+            self._segment_index = {}
+            self._size = 0
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dados mais recentes da chave."""
+        with self._lock:
+            for buffered_key, line in reversed(self._buffer):
+                if buffered_key == key:
+                    return json.loads(line)['data']
+            location = self._index.get(key)
+            if location is None:
+                return default
+            segment, offset, length = location
+            # Lido dentro do lock: o segmento ativo pode ser renomeado por rotate()
+            with open(self._path(segment, active=segment == self._segment), 'rb') as f:
+                f.seek(offset)
+                return json.loads(f.read(length))['data']
+    
+    def keys(self) -> List[str]:
+        """Chaves com pelo menos um registro (gravado ou no buffer)."""
+        with self._lock:
+            return sorted(set(self._index) | {key for key, _ in self._buffer})
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index or any(buffered_key == key for buffered_key, _ in self._buffer)
+    
+    def __len__(self) -> int:
+        return len(self.keys())
+    
+    def records(self) -> Iterator[Dict]:
+        """Todos os registros gravados, em ordem (inclui versões antigas)."""
+        self.flush()
+        for segment, active in self._segments():
+            with open(self._path(segment, active), 'rb') as f:
+                for line in f:
+                    yield json.loads(line)
+    
+    def segments(self) -> List[str]:
+        """Caminhos dos segmentos fechados."""
+        return [self._path(segment, active) for segment, active in self._segments() if not active]
+    
+    def export(self, directory: str = "scraped_data") -> int:
+        """
+        Recria o layout de um arquivo por entidade (<chave>.json, indentado).
+        
+        Args:
+            directory: Diretório de destino
+        
+        Returns:
+            Número de arquivos escritos
+        """
+        os.makedirs(directory, exist_ok=True)
+        exported = 0
+        for key in self.keys():
+            with open(os.path.join(directory, f"{key}.json"), 'w', encoding='utf-8') as f:
+                json.dump(self.get(key), f, indent=2, ensure_ascii=False)
+            exported += 1
+        return exported
+    
+    def stats(self) -> Dict:
+        """
+        Retorna os contadores do armazenamento.
+        
+        Returns:
+            Dict com keys, buffered (registros ainda em memória), flushes,
+            segments (fechados) e active_bytes
+        """
+        with self._lock:
+            return {
+                'keys': len(self.keys()),
+                'buffered': len(self._buffer),
+                'flushes': self.flushes,
+                'segments': len(self.segments()),
+                'active_bytes': self._size
+            }
+    
+    def close(self):
+        """Para a gravação periódica, grava o buffer e fecha o segmento ativo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self.rotate()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _recover(self) -> int:
+        """
+        Carrega os índices dos segmentos e fecha os que ficaram abertos.
+        
+        Returns:
+            Número do último segmento existente (0 se nenhum)
+        """
+        last = 0
+        for segment, active in self._segments():
+            if active:
+                entries = self._scan(segment, truncate=True)
+                self._finalize(segment, entries)
+            else:
+                try:
+                    with open(self._index_path(segment), encoding='utf-8') as f:
+                        entries = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    entries = self._scan(segment)
+            for key, (offset, length) in entries.items():
+                self._index[key] = (segment, offset, length)
+            last = segment
+        return last
+    
+    def _scan(self, segment: int, truncate: bool = False) -> Dict[str, List[int]]:
+        """Reconstrói o índice de um segmento lendo as linhas."""
+        path = self._path(segment, active=truncate)
+        entries = {}
+        offset = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    key = json.loads(line)['key'] if line.endswith(b"\n") else None
+                except ValueError:
+                    key = None
+                if key is None:
+                    break
+                entries[key] = [offset, len(line)]
+                offset += len(line)
+        
+        if truncate:
+            # Descarta uma escrita interrompida no meio
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+        return entries
+    
+    def _finalize(self, segment: int, entries: Dict[str, List[int]]):
+        index_path = self._index_path(segment)
+        with open(index_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(index_path + ".tmp", index_path)
+        os.replace(self._path(segment, active=True), self._path(segment, active=False))
+    
+    def _segments(self) -> List[Tuple[int, bool]]:
+        """(número, ativo) de cada segmento em disco, em ordem."""
+        found = []
+        for name in os.listdir(self.root):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                found.append((int(match.group(1)), match.group(2) is not None))
+        return sorted(found)
+    
+    def _path(self, segment: int, active: bool) -> str:
+        return os.path.join(self.root, f"{segment:06d}.jsonl" + (".open" if active else ""))
+    
+    def _index_path(self, segment: int) -> str:
+        return os.path.join(self.root, f"{segment:06d}.idx.json")
+    
+    def _flush_loop(self):
+        """Grava periodicamente até close()."""
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Erro ao gravar segmento: {e}")
+
+def is_segment_record(record: Any) -> bool:
+    """Se uma linha lida de um segmento foi gravada por SegmentStore.append."""
+    return isinstance(record, dict) and record.get(RECORD_MARKER) == 1
+
+if __name__ == "__main__":
+    # Exemplo de uso: milhares de vagas num punhado de segmentos
+    with SegmentStore(os.path.join("scraped_data", "segments"), segment_bytes=1024 * 1024) as store:
+        for number in range(10_000):
+            store.append(f"vacancy_MAT{number:05d}", {"course_code": f"MAT{number:05d}", "available_vacancies": 2})
+        print(store.get("vacancy_MAT00042"))
+        print(store.stats())
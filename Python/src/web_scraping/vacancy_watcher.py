@@ -0,0 +1,230 @@
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+if __package__ in (None, ""):
+    # Execução direta (python src/web_scraping/vacancy_watcher.py): coloca src no path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraping.crawler import TokenBucket
+
+# Campos comparados entre duas leituras (last_updated muda sempre)
+VACANCY_FIELDS = ('total_vacancies', 'occupied_vacancies', 'available_vacancies', 'waiting_list')
+
+class VacancyWatcher:
+    """
+    Acompanha as vagas de muitas turmas emitindo só as mudanças.
+    
+    Guarda em memória a última leitura de cada turma, avisa os assinantes
+    apenas quando algo muda (vagas abertas ou fechadas, lista de espera) e
+    só então chama save. O intervalo de cada turma se adapta: volta a
+    min_interval quando ela muda, fica em no máximo hot_interval enquanto
+    estiver quase lotada (até hot_seats vagas) e dobra, até max_interval,
+    enquanto estiver parada. Todas as consultas passam por um token bucket
+    global de budget requisições por segundo.
+    """
+    
+    def __init__(self, fetch: Callable[[str], Dict], save: Optional[Callable[[str, Dict], None]] = None,
+                 budget: float = 10.0, min_interval: float = 5.0, max_interval: float = 300.0,
+                 hot_interval: Optional[float] = None, hot_seats: int = 5,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.fetch = fetch
+        self.save = save
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hot_interval = hot_interval if hot_interval is not None else min_interval * 2
+        self.hot_seats = hot_seats
+        self.clock = clock
+        self.bucket = TokenBucket(budget, clock=clock, sleep=sleep)
+        
+        self.subscribers: List[Callable[[Dict], None]] = []
+        self._state: Dict[str, Dict] = {}
+        self._intervals: Dict[str, float] = {}
+        # Heap de [quando, ordem, turma, ativa]; _next aponta a entrada atual de cada turma
+        self._next: Dict[str, list] = {}
+        self._queue: List[list] = []
+        self._inactive = 0
+        self._counter = itertools.count()
+        self._counters = {'polls': 0, 'changes': 0, 'writes': 0, 'errors': 0}
+    
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """
+        Registra uma função chamada a cada mudança.
+        
+        Args:
+            callback: Recebe um Dict com course_code, at, seats_opened,
+                seats_closed, waiting_list_change, changes ({campo: (antes,
+                depois)}) e current (a leitura completa)
+        """
+        self.subscribers.append(callback)
+    
+    def watch(self, codes: Iterable[str]):
+        """Passa a acompanhar as turmas (a primeira leitura é imediata)."""
+        now = self.clock()
+        for code in codes:
+            if code not in self._intervals:
+                self._intervals[code] = self.min_interval
+                self._schedule(code, now)
+    
+    def unwatch(self, code: str):
+        """Deixa de acompanhar uma turma."""
+        self._intervals.pop(code, None)
+        self._discard(code)
+        self._state.pop(code, None)
+    
+    def poll(self, code: str) -> Optional[Dict]:
+        """
+        Consulta uma turma agora e reagenda a próxima consulta.
+        
+        Returns:
+            A mudança emitida, ou None se nada mudou (ou na primeira leitura)
+        """
+        now = self.clock()
+        self._counters['polls'] += 1
+        try:
+            snapshot = self.fetch(code)
+        except Exception:
+            self._counters['errors'] += 1
+            self._intervals[code] = min(self.max_interval, self._intervals.get(code, self.min_interval) * 2)
+            self._schedule(code, now + self._intervals[code])
+            return None
+        
+        current = {field: snapshot.get(field) for field in VACANCY_FIELDS}
+        previous = self._state.get(code)
+        changed = previous is not None and current != previous
+        
+        if previous is None or changed:
+            self._state[code] = current
+            if self.save is not None:
+                self.save(code, snapshot)
+                self._counters['writes'] += 1
+        
+        self._intervals[code] = self._next_interval(code, current, changed)
+        self._schedule(code, now + self._intervals[code])
+        
+        if not changed:
+            return None
+        
+        self._counters['changes'] += 1
+        delta = _delta(code, previous, current, now)
+        delta['current'] = snapshot
+        for callback in self.subscribers:
+            callback(delta)
+        return delta
+    
+    def run_pending(self) -> int:
+        """
+        Consulta as turmas vencidas, as mais atrasadas primeiro.
+        
+        Returns:
+            Número de turmas consultadas
+        """
+        polled = 0
+        # Só o que já venceu agora: turmas reagendadas durante a rodada ficam para a próxima
+        cutoff = self.clock()
+        self._drop_stale_top()
+        while self._queue and self._queue[0][0] <= cutoff:
+            code = heapq.heappop(self._queue)[2]
+            del self._next[code]
+            self.bucket.acquire()
+            self.poll(code)
+            polled += 1
+            self._drop_stale_top()
+        return polled
+    
+    def run_forever(self, stop: threading.Event):
+        """Consulta as turmas até stop ser sinalizado."""
+        while not stop.is_set():
+            self.run_pending()
+            next_due = self.next_poll()
+            delay = self.min_interval if next_due is None else max(0.0, next_due - self.clock())
+            stop.wait(delay)
+    
+    def next_poll(self) -> Optional[float]:
+        """Momento da próxima consulta agendada (None se não há turmas)."""
+        self._drop_stale_top()
+        return self._queue[0][0] if self._queue else None
+    
+    def state(self, code: str) -> Optional[Dict]:
+        """Última leitura conhecida de uma turma."""
+        return self._state.get(code)
+    
+    def stats(self) -> Dict:
+        """
+        Retorna os contadores do monitoramento.
+        
+        Returns:
+            Dict com polls, changes, writes, errors, watched e hot (turmas
+            quase lotadas no momento)
+        """
+        stats = dict(self._counters)
+        stats['watched'] = len(self._intervals)
+        stats['hot'] = sum(1 for current in self._state.values() if self._is_hot(current))
+        return stats
+    
+    def _next_interval(self, code: str, current: Dict, changed: bool) -> float:
+        """Intervalo até a próxima consulta da turma."""
+        if changed:
+            return self.min_interval
+        interval = min(self.max_interval, self._intervals.get(code, self.min_interval) * 2)
+        if self._is_hot(current):
+            interval = min(interval, self.hot_interval)
+        return interval
+    
+    def _is_hot(self, current: Dict) -> bool:
+        available = current.get('available_vacancies')
+        return available is not None and available <= self.hot_seats
+    
+    def _schedule(self, code: str, when: float):
+        self._discard(code)
+        entry = [when, next(self._counter), code, True]
+        self._next[code] = entry
+        heapq.heappush(self._queue, entry)
+        # Entradas inativas (reagendadas ou removidas) passaram da metade: compacta
+        if self._inactive > 1024 and self._inactive > len(self._queue) // 2:
+            self._queue = [entry for entry in self._queue if entry[3]]
+            heapq.heapify(self._queue)
+            self._inactive = 0
+    
+    def _discard(self, code: str):
+        """Marca a entrada atual da turma como inativa (remoção preguiçosa)."""
+        entry = self._next.pop(code, None)
+        if entry is not None:
+            entry[3] = False
+            self._inactive += 1
+    
+    def _drop_stale_top(self):
+        """Descarta do topo do heap as entradas que não valem mais (remoção preguiçosa)."""
+        while self._queue and not self._queue[0][3]:
+            heapq.heappop(self._queue)
+            self._inactive -= 1
+
+def _delta(code: str, previous: Dict, current: Dict, now: float) -> Dict:
+    """Diferença entre duas leituras de uma turma."""
+    opened = (current.get('available_vacancies') or 0) - (previous.get('available_vacancies') or 0)
+    return {
+        'course_code': code,
+        'at': now,
+        'seats_opened': max(0, opened),
+        'seats_closed': max(0, -opened),
+        'waiting_list_change': (current.get('waiting_list') or 0) - (previous.get('waiting_list') or 0),
+        'changes': {field: (previous.get(field), current[field])
+                    for field in VACANCY_FIELDS if previous.get(field) != current[field]}
+    }
+
+if __name__ == "__main__":
+    # Exemplo de uso: avisa quando abrir vaga em alguma turma
+    from web_scraping.course_scraper import CourseScraper
+    
+    scraper = CourseScraper()
+    watcher = scraper.watch_vacancies([f"MAT{number:03d}" for number in range(1, 21)], budget=5)
+    watcher.subscribe(lambda delta: print(f"{delta['course_code']}: +{delta['seats_opened']} vagas"))
+    
+    stop = threading.Event()
+    threading.Timer(30, stop.set).start()
+    watcher.run_forever(stop)
+    print(watcher.stats())
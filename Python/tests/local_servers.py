@@ -0,0 +1,221 @@
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """
+    Servidor SMTP mínimo para testes (sem TLS nem autenticação).
+    
+    Guarda as mensagens recebidas e conta as conexões abertas. fail_data
+    faz as primeiras N mensagens receberem "451" (falha transitória) e
+    reject_data faz todas receberem "554" (falha permanente).
+    """
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, fail_data: int = 0, reject_data: bool = False):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.fail_data = fail_data
+        self.reject_data = reject_data
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+    
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply("220 localhost SMTP stand-in")
+        
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            
+            if command.startswith("EHLO"):
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif command.startswith(("HELO", "MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data)
+                self.reply(self.accept(b"".join(lines)))
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+    
+    def accept(self, message: bytes) -> str:
+        with self.server.lock:
+            if self.server.reject_data:
+                return "554 Message rejected"
+            if self.server.fail_data > 0:
+                self.server.fail_data -= 1
+                return "451 Try again later"
+            self.server.messages.append(message)
+        return "250 Queued"
+
+class HTTPStandIn(ThreadingHTTPServer):
+    """
+    Servidor HTTP local para testes dos scrapers.
+    
+    routes mapeia caminhos (sem a query string) para bytes (resposta 200) ou
+    para funções handler -> (status, headers, corpo). Conta as requisições
+    por caminho e o máximo de requisições simultâneas; delay atrasa todas
+    as respostas.
+    """
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, routes=None, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), HTTPHandler)
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.hits = {}
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+    
+    def url(self, path: str) -> str:
+        return self.base_url + path
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+class HTTPHandler(BaseHTTPRequestHandler):
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+    
+    def do_GET(self, send_body: bool = True):
+        server = self.server
+        path = self.path.split("?", 1)[0]
+        with server.lock:
+            server.hits[path] = server.hits.get(path, 0) + 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        
+        try:
+            if server.delay:
+                time.sleep(server.delay)
+            
+            route = server.routes.get(path)
+            if route is None:
+                status, headers, body = 404, {}, b"not found"
+            elif callable(route):
+                status, headers, body = route(self)
+            else:
+                status, headers, body = 200, {}, route
+            
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if 'Content-Length' not in headers:
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body and body:
+                self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+def flaky(body: bytes, failures: int, status: int = 503, headers=None):
+    """Rota que responde status nas primeiras failures requisições e 200 depois."""
+    state = {'remaining': failures}
+    
+    def route(handler):
+        with handler.server.lock:
+            failing = state['remaining'] > 0
+            state['remaining'] -= 1
+        if failing:
+            return status, dict(headers or {}), b"try again"
+        return 200, {}, body
+    return route
+
+class Resource:
+    """
+    Rota com validadores: envia ETag e Last-Modified e responde 304 a
+    If-None-Match / If-Modified-Since da versão atual. update troca o corpo.
+    
+    Atende Range (206) quando If-Range bate com a versão atual, registrando
+    os inícios pedidos em ranges. cut corta a próxima resposta nesse byte,
+    anunciando o tamanho completo, como uma conexão que caiu no meio.
+    """
+    
+    def __init__(self, body: bytes, headers=None):
+        self.headers = dict(headers or {})
+        self.conditional = 0
+        self.ranges = []
+        self.cut = None
+        self.update(body)
+    
+    def update(self, body: bytes):
+        self.body = body
+        self.version = getattr(self, 'version', 0) + 1
+        self.etag = f'"v{self.version}"'
+        self.last_modified = f"Mon, 0{self.version % 10} Jan 2024 00:00:00 GMT"
+    
+    def __call__(self, handler):
+        headers = dict(self.headers, ETag=self.etag)
+        headers['Last-Modified'] = self.last_modified
+        if 'If-None-Match' in handler.headers or 'If-Modified-Since' in handler.headers:
+            self.conditional += 1
+            if (handler.headers.get('If-None-Match') == self.etag
+                    or handler.headers.get('If-Modified-Since') == self.last_modified):
+                return 304, headers, b""
+        
+        headers['Accept-Ranges'] = 'bytes'
+        status, body = 200, self.body
+        match = re.match(r"bytes=(\d+)-$", handler.headers.get('Range', ""))
+        if match and handler.headers.get('If-Range') in (None, self.etag, self.last_modified):
+            start = int(match.group(1))
+            self.ranges.append(start)
+            status, body = 206, self.body[start:]
+            headers['Content-Range'] = f"bytes {start}-{len(self.body) - 1}/{len(self.body)}"
+        
+        if self.cut is not None:
+            headers['Content-Length'] = str(len(body))
+            body, self.cut = body[:self.cut], None
+        return status, headers, body
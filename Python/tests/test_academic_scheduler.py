@@ -0,0 +1,387 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import heapq
+import threading
+import time
+
+from automation.academic_scheduler import AcademicScheduler, TaskReminder
+from automation.reminder_engine import FakeClock, ReminderEngine
+from automation.task_index import DueDateIndex
+from automation.task_stats import TaskCounters
+from automation.task_store import JSONTaskStore, SQLiteTaskStore
+
+def make_task(title, days, course="Cálculo I"):
+    return {
+        'title': title,
+        'due_date': (datetime.now() + timedelta(days=days)).isoformat(),
+        'course': course,
+        'type': 'assignment'
+    }
+
+class TestSQLiteTaskStore:
+    
+    def setup_method(self):
+        self.store = SQLiteTaskStore(":memory:")
+    
+    def test_insert_and_query(self):
+        scheduler_tasks = [make_task("A", 5), make_task("B", 1, "Física"), make_task("C", 10)]
+        for task in scheduler_tasks:
+            task['completed'] = False
+        self.store.insert_many(scheduler_tasks)
+        
+        assert [task['id'] for task in scheduler_tasks] == [1, 2, 3]
+        assert [task['title'] for task in self.store.query(course="Cálculo I")] == ["A", "C"]
+        
+        cutoff = (datetime.now() + timedelta(days=6)).isoformat()
+        assert [task['title'] for task in self.store.query(completed=False, due_before=cutoff)] == ["B", "A"]
+    
+    def test_update_and_delete(self):
+        task = self.store.insert(dict(make_task("A", 5), completed=False, extra="campo livre"))
+        
+        updated = self.store.update(task['id'], {'completed': True})
+        assert updated['completed'] is True
+        assert self.store.get(task['id'])['extra'] == "campo livre"
+        assert self.store.query(completed=True)[0]['id'] == task['id']
+        
+        assert self.store.delete(task['id'])
+        assert self.store.get(task['id']) is None
+        assert self.store.update(task['id'], {'completed': False}) is None
+    
+    def test_import_legacy_json(self, tmp_path):
+        legacy = JSONTaskStore(str(tmp_path / "academic_tasks.json"))
+        legacy.replace_all([dict(make_task("A", 1), id=7, completed=False)])
+        
+        assert self.store.import_json(legacy.path) == 1
+        assert self.store.get(7)['title'] == "A"
+        
+        # Novas tarefas continuam a partir do maior id importado
+        assert self.store.insert(dict(make_task("B", 2), completed=False))['id'] == 8
+    
+    def test_import_json_into_non_empty_store(self, tmp_path):
+        self.store.insert(dict(make_task("Existente", 1), completed=False))
+        legacy = JSONTaskStore(str(tmp_path / "academic_tasks.json"))
+        legacy.replace_all([dict(make_task("A", 1), id=1, completed=False),
+                            dict(make_task("B", 2), id=5, completed=False)])
+        
+        assert self.store.import_json(legacy.path) == 2
+        # O id livre é mantido; o que já existia ganha um novo
+        assert self.store.get(1)['title'] == "Existente"
+        assert self.store.get(5)['title'] == "B"
+        assert [task['id'] for task in self.store.all() if task['title'] == "A"] == [2]
+
+class TestDueDateIndex:
+    
+    def setup_method(self):
+        self.now = datetime(2024, 5, 10, 12, 0)
+        self.tasks = [
+            {'id': 1, 'title': 'A', 'due_date': '2024-05-09T12:00:00', 'course': 'X', 'completed': False},
+            {'id': 2, 'title': 'B', 'due_date': '2024-05-12T12:00:00', 'course': 'X', 'completed': False},
+            {'id': 3, 'title': 'C', 'due_date': '2024-05-20T12:00:00', 'course': 'Y', 'completed': False},
+            {'id': 4, 'title': 'D', 'due_date': '2024-05-11T12:00:00', 'course': 'Y', 'completed': True}
+        ]
+        self.index = DueDateIndex(self.tasks)
+    
+    def test_window_query(self):
+        upcoming = self.index.due_between(end=datetime(2024, 5, 13), now=self.now)
+        assert [task['title'] for task in upcoming] == ['A', 'B']
+        assert [task['days_until_due'] for task in upcoming] == [-1, 2]
+        
+        window = self.index.due_between(start=self.now, end=datetime(2024, 5, 30), now=self.now)
+        assert [task['id'] for task in window] == [2, 3]
+    
+    def test_views_are_read_only(self):
+        view = self.index.due_between(now=self.now)[0]
+        with pytest.raises(TypeError):
+            view['completed'] = True
+        assert 'days_until_due' not in self.tasks[0]
+    
+    def test_incremental_updates(self):
+        self.index.add({'id': 5, 'title': 'E', 'due_date': '2024-05-10T00:00:00', 'completed': False})
+        self.index.remove(1)
+        self.index.add(dict(self.tasks[1], due_date='2024-06-01T00:00:00'))
+        
+        assert [task['id'] for task in self.index.due_between(now=self.now)] == [5, 3, 2]
+        assert self.index.count_before(self.now) == 1
+
+class TestTaskCounters:
+    
+    def setup_method(self):
+        self.now = datetime(2024, 3, 4, 12, 0)
+        tasks = [
+            {'id': 1, 'course': 'Cálculo I', 'due_date': '2024-03-01T10:00:00', 'completed': False},
+            {'id': 2, 'course': 'Cálculo I', 'due_date': '2024-03-08T10:00:00', 'completed': False},
+            {'id': 3, 'course': 'Física', 'due_date': '2024-03-02T10:00:00', 'completed': True},
+            {'id': 4, 'course': 'Física', 'due_date': '2024-03-03T10:00:00', 'completed': False}
+        ]
+        self.counters = TaskCounters(tasks)
+    
+    def test_summary(self):
+        summary = self.counters.summary(self.now)
+        
+        assert (summary['total'], summary['completed'], summary['pending'], summary['overdue']) == (4, 1, 3, 2)
+        assert summary['courses']['Física'] == {'total': 2, 'completed': 1, 'pending': 1, 'overdue': 1}
+    
+    def test_incremental_updates(self):
+        self.counters.add({'id': 1, 'course': 'Cálculo I', 'due_date': '2024-03-01T10:00:00', 'completed': True})
+        self.counters.add({'id': 4, 'course': 'Química', 'due_date': '2024-03-10T10:00:00', 'completed': False})
+        assert self.counters.remove(3)
+        assert not self.counters.remove(3)
+        
+        summary = self.counters.summary(self.now)
+        assert (summary['total'], summary['completed'], summary['pending'], summary['overdue']) == (3, 1, 2, 0)
+        assert self.counters.courses() == ['Cálculo I', 'Química']
+        assert self.counters.course('Física', self.now)['total'] == 0
+
+class TestReminderEngine:
+    
+    def setup_method(self):
+        self.clock = FakeClock(1000.0)
+        self.fired = []
+        self.engine = ReminderEngine(callback=lambda rid, payload: self.fired.append(rid),
+                                     clock=self.clock, compact_threshold=2)
+    
+    def test_fires_in_time_order(self):
+        self.engine.schedule_many([("c", 1030, None), ("a", 1010, None)])
+        self.engine.schedule("b", 1020)
+        
+        assert self.engine.next_fire_time() == 1010
+        assert self.engine.run_pending() == 0
+        self.clock.advance(25)
+        assert self.engine.run_pending() == 2
+        assert self.fired == ["a", "b"]
+        assert len(self.engine) == 1
+    
+    def test_cancel_and_reschedule(self):
+        for i in range(10):
+            self.engine.schedule(i, 1000 + i)
+        
+        assert self.engine.cancel(0)
+        assert not self.engine.cancel(0)
+        assert self.engine.reschedule(1, 2000)
+        assert not self.engine.reschedule(99, 2000)
+        for i in range(2, 8):
+            self.engine.cancel(i)
+        
+        # Cancelamentos acima do limite compactam o heap
+        assert len(self.engine._heap) < 10
+        assert [rid for rid, _, _ in self.engine.pending()] == [8, 9, 1]
+        assert self.engine.run_pending(now=1500) == 2
+        assert self.fired == [8, 9]
+    
+    def test_rescheduling_compacts_the_heap(self):
+        for round_number in range(50):
+            self.engine.schedule_many((i, 2000 + round_number, None) for i in range(5))
+            self.engine.schedule(0, 3000 + round_number)
+        
+        # Entradas substituídas também contam para a compactação, não só cancel
+        assert len(self.engine._heap) <= 2 * len(self.engine) + 2
+        assert self.engine.next_fire_time() == 2049
+    
+    def test_async_run_woken_from_other_thread(self):
+        stop = asyncio.Event()
+        
+        def callback(rid, payload):
+            self.fired.append(rid)
+            stop.set()
+        
+        engine = ReminderEngine(callback=callback)
+        
+        async def main():
+            # Agendado de outra thread enquanto o laço dorme sem prazo
+            timer = threading.Timer(0.05, engine.schedule, args=("outra", time.time()))
+            timer.start()
+            start = time.monotonic()
+            await asyncio.wait_for(engine.run(stop), 5)
+            timer.join()
+            return time.monotonic() - start
+        
+        assert asyncio.run(main()) < 2
+        assert self.fired == ["outra"]
+    
+    def test_async_run_sleeps_until_each_reminder(self):
+        self.engine.schedule("a", 1060)
+        self.engine.schedule("b", 4600)
+        
+        asyncio.run(self.engine.run(asyncio.Event()))
+        
+        assert self.fired == ["a", "b"]
+        assert self.clock.now() == 4600
+    
+    def test_small_batches_are_pushed(self, monkeypatch):
+        self.engine.schedule_many((i, 2000 + i, None) for i in range(1000))
+        
+        heapified = []
+        monkeypatch.setattr(heapq, "heapify", lambda heap: heapified.append(len(heap)))
+        self.engine.schedule_many([("novo", 1500, None)])
+        
+        assert heapified == []
+        assert self.engine.next_fire_time() == 1500
+        assert self.engine.pop_due(now=2001)[:2] == [("novo", 1500, None), (0, 2000, None)]
+    
+    def test_callback_errors_do_not_drop_other_reminders(self):
+        def callback(rid, payload):
+            if rid == "b":
+                raise RuntimeError("SMTP fora do ar")
+            self.fired.append(rid)
+        self.engine.callback = callback
+        for rid, offset in (("a", 1), ("b", 2), ("c", 3)):
+            self.engine.schedule(rid, 1000 + offset)
+        
+        assert self.engine.run_pending(now=1010) == 3
+        assert self.fired == ["a", "c"]
+        assert (self.engine.fired, self.engine.failed) == (2, 1)
+        assert self.engine.errors[0][0] == "b"
+    
+    def test_run_forever_waits_when_idle(self):
+        passes = []
+        run_pending = self.engine.run_pending
+        self.engine.run_pending = lambda: passes.append(1) or run_pending()
+        stop = threading.Event()
+        thread = threading.Thread(target=self.engine.run_forever, args=(stop,))
+        thread.start()
+        
+        # Sem lembretes o laço fica parado até um notify, sem girar em falso
+        time.sleep(0.1)
+        assert len(passes) == 1
+        self.engine.schedule("a", 1050)
+        deadline = time.time() + 5
+        while self.fired != ["a"] and time.time() < deadline:
+            time.sleep(0.01)
+        
+        stop.set()
+        self.engine.wake()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert self.fired == ["a"]
+        assert self.clock.now() == 1050
+    
+    def test_task_reminder(self, capsys):
+        reminder = TaskReminder(clock=self.clock)
+        reminder.add_reminder("Prova", datetime.fromtimestamp(1100), "Estudar para a prova")
+        cancelled = reminder.add_reminder("Lista", datetime.fromtimestamp(1050), "Entregar a lista")
+        
+        assert reminder.cancel_reminder(cancelled)
+        assert reminder.check_reminders() == 0
+        self.clock.advance(100)
+        assert reminder.check_reminders() == 1
+        assert reminder.check_reminders() == 0
+        assert reminder.reminders == []
+        assert "Estudar para a prova" in capsys.readouterr().out
+
+class TestAcademicScheduler:
+    
+    @pytest.fixture(autouse=True)
+    def workdir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+    
+    @pytest.mark.parametrize("store_factory", [lambda: None, lambda: SQLiteTaskStore("academic_tasks.db")])
+    def test_add_task_and_upcoming(self, store_factory):
+        scheduler = AcademicScheduler(store=store_factory())
+        
+        scheduler.add_task(make_task("Trabalho", 3))
+        scheduler.add_task(make_task("Prova", 1, "Física"))
+        scheduler.add_task(make_task("Projeto", 30))
+        
+        upcoming = scheduler.get_upcoming_tasks(7)
+        assert [task['title'] for task in upcoming] == ["Prova", "Trabalho"]
+        assert "Total de tarefas: 3" in scheduler.generate_weekly_report()
+    
+    def test_complete_task_updates_index(self):
+        scheduler = AcademicScheduler(store=SQLiteTaskStore(":memory:"))
+        scheduler.add_task(make_task("Trabalho", 3))
+        scheduler.add_task(make_task("Prova", 1))
+        assert len(scheduler.get_upcoming_tasks(7)) == 2
+        
+        assert scheduler.complete_task(2)
+        assert [task['title'] for task in scheduler.get_upcoming_tasks(7)] == ["Trabalho"]
+        assert scheduler.store.get(2)['completed'] is True
+        assert not scheduler.complete_task(99)
+    
+    @pytest.mark.parametrize("store_factory", [lambda: None, lambda: SQLiteTaskStore("academic_tasks.db")])
+    def test_add_tasks_bulk(self, store_factory):
+        scheduler = AcademicScheduler(store=store_factory())
+        scheduler.add_task(make_task("Antiga 1", 2))
+        scheduler.add_task(make_task("Antiga 2", 2))
+        scheduler.store.delete(1)
+        
+        rows = [make_task("A", 1), {'title': 'Sem prazo'}, dict(make_task("B", 2), due_date="amanhã"), make_task("C", 3)]
+        result = scheduler.add_tasks(rows)
+        
+        assert result['inserted'] == 2
+        assert [error['row'] for error in result['errors']] == [1, 2]
+        assert 'due_date' in result['errors'][0]['error']
+        
+        ids = [task['id'] for task in scheduler.store.all()]
+        assert len(ids) == len(set(ids)) == 3
+        assert [task['title'] for task in scheduler.get_upcoming_tasks(7)] == ["A", "Antiga 2", "C"]
+    
+    @pytest.mark.parametrize("store_factory", [lambda: None, lambda: SQLiteTaskStore("academic_tasks.db")])
+    def test_add_tasks_ignores_incoming_ids(self, store_factory):
+        scheduler = AcademicScheduler(store=store_factory())
+        scheduler.add_task(make_task("Antiga", 2))
+        
+        # Ids vindos da exportação repetem entre si e com o banco
+        rows = [dict(make_task("A", 1), id=1), dict(make_task("B", 2), id=7), dict(make_task("C", 3), id=7)]
+        result = scheduler.add_tasks(rows)
+        
+        assert result['inserted'] == 3
+        assert result['errors'] == []
+        assert len(set(result['ids'])) == 3
+        assert scheduler.store.get(1)['title'] == "Antiga"
+        assert sorted(task['title'] for task in scheduler.store.all()) == ["A", "Antiga", "B", "C"]
+    
+    def test_reminders_follow_task_changes(self):
+        clock = FakeClock(datetime.now().timestamp())
+        scheduler = AcademicScheduler(store=SQLiteTaskStore(":memory:"), reminders=ReminderEngine(clock=clock))
+        sent = []
+        scheduler._send_email = lambda subject, body: sent.append(subject)
+        
+        scheduler.add_task(make_task("Trabalho", 3))
+        scheduler.add_tasks([make_task("Prova", 2), make_task("Hoje", 0.01)])
+        # "Hoje" vence em menos de 1 hora: nenhum lembrete no passado
+        assert len(scheduler.reminders) == 4
+        
+        new_due = (datetime.fromtimestamp(clock.now()) + timedelta(days=10)).isoformat()
+        assert scheduler.update_task(1, {'due_date': new_due})
+        assert scheduler.complete_task(2)
+        assert len(scheduler.reminders) == 2
+        
+        clock.advance(timedelta(days=9, hours=1).total_seconds())
+        assert scheduler.check_reminders() == 1
+        assert sent == ["🔔 Lembrete: Trabalho"]
+    
+    def test_weekly_report_counters(self):
+        scheduler = AcademicScheduler(store=SQLiteTaskStore(":memory:"))
+        assert "Taxa de conclusão: 0.0%" in scheduler.generate_weekly_report()
+        
+        scheduler.add_task(make_task("Trabalho", 3))
+        scheduler.add_task(make_task("Atrasada", -2, "Física"))
+        scheduler.complete_task(1)
+        report = scheduler.generate_weekly_report()
+        
+        assert "Tarefas concluídas: 1" in report
+        assert "Tarefas atrasadas: 1" in report
+        assert "Física: 0/1" in report
+        assert scheduler.counters.summary() == TaskCounters(scheduler.store.all()).summary()
+    
+    def test_add_task_missing_fields(self):
+        with pytest.raises(ValueError):
+            AcademicScheduler().add_task({'title': 'Sem prazo'})
+    
+    def test_add_task_invalid_due_date_is_not_stored(self):
+        scheduler = AcademicScheduler(store=SQLiteTaskStore(":memory:"))
+        with pytest.raises(ValueError):
+            scheduler.add_task(dict(make_task("Trabalho", 3), due_date="amanhã"))
+        
+        assert scheduler.store.all() == []
+        assert scheduler.get_upcoming_tasks(7) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
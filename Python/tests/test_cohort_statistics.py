@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_analysis.cohort_statistics import CohortStatistics
+from data_analysis.grade_calculator import GradeCalculator
+
+class TestCohortStatistics:
+    
+    def setup_method(self):
+        self.cohort = CohortStatistics()
+        self.calc = GradeCalculator()
+        self.students = {
+            "João Silva": {"Cálculo I": [85, 90, 78], "Programação": [92, 88, 95]},
+            "Maria Souza": {"Cálculo I": [70, 65], "Física": [80, 82, 91], "Química": [59.5]}
+        }
+    
+    def test_student_statistics_match_per_student(self):
+        grades = self.cohort.to_long_format(self.students)
+        stats = self.cohort.student_statistics(grades)
+        
+        for student, grades_data in self.students.items():
+            expected = self.calc.calculate_semester_statistics(grades_data)
+            for key, value in expected.items():
+                assert stats.loc[student, key] == pytest.approx(value)
+    
+    def test_missing_grades_match_per_student(self):
+        students = {
+            "João Silva": {"Cálculo I": [85, 90], "Programação": []},
+            "Sem Notas": {"Cálculo I": []}
+        }
+        grades = self.cohort.to_long_format(students)
+        stats = self.cohort.student_statistics(grades)
+        
+        # Sem notas: fora do resultado, como o {} de calculate_semester_statistics
+        assert list(stats.index) == ["João Silva"]
+        expected = self.calc.calculate_semester_statistics(students["João Silva"])
+        assert expected['total_subjects'] == 2
+        for key, value in expected.items():
+            assert stats.loc["João Silva", key] == pytest.approx(value)
+        
+        subjects = self.cohort.subject_statistics(grades, by_student=False)
+        assert list(subjects.index) == ["Cálculo I"]
+        assert subjects.loc["Cálculo I", 'total_grades'] == 2
+    
+    def test_subject_statistics_by_student(self):
+        grades = self.cohort.to_long_format(self.students)
+        stats = self.cohort.subject_statistics(grades)
+        
+        row = stats.loc[("Maria Souza", "Física")]
+        assert row['total_grades'] == 3
+        assert row['average_grade'] == pytest.approx(np.mean([80, 82, 91]))
+        assert row['gpa'] == pytest.approx(self.calc.calculate_gpa([80, 82, 91]))
+    
+    def test_subject_statistics_across_cohort(self):
+        grades = self.cohort.to_long_format(self.students)
+        stats = self.cohort.subject_statistics(grades, by_student=False)
+        
+        assert stats.loc["Cálculo I", 'total_grades'] == 5
+        assert stats.loc["Cálculo I", 'median_grade'] == 78
+    
+    def test_missing_columns(self):
+        grades = self.cohort.to_long_format(self.students).drop(columns=['subject'])
+        
+        with pytest.raises(ValueError):
+            self.cohort.student_statistics(grades)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,135 @@
+import pytest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.crawl_frontier import CrawlFrontier, normalize_url
+from local_servers import HTTPStandIn, flaky
+
+class TestCrawlFrontier:
+    
+    def setup_method(self):
+        self.now = 1000.0
+    
+    def make_frontier(self, path, **kwargs):
+        return CrawlFrontier(str(path), clock=lambda: self.now, **kwargs)
+    
+    def test_deduplicates_urls(self, tmp_path):
+        frontier = self.make_frontier(tmp_path / "frontier.db")
+        
+        assert frontier.add(["https://SIGAA.ufpb.br/turmas?codigo=MAT001#topo",
+                             "https://sigaa.ufpb.br:443/turmas?codigo=MAT001",
+                             "https://sigaa.ufpb.br/turmas?codigo=MAT002",
+                             "materials:MAT001"]) == 3
+        assert frontier.add(["https://sigaa.ufpb.br/turmas?codigo=MAT002"]) == 0
+        assert frontier.counts() == {'queued': 3, 'in_flight': 0, 'done': 0, 'failed': 0}
+        assert normalize_url("HTTP://Moodle.ufpb.br:80") == "http://moodle.ufpb.br/"
+    
+    def test_claim_and_finish(self, tmp_path):
+        frontier = self.make_frontier(tmp_path / "frontier.db", max_attempts=2)
+        frontier.add(f"turma:{number}" for number in range(5))
+        
+        claimed = frontier.claim(3)
+        assert claimed == ["turma:0", "turma:1", "turma:2"]
+        assert frontier.counts()['in_flight'] == 3
+        
+        frontier.complete("turma:0", 200)
+        frontier.fail("turma:1", "HTTP 503", 503)
+        frontier.record({'url': "turma:2", 'status': 404, 'error': "404 Not Found"})
+        assert frontier.state("turma:1") == {'state': 'failed', 'attempts': 1, 'status': 503,
+                                             'error': "HTTP 503", 'finished_at': self.now}
+        
+        # Falhas voltam ao fim da fila até max_attempts; o que deu certo não
+        self.now += 1
+        assert frontier.add(f"turma:{number}" for number in range(5)) == 2
+        assert frontier.claim(10) == ["turma:3", "turma:4", "turma:1", "turma:2"]
+        frontier.fail("turma:1", "HTTP 503", 503)
+        assert frontier.add(["turma:1"]) == 0
+    
+    def test_stale_entries_are_revisited(self, tmp_path):
+        frontier = self.make_frontier(tmp_path / "frontier.db", stale_after=3600)
+        frontier.add(["turma:1", "turma:2"])
+        for url in frontier.claim(2):
+            frontier.complete(url)
+        
+        self.now += 1800
+        assert frontier.add(["turma:1"]) == 0
+        assert frontier.requeue_stale() == 0
+        
+        self.now += 1800
+        assert frontier.add(["turma:1"]) == 1
+        assert frontier.requeue_stale() == 1
+        assert frontier.counts()['queued'] == 2
+    
+    def test_attempts_reset_after_success(self, tmp_path):
+        frontier = self.make_frontier(tmp_path / "frontier.db", stale_after=3600)
+        frontier.add(["turma:1"])
+        for _ in range(3):
+            frontier.claim(1)
+            frontier.complete("turma:1", 200)
+            self.now += 3600
+            assert frontier.add(["turma:1"]) == 1
+        
+        assert frontier.claim(1) == ["turma:1"]
+        frontier.fail("turma:1", "HTTP 503", 503)
+        assert frontier.state("turma:1")['attempts'] == 1
+        # A falha isolada volta à fila mesmo depois de vários ciclos bem-sucedidos
+        assert frontier.add(["turma:1"]) == 1
+    
+    def test_interrupted_entries_are_recovered(self, tmp_path):
+        frontier = self.make_frontier(tmp_path / "frontier.db")
+        frontier.add(f"turma:{number}" for number in range(4))
+        frontier.claim(3)
+        frontier.complete("turma:0")
+        frontier.close()
+        
+        reopened = self.make_frontier(tmp_path / "frontier.db")
+        assert reopened.recovered == 2
+        assert reopened.counts() == {'queued': 3, 'in_flight': 0, 'done': 1, 'failed': 0}
+        assert reopened.state("turma:1")['attempts'] == 0
+        assert list(reopened.claimed(batch_size=2)) == ["turma:1", "turma:2", "turma:3"]
+
+class TestCourseScraperResume:
+    
+    def test_restarted_crawl_fetches_only_remaining_work(self, tmp_path):
+        routes = {f"/turma/{number}": f"turma {number}".encode() for number in range(30)}
+        routes["/turma/instavel"] = flaky(b"ok", failures=10)
+        path = str(tmp_path / "frontier.db")
+        
+        with HTTPStandIn(routes) as server:
+            urls = [server.url(route) for route in routes]
+            
+            scraper = CourseScraper(frontier_path=path)
+            results = scraper.crawl(urls, max_workers=2, retries=0)
+            first = [next(results) for _ in range(10)]
+            # Coleta interrompida no meio
+            results.close()
+            scraper.close()
+            
+            resumed = CourseScraper(frontier_path=path)
+            rest = list(resumed.crawl(urls, max_workers=4, retries=0))
+            counts = resumed.frontier.counts()
+            
+            assert sum(server.hits.values()) <= len(routes) + 4
+            # Só a falha volta (até max_attempts); o resto já foi coletado
+            again = list(resumed.crawl(urls, retries=0))
+            assert [result['url'] for result in again] == [server.url("/turma/instavel")]
+        
+        assert len(first) + len(rest) >= len(routes)
+        assert counts == {'queued': 0, 'in_flight': 0, 'done': 30, 'failed': 1}
+    
+    def test_crawl_without_frontier_is_unchanged(self):
+        with HTTPStandIn({"/pagina": b"ok"}) as server:
+            scraper = CourseScraper()
+            results = list(scraper.crawl([server.url("/pagina")] * 2))
+            
+            assert server.hits["/pagina"] == 2
+        assert scraper.frontier is None
+        assert len(results) == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,114 @@
+import pytest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.crawler import CrawlEngine, TokenBucket
+from local_servers import HTTPStandIn, flaky
+
+class FakeClock:
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestTokenBucket:
+    
+    def test_waits_are_reserved_in_order(self):
+        clock = FakeClock()
+        waits = []
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock, sleep=waits.append)
+        
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert bucket.acquire() == pytest.approx(1.0)
+        
+        clock.now = 10.0
+        assert bucket.acquire() == 0
+        assert waits == [pytest.approx(0.5), pytest.approx(1.0)]
+
+class TestCrawlEngine:
+    
+    def setup_method(self):
+        self.sleeps = []
+    
+    def test_concurrency_limits_and_stats(self):
+        routes = {f"/turma/{number}": f"turma {number}".encode() for number in range(40)}
+        with HTTPStandIn(routes, delay=0.02) as server:
+            engine = CrawlEngine(max_workers=16, per_host=3)
+            results = list(engine.crawl(server.url(path) for path in routes))
+            
+            assert server.max_active <= 3
+        assert len(results) == 40
+        assert all(result['error'] is None for result in results)
+        assert {result['data'] for result in results} == {body.decode() for body in routes.values()}
+        
+        stats = engine.stats()
+        assert stats['succeeded'] == stats['requests'] == 40
+        assert stats['throughput'] > 0
+        assert stats['latency_p50'] >= 0.02
+        assert stats['latency_max'] >= stats['latency_p95'] >= stats['latency_p50']
+    
+    def test_latency_window_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(CrawlEngine, 'LATENCY_WINDOW', 5)
+        routes = {f"/turma/{number}": b"ok" for number in range(12)}
+        with HTTPStandIn(routes) as server:
+            engine = CrawlEngine(max_workers=4)
+            list(engine.crawl(server.url(path) for path in routes))
+        
+        assert len(engine._latencies) == 5
+        assert engine.stats()['requests'] == 12
+    
+    def test_transient_failures_are_retried(self):
+        routes = {"/vagas": flaky(b"ok", failures=2), "/lotado": flaky(b"ok", failures=1, status=429,
+                                                                         headers={'Retry-After': '7'})}
+        with HTTPStandIn(routes) as server:
+            engine = CrawlEngine(retries=3, backoff=0.1, sleep=self.sleeps.append)
+            result = engine.fetch(server.url("/vagas"))
+            limited = engine.fetch(server.url("/lotado"))
+        
+        assert (result['status'], result['attempts'], result['data']) == (200, 3, "ok")
+        assert limited['attempts'] == 2
+        assert all(delay <= 0.2 for delay in self.sleeps[:2])
+        assert self.sleeps[2] == 7
+        assert engine.stats()['retries'] == 3
+    
+    def test_gives_up_after_retries_and_skips_permanent_errors(self):
+        with HTTPStandIn({"/fora": flaky(b"ok", failures=10)}) as server:
+            engine = CrawlEngine(retries=2, sleep=self.sleeps.append)
+            down = engine.fetch(server.url("/fora"))
+            missing = engine.fetch(server.url("/nao-existe"))
+        
+        assert (down['attempts'], down['error']) == (3, "HTTP 503")
+        assert missing['attempts'] == 1
+        assert "404" in missing['error']
+        assert engine.stats()['failed'] == 2
+    
+    def test_rate_limit_per_host(self):
+        with HTTPStandIn({"/pagina": b"ok"}) as server:
+            engine = CrawlEngine(rate=5, burst=1, sleep=self.sleeps.append)
+            list(engine.crawl([server.url("/pagina")] * 4))
+        
+        # 4 requisições a 5/s com rajada de 1: 3 esperas, a última de ~0,6 s
+        assert len(self.sleeps) == 3
+        assert max(self.sleeps) == pytest.approx(0.6, abs=0.05)
+    
+    def test_course_scraper_crawl(self):
+        def echo_user_agent(handler):
+            return 200, {}, handler.headers['User-Agent'].encode()
+        
+        with HTTPStandIn({"/ua": echo_user_agent}) as server:
+            scraper = CourseScraper()
+            results = list(scraper.crawl([server.url("/ua")], max_workers=2))
+        
+        assert results[0]['data'].startswith("Mozilla/5.0")
+        assert scraper.crawl_engine.stats()['succeeded'] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,148 @@
+import pytest
+import sys
+import os
+import csv
+import gzip
+import json
+import tracemalloc
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.csv_export import export_csv, iter_jsonl
+from web_scraping.segment_store import SegmentStore
+
+def read_csv(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+class TestExportCSV:
+    
+    def setup_method(self):
+        self.materials = [
+            {"title": "Apostila de Cálculo I", "type": "PDF", "size": "2.5MB"},
+            {"title": "Lista 1", "type": "PDF", "tags": ["lista", "cálculo"]},
+            {"title": "Slides", "type": "PPTX", "size": "5.8MB"}
+        ]
+    
+    def test_infers_schema_from_generator(self, tmp_path):
+        path = tmp_path / "materials.csv"
+        result = export_csv((material for material in self.materials), str(path), chunk_size=2)
+        
+        assert result['rows'] == 3
+        assert result['columns'] == ["title", "type", "size", "tags"]
+        rows = read_csv(path)
+        assert rows[1]["size"] == ""
+        assert json.loads(rows[1]["tags"]) == ["lista", "cálculo"]
+        assert rows[2]["title"] == "Slides"
+    
+    def test_fixed_columns_ignore_extra_fields(self, tmp_path):
+        path = tmp_path / "materials.csv"
+        export_csv(self.materials, str(path), columns=["type", "title"])
+        
+        with open(path, encoding='utf-8') as f:
+            assert f.readline().strip() == "type,title"
+        assert read_csv(path)[0] == {"type": "PDF", "title": "Apostila de Cálculo I"}
+    
+    def test_late_fields_outside_inferred_schema_are_dropped(self, tmp_path):
+        path = tmp_path / "materials.csv"
+        result = export_csv(self.materials, str(path), infer_rows=1)
+        
+        assert result['columns'] == ["title", "type", "size"]
+        assert "tags" not in read_csv(path)[1]
+    
+    def test_gzip_output(self, tmp_path):
+        path = tmp_path / "materials.csv.gz"
+        export_csv(self.materials, str(path))
+        
+        assert [row["title"] for row in read_csv(path)] == [material["title"] for material in self.materials]
+        
+        plain = tmp_path / "materials.csv"
+        export_csv(self.materials, str(plain), compress=True)
+        with open(plain, 'rb') as f:
+            assert f.read(2) == b"\x1f\x8b"
+    
+    def test_constant_memory(self, tmp_path):
+        def peak_for(count):
+            records = ({"course": f"MAT{number % 500:03d}", "title": f"Material {number}", "type": "PDF"}
+                       for number in range(count))
+            tracemalloc.start()
+            result = export_csv(records, str(tmp_path / f"{count}.csv"), chunk_size=500, infer_rows=100)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert result['rows'] == count
+            assert result['rows_per_second'] > 0
+            return peak
+        
+        # 10x mais linhas, mesmo pico de memória (um bloco por vez)
+        assert peak_for(100_000) < peak_for(10_000) * 1.5
+    
+    def test_reads_segment_store_output(self, tmp_path):
+        with SegmentStore(str(tmp_path / "segments"), flush_interval=None) as store:
+            store.append("materials_MAT001", self.materials[:2])
+            store.append("vacancy_MAT001", {"course_code": "MAT001", "available_vacancies": 2})
+        
+        records = list(iter_jsonl(str(tmp_path / "segments")))
+        assert [record.get("title") for record in records] == ["Apostila de Cálculo I", "Lista 1", None]
+        
+        raw = list(iter_jsonl(str(tmp_path / "segments"), unwrap=False))
+        assert [record["key"] for record in raw] == ["materials_MAT001", "vacancy_MAT001"]
+    
+    def test_user_records_with_key_and_data_pass_through(self, tmp_path):
+        path = tmp_path / "eventos.jsonl"
+        rows = [{"key": "MAT001", "data": "2024-03-01", "tipo": "prova"},
+                {"key": "MAT001", "data": "2024-04-01", "tipo": "prova"}]
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding='utf-8')
+        
+        # Não são registros do SegmentStore: nem desembrulhados nem deduplicados por key
+        assert list(iter_jsonl(str(path))) == rows
+    
+    def test_live_store_latest_versions(self, tmp_path):
+        root = str(tmp_path / "segments")
+        store = SegmentStore(root, segment_bytes=200, flush_interval=None)
+        store.append("vacancy_MAT001", {"course_code": "MAT001", "available_vacancies": 5})
+        store.append("vacancy_MAT002", {"course_code": "MAT002", "available_vacancies": 1})
+        store.flush()
+        store.append("vacancy_MAT001", {"course_code": "MAT001", "available_vacancies": 2})
+        store.flush()
+        with open(os.path.join(root, "000002.jsonl.open"), 'ab') as f:
+            f.write(b'{"key": "vacancy_MAT003", "da')
+        
+        # Store ainda aberto: o segmento ativo entra, a linha incompleta não
+        live = list(iter_jsonl(root))
+        assert sorted((record["course_code"], record["available_vacancies"]) for record in live) == [
+            ("MAT001", 2), ("MAT002", 1)]
+        
+        history = list(iter_jsonl(root, latest_only=False))
+        assert [record["available_vacancies"] for record in history] == [5, 1, 2]
+
+class TestCourseScraperExport:
+    
+    def test_export_to_csv(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        scraper = CourseScraper(segment_dir="segments")
+        materials = scraper.scrape_course_materials("MAT001")
+        scraper.close()
+        
+        from_list = scraper.export_to_csv(materials, "materials.csv")
+        from_segments = scraper.export_to_csv("segments", "segments.csv.gz")
+        
+        assert from_list['rows'] == from_segments['rows'] == 3
+        assert read_csv(tmp_path / "materials.csv") == read_csv(tmp_path / "segments.csv.gz")
+        assert read_csv(tmp_path / "materials.csv")[0]["title"] == "Apostila de Cálculo I"
+    
+    def test_export_open_store_with_updates(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        scraper = CourseScraper(segment_dir="segments")
+        scraper.scrape_course_materials("MAT001")
+        scraper.scrape_course_materials("MAT001")
+        
+        # Sem close: o buffer é gravado e cada entidade aparece uma vez
+        result = scraper.export_to_csv("segments", "materials.csv")
+        scraper.close()
+        assert result['rows'] == 3
+
+if __name__ == "__main__":
+    pytest.main([__file__])
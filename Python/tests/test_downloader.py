@@ -0,0 +1,184 @@
+import pytest
+import subprocess
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.downloader import MaterialDownloader, safe_filename
+from local_servers import HTTPStandIn, Resource, flaky
+
+class TestMaterialDownloader:
+    
+    def setup_method(self):
+        self.body = bytes(range(256)) * 400
+        self.delays = []
+    
+    def make_downloader(self, tmp_path, **kwargs):
+        kwargs.setdefault('chunk_size', 4096)
+        return MaterialDownloader(str(tmp_path / "materials"), sleep=self.delays.append, **kwargs)
+    
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    def test_download_and_skip_unchanged(self, tmp_path):
+        resource = Resource(self.body)
+        with HTTPStandIn({"/apostila.pdf": resource}) as server:
+            downloader = self.make_downloader(tmp_path)
+            first = downloader.download(server.url("/apostila.pdf"), "MAT001/apostila.pdf")
+            second = downloader.download(server.url("/apostila.pdf"))
+        
+        assert first['result'] == 'downloaded'
+        assert first['bytes'] == first['size'] == len(self.body)
+        assert self.read(first['path']) == self.body
+        assert not os.path.exists(first['path'] + ".part")
+        
+        # Revalidação com GET condicional, no mesmo caminho de antes
+        assert second['result'] == 'unchanged'
+        assert second['path'] == first['path']
+        assert second['bytes'] == 0
+        assert resource.conditional == 1
+        assert downloader.stats() == {'downloaded': 1, 'resumed': 0, 'unchanged': 1, 'duplicate': 0,
+                                      'failed': 0, 'bytes': len(self.body)}
+    
+    def test_resumes_interrupted_download(self, tmp_path):
+        resource = Resource(self.body)
+        resource.cut = 30000
+        with HTTPStandIn({"/slides.pptx": resource}) as server:
+            downloader = self.make_downloader(tmp_path, retries=1)
+            result = downloader.download(server.url("/slides.pptx"))
+        
+        assert result['result'] == 'resumed'
+        # Retoma do que chegou ao disco antes da queda
+        assert len(resource.ranges) == 1
+        assert 0 < resource.ranges[0] <= 30000
+        assert result['bytes'] == len(self.body)
+        assert self.read(result['path']) == self.body
+        assert len(self.delays) == 1
+    
+    def test_partial_file_of_old_version_is_discarded(self, tmp_path):
+        resource = Resource(self.body)
+        resource.cut = 30000
+        with HTTPStandIn({"/lista.pdf": resource}) as server:
+            downloader = self.make_downloader(tmp_path, retries=0)
+            assert downloader.download(server.url("/lista.pdf"))['result'] == 'failed'
+            
+            # If-Range não bate mais: o servidor manda o arquivo inteiro
+            resource.update(b"nova versao" * 1000)
+            result = downloader.download(server.url("/lista.pdf"))
+        
+        assert result['result'] == 'downloaded'
+        assert resource.ranges == []
+        assert self.read(result['path']) == b"nova versao" * 1000
+    
+    def test_changed_file_is_downloaded_again(self, tmp_path):
+        resource = Resource(self.body)
+        with HTTPStandIn({"/apostila.pdf": resource}) as server:
+            downloader = self.make_downloader(tmp_path)
+            downloader.download(server.url("/apostila.pdf"))
+            resource.update(self.body[::-1])
+            result = downloader.download(server.url("/apostila.pdf"))
+        
+        assert result['result'] == 'downloaded'
+        assert self.read(result['path']) == self.body[::-1]
+    
+    def test_same_content_from_other_url_is_linked(self, tmp_path):
+        routes = {"/drive/apostila.pdf": Resource(self.body), "/espelho/apostila.pdf": Resource(self.body)}
+        with HTTPStandIn(routes) as server:
+            downloader = self.make_downloader(tmp_path)
+            first = downloader.download(server.url("/drive/apostila.pdf"), "MAT001/apostila.pdf")
+            second = downloader.download(server.url("/espelho/apostila.pdf"), "MAT002/apostila.pdf")
+        
+        assert second['result'] == 'duplicate'
+        assert second['sha256'] == first['sha256']
+        assert os.path.samefile(first['path'], second['path'])
+    
+    def test_same_basename_on_different_paths(self, tmp_path):
+        routes = {"/c1/slides.pdf": Resource(b"c1" * 100000), "/c2/slides.pdf": Resource(b"c2" * 150000)}
+        with HTTPStandIn(routes) as server:
+            downloader = self.make_downloader(tmp_path)
+            urls = [server.url(route) for route in routes]
+            first = {result['url']: result for result in downloader.download_all(urls)}
+            again = {result['url']: result for result in downloader.download_all(urls)}
+            
+            # Dois itens apontando para o mesmo arquivo: o segundo é recusado
+            clash = list(downloader.download_all([{'url': url, 'filename': "slides.pdf"} for url in urls]))
+        
+        assert first[urls[0]]['path'] != first[urls[1]]['path']
+        for url, route in zip(urls, routes):
+            assert first[url]['result'] == 'downloaded'
+            assert again[url]['result'] == 'unchanged'
+            assert self.read(first[url]['path']) == routes[route].body
+        
+        assert [result['result'] for result in clash] == ['failed', 'downloaded']
+        assert urls[0] in clash[0]['error']
+        assert self.read(clash[1]['path']) == b"c1" * 100000
+    
+    def test_parallel_with_per_host_limit(self, tmp_path):
+        routes = {f"/material/{number}.pdf": Resource(bytes([number]) * 1000) for number in range(8)}
+        with HTTPStandIn(routes, delay=0.05) as server:
+            downloader = self.make_downloader(tmp_path, max_workers=8, per_host=2)
+            urls = [server.url(route) for route in routes]
+            results = list(downloader.download_all(urls + urls[:3]))
+        
+        assert len(results) == 8
+        assert {result['result'] for result in results} == {'downloaded'}
+        assert server.max_active == 2
+        assert sum(server.hits.values()) == 8
+    
+    def test_retries_temporary_errors(self, tmp_path):
+        routes = {"/instavel.pdf": flaky(self.body, failures=2, headers={'Retry-After': '3'})}
+        with HTTPStandIn(routes) as server:
+            downloader = self.make_downloader(tmp_path, retries=2, backoff=0.5)
+            result = downloader.download(server.url("/instavel.pdf"))
+            failed = self.make_downloader(tmp_path, retries=0).download(server.url("/nao/existe.pdf"))
+        
+        assert result['result'] == 'downloaded'
+        assert self.delays == [3.0, 3.0]
+        assert failed['result'] == 'failed'
+        assert "404" in failed['error']
+    
+    def test_safe_filename(self):
+        assert safe_filename("Slides Aula 1-5") == "Slides_Aula_1-5"
+        assert safe_filename("../../etc/passwd") == "etc_passwd"
+        assert safe_filename("...") == "arquivo"
+
+class TestCourseScraperDownload:
+    
+    @pytest.mark.parametrize("module", ["course_scraper", "crawl_frontier", "downloader", "vacancy_watcher"])
+    def test_modules_load_as_scripts(self, tmp_path, module):
+        # Carrega como script (sem src no path), sem rodar o exemplo, que usa a rede
+        script = os.path.join(os.path.dirname(__file__), '..', 'src', 'web_scraping', f"{module}.py")
+        result = subprocess.run([sys.executable, "-c", f"import runpy; runpy.run_path({script!r})"],
+                                cwd=tmp_path, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+    
+    def test_download_materials(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with HTTPStandIn({"/apostila": Resource(b"pdf"), "/slides": Resource(b"pptx")}) as server:
+            scraper = CourseScraper()
+            materials = [
+                {"title": "Apostila de Cálculo I", "type": "PDF", "url": server.url("/apostila")},
+                {"title": "Slides Aula 1-5", "type": "PPTX", "url": server.url("/slides")},
+                {"title": "Slides Aula 1-5", "type": "PPTX", "url": server.url("/slides-revisados")}
+            ]
+            server.routes["/slides-revisados"] = Resource(b"pptx revisado")
+            monkeypatch.setattr(scraper, "scrape_course_materials", lambda code: materials)
+            
+            first = {result['url']: result['path'] for result in scraper.download_materials("MAT001")}
+            again = [result['result'] for result in scraper.download_materials("MAT001")]
+        
+        assert first[materials[0]['url']].startswith(os.path.join("materials", "MAT001", "Apostila_de_Cálculo_I_"))
+        assert first[materials[0]['url']].endswith(".pdf")
+        # Mesmo título, arquivos distintos
+        assert len(set(first.values())) == 3
+        with open(first[materials[2]['url']], 'rb') as f:
+            assert f.read() == b"pptx revisado"
+        assert again == ['unchanged'] * 3
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automation.academic_scheduler import AcademicScheduler
+from automation.grade_backup import GradeBackupStore
+
+class TestGradeBackupStore:
+    
+    def setup_method(self):
+        self.now = datetime(2024, 3, 4, 12, 0)
+        self.grades = {
+            "Cálculo I": [85, 90, 78],
+            "Programação": [92, 88, 95],
+            "Física": [75, 82, 80]
+        }
+    
+    def make_store(self, path, **kwargs):
+        return GradeBackupStore(path, clock=lambda: self.now, **kwargs)
+    
+    def test_only_changed_courses_are_written(self, tmp_path):
+        store = self.make_store(tmp_path)
+        
+        first = store.backup(self.grades)
+        assert (first['written'], first['reused']) == (3, 0)
+        
+        self.now += timedelta(minutes=5)
+        assert store.backup(self.grades)['snapshot'] is None
+        
+        self.grades["Física"].append(91)
+        second = store.backup(self.grades, changed=["Física"])
+        assert (second['written'], second['reused']) == (1, 2)
+        assert second['bytes_written'] < first['bytes_written']
+        assert len(list(store.objects_dir.glob("*/*"))) == 4
+    
+    def test_point_in_time_restore(self, tmp_path):
+        store = self.make_store(tmp_path)
+        store.backup(self.grades)
+        before_change = self.now
+        
+        self.now += timedelta(hours=1)
+        self.grades["Física"] = [100]
+        del self.grades["Programação"]
+        store.backup(self.grades)
+        
+        restored = self.make_store(tmp_path).restore(before_change + timedelta(minutes=30))
+        assert restored["Física"] == [75, 82, 80]
+        assert "Programação" in restored
+        assert store.restore() == {"Cálculo I": [85, 90, 78], "Física": [100]}
+        
+        with pytest.raises(LookupError):
+            store.restore(before_change - timedelta(seconds=1))
+    
+    def test_retention_policy(self, tmp_path):
+        store = self.make_store(tmp_path, prune_interval=None)
+        start = self.now
+        
+        # Um backup a cada 20 minutos durante 3 dias, sempre com uma nota nova
+        for step in range(3 * 24 * 3):
+            self.now = start + timedelta(minutes=20 * step)
+            self.grades["Física"].append(step % 100)
+            store.backup(self.grades, changed=["Física"])
+        
+        result = store.prune(self.now)
+        snapshots = store.snapshots()
+        
+        assert result['snapshots_removed'] > 0
+        assert result['objects_removed'] == result['snapshots_removed']
+        # Último dia: um por hora; antes disso: um por dia
+        recent = [moment for moment in snapshots if self.now - moment <= timedelta(days=1)]
+        assert 24 <= len(recent) <= 25
+        assert len(snapshots) - len(recent) <= 3
+        assert snapshots[-1] == self.now
+        assert store.restore()["Física"] == self.grades["Física"]
+    
+    def test_scheduler_backup_grades(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        scheduler = AcademicScheduler()
+        
+        assert scheduler.backup_grades(self.grades)['snapshot'] is not None
+        assert scheduler.backup_grades(self.grades)['snapshot'] is None
+        assert scheduler.restore_grades() == self.grades
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_analysis.grade_book import GradeBook
+from data_analysis.grade_calculator import GradeCalculator
+
+class TestGradeBook:
+    
+    def setup_method(self):
+        self.calc = GradeCalculator()
+        self.book = GradeBook("João Silva", {
+            "Cálculo I": [85, 90, 78],
+            "Programação": [92, 88, 95],
+            "Física": [75, 82, 80]
+        })
+    
+    def assert_matches_calculator(self):
+        expected = self.calc.calculate_semester_statistics(self.book.grades_data)
+        stats = self.book.statistics()
+        assert stats.keys() == expected.keys()
+        for key, value in expected.items():
+            assert stats[key] == pytest.approx(value)
+    
+    def test_statistics_match_calculator(self):
+        self.assert_matches_calculator()
+        assert self.book.report() == self.calc.create_grade_report("João Silva", self.book.grades_data)
+    
+    def test_only_dirty_subject_is_recomputed(self):
+        self.book.statistics()
+        misses = self.book.cache_misses
+        
+        self.book.add_grade("Física", 91)
+        self.assert_matches_calculator()
+        
+        # Uma falta para o resumo geral e uma para a disciplina alterada
+        assert self.book.cache_misses == misses + 2
+    
+    def test_edit_and_remove(self):
+        self.book.edit_grade("Cálculo I", 0, 40)
+        self.assert_matches_calculator()
+        
+        assert self.book.remove_grade("Programação") == 95
+        self.book.remove_subject("Física")
+        self.assert_matches_calculator()
+    
+    def test_cache_hits(self):
+        self.book.report()
+        hits = self.book.cache_info()['hits']
+        self.book.report()
+        assert self.book.cache_info()['hits'] > hits
+        assert self.book.cache_info()['cached_subjects'] == 3
+    
+    def test_empty(self):
+        assert GradeBook().statistics() == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__])
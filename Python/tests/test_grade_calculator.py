@@ -1,6 +1,8 @@
 import pytest
 import sys
 import os
+import numpy as np
+import pandas as pd
 
 # Adicionar o diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -26,6 +28,28 @@ class TestGradeCalculator:
         with pytest.raises(ValueError):
             self.calc.calculate_weighted_average(grades, weights)
     
+    def test_calculate_weighted_average_matrix(self):
+        grades = [[85, 90, 78], [60, 70, 80]]
+        weights = [0.3, 0.4, 0.3]
+        result = self.calc.calculate_weighted_average_matrix(grades, weights)
+        expected = [np.average(row, weights=weights) for row in grades]
+        assert np.allclose(result, expected)
+    
+    def test_calculate_weighted_average_matrix_missing(self):
+        weights = [0.5, 0.25, 0.25]
+        nan_grades = np.array([[80, np.nan, 60], [np.nan, np.nan, np.nan]])
+        result = self.calc.calculate_weighted_average_matrix(nan_grades, weights)
+        assert result[0] == pytest.approx((80 * 0.5 + 60 * 0.25) / 0.75)
+        assert np.isnan(result[1])
+        
+        masked = np.ma.masked_array([[80, 0, 60]], mask=[[False, True, False]])
+        masked_result = self.calc.calculate_weighted_average_matrix(masked, weights)
+        assert masked_result[0] == pytest.approx(result[0])
+    
+    def test_calculate_weighted_average_matrix_invalid_weights(self):
+        with pytest.raises(ValueError):
+            self.calc.calculate_weighted_average_matrix([[85, 90, 78]], [0.3, 0.4, 0.4])
+    
     def test_simulate_final_grade_needed(self):
         current_grades = [85, 90]
         current_weights = [0.4, 0.3]
@@ -38,11 +62,54 @@ class TestGradeCalculator:
         
         assert 0 <= result <= 100
     
+    def test_simulate_final_grade_needed_batch(self):
+        grades = [[85, 90], [40, 50], [100, 100]]
+        weights = [0.4, 0.3]
+        
+        result = self.calc.simulate_final_grade_needed_batch(grades, weights, [70, 85], [0.3, 0.5])
+        
+        assert result.shape == (3, 2, 2)
+        expected = self.calc.simulate_final_grade_needed(grades[0], weights, 85, 0.3)
+        assert result[0, 1, 0] == pytest.approx(expected)
+        assert result[1, 1, 0] == 100
+        assert result[2, 0, 0] == pytest.approx(0)
+    
+    def test_simulate_final_grade_needed_batch_invalid_weights(self):
+        with pytest.raises(ValueError):
+            self.calc.simulate_final_grade_needed_batch([[85, 90]], [0.4, 0.3, 0.3], 85, 0.3)
+        
+        with pytest.raises(ValueError):
+            self.calc.simulate_final_grade_needed_batch([[85, 90]], [0.4, 0.3], 85, 0)
+    
     def test_calculate_gpa(self):
         grades = [95, 87, 92, 78]
         gpa = self.calc.calculate_gpa(grades)
         assert 2.0 <= gpa <= 4.0
     
+    def test_grades_to_points_matches_scale(self):
+        grades = [100, 95.5, 89.9, 85, 80, 75, 70, 65, 60, 59.9, 0, 101, -5]
+        points = self.calc.grades_to_points(grades)
+        expected = [4.0, 4.0, 3.7, 3.7, 3.3, 3.0, 2.7, 2.3, 2.0, 0.0, 0.0, 0.0, 0.0]
+        assert list(points) == expected
+    
+    def test_calculate_gpa_batch_ragged(self):
+        students = [[95, 87, 92, 78], [60, 59], [], [100]]
+        gpas = self.calc.calculate_gpa_batch(students)
+        expected = [self.calc.calculate_gpa(grades) for grades in students]
+        assert np.allclose(gpas, expected)
+    
+    def test_calculate_gpa_batch_matrix_with_missing(self):
+        matrix = np.array([[95, 87, np.nan], [70, 80, 90]])
+        gpas = self.calc.calculate_gpa_batch(matrix)
+        assert np.allclose(gpas, [self.calc.calculate_gpa([95, 87]),
+                                  self.calc.calculate_gpa([70, 80, 90])])
+    
+    def test_calculate_gpa_batch_series(self):
+        long_format = pd.Series([95, 87, 70, 80], index=['ana', 'ana', 'bia', 'bia'])
+        gpas = self.calc.calculate_gpa_batch(long_format)
+        assert gpas['ana'] == pytest.approx(self.calc.calculate_gpa([95, 87]))
+        assert gpas['bia'] == pytest.approx(self.calc.calculate_gpa([70, 80]))
+    
     def test_calculate_semester_statistics(self):
         grades_data = {
             "Cálculo I": [85, 90, 78],
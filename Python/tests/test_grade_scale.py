@@ -0,0 +1,65 @@
+import pytest
+import sys
+import os
+import subprocess
+import numpy as np
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_analysis.grade_calculator import GradeCalculator
+from data_analysis.grade_scale import GradeScale
+from utils.helpers import calculate_gpa
+
+class TestGradeScale:
+    
+    def test_default_is_shared_with_calculator(self):
+        calc = GradeCalculator()
+        assert calc.grade_scale is GradeScale.default()
+    
+    def test_calculator_follows_custom_gpa_scale(self):
+        calc = GradeCalculator()
+        calc.gpa_scale = {range(50, 101): 1.0, range(0, 50): 0.0}
+        assert calc.calculate_gpa([40, 60]) == pytest.approx(0.5)
+    
+    def test_helpers_match_threshold_chain(self):
+        grades = [100, 105, 90, 89.99, 84.5, 60, 59.99, 0, -3]
+        expected = [4.0, 4.0, 4.0, 3.7, 3.3, 2.0, 0.0, 0.0, 0.0]
+        for grade, points in zip(grades, expected):
+            assert calculate_gpa([grade]) == pytest.approx(points)
+    
+    def test_credit_hours(self):
+        gpa = calculate_gpa([95, 72], credit_hours=[4, 2])
+        assert gpa == pytest.approx((4.0 * 4 + 2.7 * 2) / 6)
+        
+        matrix = GradeScale.default().gpa([[95, 72], [60, 85]], credit_hours=[4, 2])
+        assert np.allclose(matrix, [(4.0 * 4 + 2.7 * 2) / 6, (2.0 * 4 + 3.7 * 2) / 6])
+    
+    def test_decimal_scale(self):
+        scale = GradeScale.from_thresholds({9.0: 4.0, 7.0: 3.0, 5.0: 2.0, 0: 0.0}, max_grade=10, resolution=10)
+        assert list(scale.points([10, 9.0, 8.99, 7.0, 6.9, 5.0, 4.9])) == [4.0, 4.0, 3.0, 3.0, 2.0, 2.0, 0.0]
+        assert scale is GradeScale.from_thresholds({0: 0.0, 5.0: 2.0, 7.0: 3.0, 9.0: 4.0},
+                                                   max_grade=10, resolution=10)
+    
+    def test_invalid_band(self):
+        with pytest.raises(ValueError):
+            GradeScale.from_bands([(0, 5.05, 1.0)], resolution=10)
+    
+    def test_calculator_rejects_nan(self):
+        with pytest.raises(ValueError):
+            GradeCalculator().calculate_gpa([90, float('nan')])
+        # Na versão em lote, NaN continua sendo nota ausente
+        assert GradeCalculator().calculate_gpa_batch(np.array([[90, np.nan]]))[0] == pytest.approx(4.0)
+    
+    @pytest.mark.parametrize("module", [
+        "data_analysis/grade_calculator.py", "data_analysis/cohort_statistics.py",
+        "data_analysis/grade_book.py", "data_analysis/streaming_statistics.py",
+        "automation/academic_scheduler.py", "automation/multi_tenant.py"
+    ])
+    def test_modules_run_as_scripts(self, tmp_path, module):
+        script = os.path.join(os.path.dirname(__file__), '..', 'src', *module.split('/'))
+        result = subprocess.run([sys.executable, script], cwd=tmp_path, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,111 @@
+import pytest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.http_cache import CachedSession, HTTPCache
+from local_servers import HTTPStandIn, Resource
+
+class TestCachedSession:
+    
+    def setup_method(self):
+        self.now = 1000.0
+    
+    def make_session(self, path, **kwargs):
+        return CachedSession(HTTPCache(str(path), clock=lambda: self.now, **kwargs))
+    
+    def test_fresh_entries_skip_the_network(self, tmp_path):
+        session = self.make_session(tmp_path, ttls={r"/turmas": 60})
+        with HTTPStandIn({"/turmas": Resource(b"horarios")}) as server:
+            first = session.get(server.url("/turmas"))
+            second = session.get(server.url("/turmas"))
+            
+            assert server.hits["/turmas"] == 1
+        assert not getattr(first, 'from_cache', False)
+        assert second.from_cache and second.content == b"horarios"
+        assert second.headers['ETag'] == '"v1"'
+        
+        stats = session.cache.stats()
+        assert (stats['hits'], stats['misses'], stats['revalidated']) == (1, 1, 0)
+        assert stats['bytes_saved'] == len(b"horarios")
+    
+    def test_stale_entries_are_revalidated(self, tmp_path):
+        resource = Resource(b"materiais v1")
+        session = self.make_session(tmp_path, ttls={r"/materiais": 60})
+        with HTTPStandIn({"/materiais": resource}) as server:
+            session.get(server.url("/materiais"))
+            
+            self.now += 61
+            unchanged = session.get(server.url("/materiais"))
+            assert unchanged.status_code == 200 and unchanged.content == b"materiais v1"
+            
+            # Revalidação renova o TTL
+            session.get(server.url("/materiais"))
+            assert resource.conditional == 1
+            
+            self.now += 61
+            resource.update(b"materiais v2")
+            changed = session.get(server.url("/materiais"))
+        
+        assert changed.content == b"materiais v2"
+        assert resource.conditional == 2
+        stats = session.cache.stats()
+        assert (stats['hits'], stats['revalidated'], stats['misses']) == (1, 1, 2)
+        assert stats['hit_rate'] == pytest.approx(0.5)
+    
+    def test_persists_between_sessions(self, tmp_path):
+        with HTTPStandIn({"/calendario": Resource(b"2024")}) as server:
+            self.make_session(tmp_path, default_ttl=3600).get(server.url("/calendario"))
+            response = self.make_session(tmp_path, default_ttl=3600).get(server.url("/calendario"))
+            
+            assert server.hits["/calendario"] == 1
+        assert response.text == "2024"
+    
+    def test_lru_eviction_under_budget(self, tmp_path):
+        routes = {f"/pagina/{number}": Resource(b"x" * 100) for number in range(3)}
+        session = self.make_session(tmp_path, max_bytes=250, default_ttl=60)
+        with HTTPStandIn(routes) as server:
+            session.get(server.url("/pagina/0"))
+            self.now += 1
+            session.get(server.url("/pagina/1"))
+            self.now += 1
+            session.get(server.url("/pagina/0"))
+            self.now += 1
+            session.get(server.url("/pagina/2"))
+        
+        stats = session.cache.stats()
+        assert (stats['entries'], stats['bytes'], stats['evictions']) == (2, 200, 1)
+        assert session.cache.lookup(server.url("/pagina/1")) is None
+        assert session.cache.lookup(server.url("/pagina/0")) is not None
+    
+    def test_errors_and_no_store_are_not_cached(self, tmp_path):
+        def private(handler):
+            return 200, {'Cache-Control': 'no-store'}, b"segredo"
+        
+        session = self.make_session(tmp_path, default_ttl=60)
+        with HTTPStandIn({"/privado": private}) as server:
+            session.get(server.url("/privado"))
+            session.get(server.url("/nao-existe"))
+        
+        assert session.cache.stats()['entries'] == 0
+
+class TestCourseScraperCache:
+    
+    def test_cache_is_opt_in(self, tmp_path):
+        assert CourseScraper().cache is None
+        
+        scraper = CourseScraper(cache_dir=str(tmp_path), cache_ttls={r"/turmas": 3600})
+        with HTTPStandIn({"/turmas": Resource(b"turmas")}) as server:
+            scraper.session.get(server.url("/turmas"))
+            results = list(scraper.crawl([server.url("/turmas")] * 3, max_workers=2))
+            
+            assert server.hits["/turmas"] == 1
+        assert all(result['data'] == "turmas" for result in results)
+        assert scraper.cache.stats()['hits'] == 3
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,116 @@
+import pytest
+import sys
+import os
+from email.mime.text import MIMEText
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from automation.academic_scheduler import AcademicScheduler
+from automation.mail_delivery import MailDispatcher, SMTPConnectionPool
+from local_servers import SMTPStandIn
+
+def make_message(number):
+    msg = MIMEText(f"Mensagem {number}", 'plain')
+    msg['From'] = "scheduler@universidade.edu"
+    msg['To'] = f"aluno{number}@universidade.edu"
+    msg['Subject'] = f"Resumo {number}"
+    return msg
+
+class TestMailDispatcher:
+    
+    def setup_method(self):
+        self.delays = []
+    
+    def make_dispatcher(self, server, **kwargs):
+        pool = SMTPConnectionPool("127.0.0.1", server.port, starttls=False, size=2, timeout=5)
+        return MailDispatcher(pool, workers=2, batch_size=20, sleep=self.delays.append, **kwargs)
+    
+    def test_batches_reuse_connections(self):
+        with SMTPStandIn() as server:
+            with self.make_dispatcher(server) as mailer:
+                for number in range(200):
+                    assert mailer.submit(make_message(number))
+            
+            stats = mailer.stats()
+            assert stats['sent'] == 200
+            assert stats['failed'] == stats['queued'] == 0
+            assert len(server.messages) == 200
+            # 200 mensagens, no máximo 2 conexões (uma por thread)
+            assert server.connections <= 2
+            assert stats['connections_opened'] == server.connections
+    
+    def test_transient_failures_are_retried(self):
+        with SMTPStandIn(fail_data=3) as server:
+            with self.make_dispatcher(server) as mailer:
+                for number in range(5):
+                    mailer.submit(make_message(number))
+            
+            assert mailer.stats()['sent'] == 5
+            assert mailer.stats()['retried'] >= 1
+            assert self.delays
+    
+    def test_permanent_failures_are_counted(self):
+        with SMTPStandIn(reject_data=True) as server:
+            with self.make_dispatcher(server) as mailer:
+                for number in range(3):
+                    mailer.submit(make_message(number))
+            
+            assert mailer.stats()['failed'] == 3
+            assert mailer.stats()['sent'] == 0
+            assert "554" in mailer.errors[0]
+    
+    def test_unexpected_errors_do_not_stop_workers(self):
+        broken = make_message(0)
+        # Dois blocos Resent-*: send_message levanta ValueError
+        broken['Resent-Date'] = "Mon, 04 Mar 2024 08:00:00 -0300"
+        broken['Resent-Date'] = "Mon, 04 Mar 2024 09:00:00 -0300"
+        
+        with SMTPStandIn() as server:
+            pool = SMTPConnectionPool("127.0.0.1", server.port, starttls=False, size=1, timeout=5)
+            with MailDispatcher(pool, workers=1, batch_size=2, sleep=self.delays.append) as mailer:
+                for message in [broken, make_message(1), broken, make_message(2), make_message(3)]:
+                    mailer.submit(message)
+                mailer.flush()
+                mailer.submit(make_message(4))
+            
+            assert mailer.stats()['failed'] == 2
+            assert mailer.stats()['sent'] == 4
+            assert len(server.messages) == 4
+            assert "ValueError" in mailer.errors[0]
+    
+    def test_unreachable_server_gives_up(self):
+        with SMTPStandIn() as server:
+            port = server.port
+        
+        pool = SMTPConnectionPool("127.0.0.1", port, starttls=False, timeout=1)
+        with MailDispatcher(pool, workers=1, max_retries=2, sleep=self.delays.append) as mailer:
+            mailer.submit(make_message(1))
+        
+        assert mailer.stats()['failed'] == 1
+        assert len(self.delays) == 2
+    
+    def test_full_queue_rejects_without_blocking(self):
+        pool = SMTPConnectionPool("127.0.0.1", 1, starttls=False)
+        mailer = MailDispatcher(pool, workers=0, queue_size=1)
+        
+        assert mailer.submit(make_message(1), block=False)
+        assert not mailer.submit(make_message(2), block=False)
+        assert mailer.stats()['queued'] == 1
+    
+    def test_scheduler_uses_mailer(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with SMTPStandIn() as server:
+            config = {'sender': 'scheduler@universidade.edu', 'recipient': 'aluno@universidade.edu',
+                      'smtp_server': '127.0.0.1', 'smtp_port': server.port, 'starttls': False}
+            with MailDispatcher(SMTPConnectionPool.from_config(config)) as mailer:
+                scheduler = AcademicScheduler(email_config=config, mailer=mailer)
+                scheduler._send_email("Assunto 1", "Corpo")
+                scheduler._send_email("Assunto 2", "Corpo")
+            
+            assert mailer.stats()['sent'] == 2
+            assert any(b"Subject: Assunto 2" in message for message in server.messages)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,159 @@
+import pytest
+import sys
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from automation.academic_scheduler import render_daily_summary
+from automation.mail_delivery import MailDispatcher, SMTPConnectionPool
+from automation.multi_tenant import MultiTenantScheduler
+from automation.task_store import JSONTaskStore, SQLiteTaskStore
+from local_servers import SMTPStandIn
+
+class TestMultiTenantScheduler:
+    
+    @pytest.fixture(autouse=True)
+    def workdir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+    
+    def setup_method(self):
+        self.now = datetime(2024, 3, 4, 8, 0)
+        self.students = {"s1": "ana@universidade.edu", "s2": "bruno@universidade.edu",
+                         "s3": "carla@universidade.edu"}
+    
+    def make_task(self, student_id, title, days, now=None):
+        return {
+            'title': title,
+            'due_date': ((now or self.now) + timedelta(days=days)).isoformat(),
+            'course': 'Cálculo I',
+            'type': 'assignment',
+            'student_id': student_id
+        }
+    
+    def make_scheduler(self, store=None, **kwargs):
+        scheduler = MultiTenantScheduler(store or SQLiteTaskStore("tasks.db"), self.students, **kwargs)
+        scheduler.add_tasks([
+            self.make_task("s2", "Prova", 2),
+            self.make_task("s1", "Lista", 1),
+            self.make_task("s1", "Projeto", 30),
+            self.make_task("s1", "Trabalho", 0.5),
+            self.make_task("s3", "Seminário", 10)
+        ])
+        return scheduler
+    
+    @pytest.mark.parametrize("store_factory", [lambda: None, lambda: JSONTaskStore("tasks.json")])
+    def test_grouped_upcoming_query(self, store_factory):
+        scheduler = self.make_scheduler(store_factory())
+        scheduler.complete_task(2)
+        
+        groups = {student_id: [task['title'] for task in tasks]
+                  for student_id, tasks in scheduler.upcoming_by_student(3, self.now)}
+        assert groups == {"s1": ["Trabalho"], "s2": ["Prova"]}
+    
+    def test_unknown_student_is_rejected(self):
+        scheduler = MultiTenantScheduler(SQLiteTaskStore(":memory:"), self.students)
+        with pytest.raises(ValueError):
+            scheduler.add_task(self.make_task("s9", "Lista", 1))
+    
+    def test_add_tasks_reports_unknown_students(self):
+        scheduler = MultiTenantScheduler(SQLiteTaskStore(":memory:"), self.students)
+        result = scheduler.add_tasks([
+            self.make_task("s1", "Lista", 1),
+            self.make_task("zzz", "Intrusa", 1),
+            dict(self.make_task("s2", "Prova", 2), due_date="amanhã"),
+            self.make_task("s3", "Seminário", 3)
+        ])
+        
+        assert result['inserted'] == 2
+        assert [error['row'] for error in result['errors']] == [1, 2]
+        assert "zzz" in result['errors'][0]['error']
+        assert {task['student_id'] for task in scheduler.store.all()} == {"s1", "s3"}
+    
+    def test_reminders_go_to_task_owner(self, capsys):
+        scheduler = MultiTenantScheduler(SQLiteTaskStore(":memory:"), self.students,
+                                         email_config={'sender': 'scheduler@universidade.edu'})
+        now = datetime.now()
+        for student_id, title in (("s1", "Lista"), ("s2", "Prova")):
+            scheduler.add_task(self.make_task(student_id, title, 2, now))
+        
+        assert scheduler.reminders.run_pending(now=now + timedelta(days=3)) == 4
+        assert scheduler.reminders.failed == 0
+        output = capsys.readouterr().out
+        assert output.count("Para: ana@universidade.edu | Assunto: 🔔 Lembrete: Lista") == 2
+        assert output.count("Para: bruno@universidade.edu | Assunto: 🔔 Lembrete: Prova") == 2
+    
+    def test_single_user_views_are_per_student(self, capsys):
+        scheduler = MultiTenantScheduler(SQLiteTaskStore(":memory:"), self.students, workers=1)
+        now = datetime.now()
+        for student_id, title, days in (("s1", "Lista", 1), ("s2", "Prova", 2), ("s2", "Projeto", 30)):
+            scheduler.add_task(self.make_task(student_id, title, days, now))
+        
+        with pytest.raises(ValueError):
+            scheduler.get_upcoming_tasks(7)
+        assert [task['title'] for task in scheduler.get_upcoming_tasks(7, student_id="s2")] == ["Prova"]
+        
+        assert scheduler.send_daily_summary()['summaries'] == 2
+        assert "Para: ana@universidade.edu" in capsys.readouterr().out
+    
+    def test_weekly_report_per_student(self):
+        scheduler = MultiTenantScheduler(SQLiteTaskStore(":memory:"), self.students, workers=1)
+        now = datetime.now()
+        for student_id, title, days in (("s1", "Lista", 1), ("s2", "Prova", 2), ("s2", "Projeto", 30)):
+            scheduler.add_task(self.make_task(student_id, title, days, now))
+        scheduler.complete_task(3)
+        
+        report = scheduler.generate_weekly_report("s2")
+        assert "Total de tarefas: 2" in report
+        assert "Tarefas concluídas: 1" in report
+        assert "- Prova (Cálculo I)" in report
+        assert "Lista" not in report
+        assert "Total de tarefas: 0" in scheduler.generate_weekly_report("s3")
+        
+        # Sem student_id (job weekly_report do SchedulerService): um relatório por estudante
+        combined = scheduler.generate_weekly_report()
+        assert combined.count("RELATÓRIO SEMANAL") == 2
+        assert combined.index("ESTUDANTE s1") < combined.index("- Lista") < combined.index("ESTUDANTE s2")
+    
+    def test_parallel_summaries_match_single_user(self):
+        serial = self.make_scheduler(workers=1)
+        groups = list(serial.upcoming_by_student(3, self.now))
+        
+        parallel = MultiTenantScheduler(serial.store, self.students, workers=2, chunk_size=1)
+        chunks = list(parallel.render_chunks(groups, self.now))
+        
+        assert [student_id for chunk in chunks for student_id, _ in chunk] == ["s1", "s2"]
+        assert chunks[0][0][1] == render_daily_summary(groups[0][1], self.now)
+        assert "Lista (Cálculo I) - Vence em 1 dia(s)" in chunks[0][0][1]
+    
+    def test_send_through_mail_stand_in(self):
+        with SMTPStandIn() as server:
+            pool = SMTPConnectionPool("127.0.0.1", server.port, starttls=False)
+            with MailDispatcher(pool) as mailer:
+                scheduler = self.make_scheduler(email_config={'sender': 'scheduler@universidade.edu'},
+                                                mailer=mailer, workers=1)
+                result = scheduler.send_daily_summaries(3, self.now)
+            
+            assert result['summaries'] == 2
+            assert mailer.stats()['sent'] == 2
+            recipients = sorted(message.split(b"To: ")[1].split(b"\r\n")[0] for message in server.messages)
+            assert recipients == [b"ana@universidade.edu", b"bruno@universidade.edu"]
+    
+    def test_legacy_database_is_migrated(self):
+        conn = sqlite3.connect("legacy.db")
+        conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,"
+                     " due_date TEXT NOT NULL, course TEXT NOT NULL, type TEXT NOT NULL,"
+                     " completed INTEGER NOT NULL DEFAULT 0, priority TEXT, created_at TEXT, data TEXT NOT NULL)")
+        conn.commit()
+        conn.close()
+        
+        store = SQLiteTaskStore("legacy.db")
+        store.insert(dict(self.make_task("s1", "Lista", 1), completed=False))
+        cutoff = (self.now + timedelta(days=2)).isoformat()
+        assert [student_id for student_id, _ in store.pending_by_student(cutoff)] == ["s1"]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,32 @@
+import pytest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.parallel import chunked, map_chunks
+
+class TestParallel:
+    
+    def test_chunked(self):
+        assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert list(chunked([], 3)) == []
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_map_chunks_keeps_input_order(self, workers):
+        consumed = []
+        
+        def items():
+            for number in range(50):
+                consumed.append(number)
+                yield number
+        
+        results = map_chunks(sum, items(), 4, workers)
+        first = next(results)
+        # A entrada é consumida aos poucos, não toda de uma vez
+        assert len(consumed) <= 4 * max(workers * 2, 1)
+        assert [first] + list(results) == [sum(chunk) for chunk in chunked(range(50), 4)]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
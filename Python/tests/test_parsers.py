@@ -0,0 +1,93 @@
+import pytest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.parsers import BACKENDS, PageParser, available_backends
+from local_servers import HTTPStandIn
+
+TIMETABLE_PAGE = """
+<html><head><script>var x = "<table id='turmasAbertas'>";</script></head><body>
+<table id="menu"><tr><td>Início</td><td>Turmas</td><td>Ajuda</td><td>a</td><td>b</td><td>c</td></tr></table>
+<table class="listagem" id="turmasAbertas">
+  <thead><tr><th>Código</th><th>Componente</th><th>Docente</th><th>Horário</th><th>Local</th><th>Vagas</th></tr></thead>
+  <tbody>
+    <tr class="linhaPar"><td>MAT001</td><td><a href="/t/1">Cálculo   I</a></td><td>Dr. Silva</td>
+      <td>24M12<br/>Seg 08:00-10:00</td><td>A101</td><td>2/60</td></tr>
+    <tr class="linhaImpar"><td>INF001</td><td>Programação &amp; Lógica</td><td>Dr. Santos</td>
+      <td>35T34</td><td>Lab1</td><td>0/40</td>
+  </tbody>
+</table>
+<p>Rodapé</p>
+</body></html>
+"""
+
+MATERIALS_PAGE = """
+<ul class="topics"><li class="section main">
+  <ul class="section">
+    <li class="activity resource modtype_resource">
+      <a href="https://moodle.ufpb.br/mod/resource/view.php?id=1"><img alt=""/>
+        <span class="instancename">Apostila de Cálculo I<span class="accesshide "> Arquivo</span></span></a>
+    </li>
+    <li class="label modtype_label"><p>Semana 1</p></li>
+    <li class="activity url modtype_url">
+      <a href="https://moodle.ufpb.br/mod/url/view.php?id=2"><span class="instancename">Videoaula 1<span class="accesshide"> URL</span></span></a>
+    </li>
+    <li class="activity forum"><span class="instancename">Fórum sem link</span></li>
+  </ul>
+</li></ul>
+"""
+
+class TestPageParser:
+    
+    def setup_method(self):
+        self.parsers = [PageParser(backend) for backend in available_backends()]
+    
+    def test_timetable_on_every_backend(self):
+        for parser in self.parsers:
+            rows = parser.timetable(TIMETABLE_PAGE)
+            
+            assert [row['code'] for row in rows] == ["MAT001", "INF001"], parser.backend
+            assert rows[0]['name'] == "Cálculo I"
+            assert rows[0]['schedule'] == "24M12 Seg 08:00-10:00"
+            assert rows[1]['name'] == "Programação & Lógica"
+            assert rows[1]['vacancies'] == "0/40"
+    
+    def test_materials_on_every_backend(self):
+        for parser in self.parsers:
+            materials = parser.materials(MATERIALS_PAGE)
+            
+            assert materials == [
+                {'title': "Apostila de Cálculo I", 'type': "Arquivo",
+                 'url': "https://moodle.ufpb.br/mod/resource/view.php?id=1"},
+                {'title': "Videoaula 1", 'type': "URL", 'url': "https://moodle.ufpb.br/mod/url/view.php?id=2"}
+            ], parser.backend
+    
+    def test_missing_fragment(self):
+        for parser in self.parsers:
+            assert parser.timetable("<html><body><p>Sessão expirada</p></body></html>") == []
+            assert parser.materials("") == []
+    
+    def test_backend_selection_and_fallback(self):
+        assert PageParser().backend == available_backends()[0]
+        assert PageParser('html.parser').backend == 'html.parser'
+        # lxml pode não estar instalado: cai para o próximo disponível
+        assert PageParser('lxml').backend in ('lxml', 'stream')
+        assert set(available_backends()) <= set(BACKENDS)
+        
+        with pytest.raises(ValueError):
+            PageParser('html5lib')
+    
+    def test_crawl_with_extractor(self):
+        with HTTPStandIn({"/turmas": TIMETABLE_PAGE.encode('utf-8')}) as server:
+            scraper = CourseScraper(parser_backend='stream')
+            results = list(scraper.crawl([server.url("/turmas")], parse=scraper.parser.extractor('timetable')))
+        
+        assert [row['code'] for row in results[0]['data']] == ["MAT001", "INF001"]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
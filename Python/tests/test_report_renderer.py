@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_analysis.grade_calculator import GradeCalculator
+from data_analysis.report_renderer import BulkReportRenderer
+from utils.helpers import create_student_report
+
+class TestBulkReportRenderer:
+    
+    def setup_method(self):
+        self.calc = GradeCalculator()
+        self.students = [
+            ("João Silva", {"Cálculo I": [85, 90, 78], "Programação": [92, 88, 95]}),
+            ("Maria Souza", {"Física": [59.5, 71, 64], "Química": [100]}),
+            ("Sem Notas", {"Cálculo I": []})
+        ]
+    
+    def test_grade_reports_match_create_grade_report(self, tmp_path):
+        output = tmp_path / "relatorios.txt"
+        result = BulkReportRenderer(workers=1, chunk_size=2).render(self.students, str(output))
+        
+        expected = "".join(self.calc.create_grade_report(name, data) + "\n" for name, data in self.students[:2])
+        assert output.read_text(encoding='utf-8') == expected
+        assert result['reports'] == 2
+        assert result['errors'] == 1
+        assert result['reports_per_second'] > 0
+    
+    def test_student_reports_match_helpers(self, tmp_path):
+        students = [
+            {'name': 'João Silva', 'student_id': '2024001', 'grades': [85, 92, 78, 95, 88]},
+            {'name': 'Ana Lima', 'student_id': '2024002', 'grades': [55.5, 61, 70]},
+            {'name': 'Inválido', 'student_id': '2024003', 'grades': [150]}
+        ]
+        
+        renderer = BulkReportRenderer(report_format='student', workers=1)
+        result = renderer.render(students, str(tmp_path), per_file=True)
+        
+        assert result['reports'] == 2
+        for student in students[:2]:
+            path = tmp_path / f"{student['student_id']}.txt"
+            assert path.read_text(encoding='utf-8') == create_student_report(student)
+    
+    def test_integral_float_grades_match_helpers(self, tmp_path):
+        students = [
+            {'name': 'Ana', 'student_id': '2024001', 'grades': [95.0, 80.5, 70.0]},
+            {'name': 'Bia', 'student_id': '2024002', 'grades': [95, 80.5, 70]}
+        ]
+        output = tmp_path / "relatorios.txt"
+        BulkReportRenderer(report_format='student', workers=1).render(students, str(output))
+        
+        expected = "".join(create_student_report(student) + "\n" for student in students)
+        assert output.read_text(encoding='utf-8') == expected
+        assert "Maior nota: 95.0" in expected
+    
+    def test_per_file_names_do_not_collide(self, tmp_path):
+        students = [("Ana", {"Cálculo I": [80]}), ("Ana", {"Cálculo I": [90]}), ("Ana?", {"Cálculo I": [70]})]
+        result = BulkReportRenderer(workers=1).render(students, str(tmp_path), per_file=True)
+        
+        assert result['reports'] == 3
+        assert sorted(os.listdir(tmp_path)) == ["Ana.txt", "Ana_1.txt", "Ana_2.txt"]
+        assert (tmp_path / "Ana_1.txt").read_text(encoding='utf-8') == self.calc.create_grade_report(*students[1])
+    
+    def test_process_pool(self, tmp_path):
+        students = [(f"Estudante {i}", {"Cálculo I": [60 + i % 40, 70]}) for i in range(50)]
+        output = tmp_path / "relatorios.txt"
+        
+        result = BulkReportRenderer(workers=2, chunk_size=7).render(students, str(output))
+        
+        expected = "".join(self.calc.create_grade_report(name, data) + "\n" for name, data in students)
+        assert result['reports'] == 50
+        assert output.read_text(encoding='utf-8') == expected
+    
+    def test_invalid_format(self):
+        with pytest.raises(ValueError):
+            BulkReportRenderer(report_format='pdf')
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,190 @@
+import pytest
+import sys
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automation.scheduler_service import SchedulerService
+from automation.task_store import JSONTaskStore, SQLiteTaskStore, WriteBehindTaskStore
+
+def make_task(title, days, course="Cálculo I"):
+    return {
+        'title': title,
+        'due_date': (datetime.now() + timedelta(days=days)).isoformat(),
+        'course': course,
+        'type': 'assignment'
+    }
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+class TestWriteBehindTaskStore:
+    
+    def test_writes_are_deferred_until_flush(self, tmp_path):
+        backing = JSONTaskStore(str(tmp_path / "tasks.json"))
+        backing.insert(dict(make_task("Antiga", 1), completed=False))
+        store = WriteBehindTaskStore(backing, flush_interval=None)
+        
+        task = store.insert(dict(make_task("Nova", 2), completed=False))
+        store.update(1, {'completed': True})
+        assert task['id'] == 2
+        assert store.dirty
+        assert len(backing.all()) == 1
+        
+        assert store.flush()
+        assert not store.flush()
+        assert [(task['id'], task['completed']) for task in backing.all()] == [(1, True), (2, False)]
+    
+    def test_background_flush_and_close(self, tmp_path):
+        backing = JSONTaskStore(str(tmp_path / "tasks.json"))
+        store = WriteBehindTaskStore(backing, flush_interval=0.05)
+        
+        store.insert(dict(make_task("A", 1), completed=False))
+        wait_for(lambda: len(backing.all()) == 1)
+        
+        store.insert(dict(make_task("B", 1), completed=False))
+        store.close()
+        assert len(backing.all()) == 2
+        
+        # Reiniciada (como em SchedulerService.start depois de stop)
+        store.start()
+        store.insert(dict(make_task("C", 1), completed=False))
+        wait_for(lambda: len(backing.all()) == 3)
+        store.close()
+
+    def test_flush_writes_only_changed_tasks(self, tmp_path):
+        backing = SQLiteTaskStore(str(tmp_path / "tasks.db"))
+        backing.insert_many([dict(make_task(title, 1), completed=False) for title in "ABC"])
+        store = WriteBehindTaskStore(backing, flush_interval=None)
+        replaced = []
+        backing.replace_all = replaced.append
+        
+        store.update(2, {'completed': True})
+        store.delete(3)
+        store.insert(dict(make_task("D", 2), completed=False))
+        assert store.flush()
+        
+        assert replaced == []
+        assert [(task['id'], task['title'], task['completed']) for task in backing.all()] == [
+            (1, "A", False), (2, "B", True), (4, "D", False)]
+    
+    def test_failed_flush_keeps_changes(self, tmp_path):
+        backing = JSONTaskStore(str(tmp_path / "tasks.json"))
+        store = WriteBehindTaskStore(backing, flush_interval=None)
+        store.insert(dict(make_task("A", 1), completed=False))
+        
+        def broken(upserts, deleted):
+            raise OSError("disco cheio")
+        backing.apply_changes = broken
+        with pytest.raises(OSError):
+            store.flush()
+        assert store.dirty
+        
+        del backing.apply_changes
+        assert store.flush()
+        assert [task['title'] for task in backing.all()] == ["A"]
+
+class TestSchedulerService:
+    
+    @pytest.fixture(autouse=True)
+    def workdir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+    
+    def make_service(self, **kwargs):
+        self.reports = []
+        schedules = {'daily_summary': "every 1 hours", 'weekly_report': "monday at 08:00"}
+        return SchedulerService(store=JSONTaskStore("academic_tasks.json"), schedules=schedules,
+                                flush_interval=None, on_report=self.reports.append, **kwargs)
+    
+    def make_due(self, service, name, seconds_late=2):
+        service._jobs[name]['job'].next_run = datetime.now() - timedelta(seconds=seconds_late)
+    
+    def test_jobs_run_with_metrics(self):
+        service = self.make_service()
+        service.scheduler.add_task(make_task("Trabalho", 2))
+        self.make_due(service, 'weekly_report', seconds_late=5)
+        
+        service.run_pending()
+        service.stop()
+        
+        metrics = service.metrics()
+        assert metrics['weekly_report']['runs'] == 1
+        assert metrics['weekly_report']['last_lag'] >= 5
+        assert metrics['daily_summary']['runs'] == 0
+        assert metrics['reminders']['pending'] == 2
+        assert metrics['weekly_report']['next_run'] > datetime.now()
+        assert "Total de tarefas: 1" in self.reports[0]
+        # stop() grava as tarefas mantidas em memória
+        assert len(JSONTaskStore("academic_tasks.json").all()) == 1
+    
+    def test_slow_job_does_not_delay_reminders(self):
+        service = self.make_service(workers=1)
+        fired = []
+        service.scheduler.reminders.callback = lambda reminder_id, payload: fired.append(time.time())
+        release = threading.Event()
+        service.add_job('slow', release.wait, "every 1 hours")
+        self.make_due(service, 'slow')
+        
+        service.start()
+        wait_for(lambda: service._jobs['slow']['running'])
+        # O laço de lembretes dorme até o próximo lembrete e acorda quando um novo é agendado
+        due = time.time() + 0.2
+        service.scheduler.reminders.schedule("agora", due)
+        wait_for(lambda: fired)
+        assert fired[0] - due < 0.5
+        assert service.metrics()['reminders']['runs'] == 1
+        assert service.metrics()['slow']['runs'] == 0
+        
+        # Execução anterior ainda em andamento: a nova é pulada
+        self.make_due(service, 'slow')
+        service.run_pending()
+        assert service.metrics()['slow']['skipped'] == 1
+        
+        release.set()
+        service.stop()
+        assert service.metrics()['slow']['runs'] == 1
+    
+    def test_restart_after_stop(self):
+        service = self.make_service()
+        ran = []
+        service.add_job('tick', lambda: ran.append(1), "every 1 hours")
+        
+        for runs in (1, 2):
+            self.make_due(service, 'tick')
+            service.start()
+            wait_for(lambda: service.metrics()['tick']['runs'] == runs)
+            service.stop()
+        
+        assert len(ran) == 2
+        service.start()
+        with pytest.raises(RuntimeError):
+            service.start()
+        service.stop()
+    
+    def test_restart_restores_reminders(self):
+        service = self.make_service()
+        service.scheduler.add_task(make_task("Trabalho", 3))
+        service.scheduler.add_task(make_task("Prova", 2))
+        service.scheduler.complete_task(2)
+        service.stop()
+        
+        restarted = self.make_service()
+        pending = restarted.scheduler.reminders.pending()
+        restarted.stop()
+        
+        assert len(pending) == 2
+        assert {payload['title'] for _, _, payload in pending} == {"Trabalho"}
+    
+    def test_invalid_schedule(self):
+        with pytest.raises(ValueError):
+            self.make_service().add_job('job', print, "toda segunda")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
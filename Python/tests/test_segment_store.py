@@ -0,0 +1,113 @@
+import pytest
+import sys
+import os
+import json
+import time
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.segment_store import SegmentStore
+
+class TestSegmentStore:
+    
+    def make_store(self, path, **kwargs):
+        options = dict(segment_bytes=4096, flush_bytes=1024, flush_interval=None)
+        options.update(kwargs)
+        return SegmentStore(str(path), **options)
+    
+    def test_buffers_until_flush_bytes(self, tmp_path):
+        store = self.make_store(tmp_path, flush_bytes=10_000)
+        store.append("vacancy_MAT001", {"available_vacancies": 2})
+        
+        assert store.get("vacancy_MAT001") == {"available_vacancies": 2}
+        assert store.stats()['buffered'] == 1
+        assert not any(name.endswith(".open") for name in os.listdir(tmp_path))
+        
+        assert store.flush() == 1
+        assert store.stats()['buffered'] == 0
+        assert store.get("vacancy_MAT001") == {"available_vacancies": 2}
+    
+    def test_rotation_and_latest_version(self, tmp_path):
+        store = self.make_store(tmp_path)
+        for number in range(300):
+            store.append(f"vacancy_T{number % 40}", {"reading": number})
+        store.close()
+        
+        names = os.listdir(tmp_path)
+        assert store.stats()['segments'] > 1
+        assert not any(name.endswith(".open") for name in names)
+        assert sum(name.endswith(".idx.json") for name in names) == store.stats()['segments']
+        
+        reopened = self.make_store(tmp_path)
+        assert len(reopened) == 40
+        assert reopened.get("vacancy_T7") == {"reading": 287}
+        assert sum(1 for _ in reopened.records()) == 300
+    
+    def test_recovers_interrupted_segment(self, tmp_path):
+        store = self.make_store(tmp_path, flush_bytes=1)
+        store.append("schedule_2024.1", {"courses": []})
+        store.append("materials_MAT001", [{"title": "Apostila"}])
+        # Processo interrompido no meio de uma escrita
+        with open(os.path.join(tmp_path, "000001.jsonl.open"), 'ab') as f:
+            f.write(b'{"key": "materials_INF0')
+        
+        recovered = self.make_store(tmp_path)
+        
+        assert recovered.keys() == ["materials_MAT001", "schedule_2024.1"]
+        assert recovered.segments() == [os.path.join(str(tmp_path), "000001.jsonl")]
+        recovered.append("calendar_2024", {"year": 2024})
+        recovered.flush()
+        assert os.path.exists(os.path.join(tmp_path, "000002.jsonl.open"))
+        assert recovered.get("calendar_2024") == {"year": 2024}
+    
+    def test_missing_index_is_rebuilt(self, tmp_path):
+        with self.make_store(tmp_path) as store:
+            store.append("vacancy_MAT001", {"available_vacancies": 2})
+        os.remove(os.path.join(tmp_path, "000001.idx.json"))
+        
+        assert self.make_store(tmp_path).get("vacancy_MAT001") == {"available_vacancies": 2}
+    
+    def test_export_to_legacy_layout(self, tmp_path):
+        with self.make_store(tmp_path / "segments") as store:
+            store.append("materials_MAT001", [{"title": "Apostila de Cálculo I"}])
+            store.append("materials_MAT001", [{"title": "Lista 1"}])
+            store.append("vacancy_MAT001", {"available_vacancies": 2})
+            
+            assert store.export(str(tmp_path / "export")) == 2
+        
+        with open(tmp_path / "export" / "materials_MAT001.json", encoding='utf-8') as f:
+            content = f.read()
+        assert content == json.dumps([{"title": "Lista 1"}], indent=2, ensure_ascii=False)
+    
+    def test_background_flush(self, tmp_path):
+        store = self.make_store(tmp_path, flush_bytes=10_000, flush_interval=0.05)
+        store.append("vacancy_MAT001", {"available_vacancies": 2})
+        time.sleep(0.3)
+        
+        assert store.stats()['buffered'] == 0
+        assert store.flushes >= 1
+        store.close()
+
+class TestCourseScraperSegments:
+    
+    def test_save_data_appends_to_segments(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        scraper = CourseScraper(segment_dir="segments")
+        scraper.scrape_course_schedule("2024.1")
+        scraper.scrape_course_materials("MAT001")
+        scraper.close()
+        
+        assert not (tmp_path / "scraped_data").exists()
+        assert scraper.store.keys() == ["materials_MAT001", "schedule_2024.1"]
+        
+        assert scraper.export_saved() == 2
+        with open(tmp_path / "scraped_data" / "schedule_2024.1.json", encoding='utf-8') as f:
+            assert json.load(f)["semester"] == "2024.1"
+        
+        with pytest.raises(ValueError):
+            CourseScraper().export_saved()
+
+if __name__ == "__main__":
+    pytest.main([__file__])
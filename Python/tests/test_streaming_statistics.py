@@ -0,0 +1,53 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_analysis.grade_calculator import GradeCalculator
+from data_analysis.streaming_statistics import StreamingGradeStatistics
+
+class TestStreamingGradeStatistics:
+    
+    def setup_method(self):
+        self.calc = GradeCalculator()
+        self.grades = np.random.default_rng(0).uniform(0, 100, 10_001)
+    
+    def test_matches_semester_statistics(self):
+        stats = StreamingGradeStatistics()
+        for chunk in np.array_split(self.grades, 7):
+            stats.update(chunk)
+        
+        result = stats.result()
+        expected = self.calc.calculate_semester_statistics({"Todas": list(self.grades)})
+        
+        for key in ['total_grades', 'average_grade', 'std_deviation', 'min_grade', 'max_grade', 'gpa']:
+            assert result[key] == pytest.approx(expected[key])
+        assert abs(result['median_grade'] - expected['median_grade']) <= stats.error_bound + 1e-9
+    
+    def test_quantiles_within_error_bound(self):
+        stats = StreamingGradeStatistics(bin_width=0.5).update(self.grades)
+        
+        for q in [0, 0.1, 0.25, 0.9, 1]:
+            assert abs(stats.quantile(q) - np.quantile(self.grades, q)) <= stats.error_bound + 1e-9
+    
+    def test_merge_equals_single_pass(self):
+        single = StreamingGradeStatistics().update(self.grades)
+        left = StreamingGradeStatistics().update(self.grades[:3000])
+        right = StreamingGradeStatistics().update(self.grades[3000:])
+        
+        merged = left.merge(right).result()
+        for key, value in single.result().items():
+            assert merged[key] == pytest.approx(value)
+    
+    def test_merge_incompatible(self):
+        with pytest.raises(ValueError):
+            StreamingGradeStatistics(bin_width=0.1).merge(StreamingGradeStatistics(bin_width=1))
+    
+    def test_empty(self):
+        assert StreamingGradeStatistics().update([]).result() == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,175 @@
+import pytest
+import sys
+import os
+import json
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from web_scraping.course_scraper import CourseScraper
+from web_scraping.vacancy_watcher import VacancyWatcher
+
+class FakeClock:
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestVacancyWatcher:
+    
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.sections = {}
+        self.fetches = []
+        self.saved = []
+        self.deltas = []
+    
+    def set_section(self, code, available, waiting_list=0):
+        self.sections[code] = {
+            "course_code": code,
+            "total_vacancies": 60,
+            "occupied_vacancies": 60 - available,
+            "available_vacancies": available,
+            "waiting_list": waiting_list,
+            "last_updated": str(self.clock.now)
+        }
+    
+    def fetch(self, code):
+        self.fetches.append(code)
+        return dict(self.sections[code], last_updated=str(self.clock.now))
+    
+    def make_watcher(self, **kwargs):
+        options = dict(budget=100, min_interval=5, max_interval=80, hot_seats=3)
+        options.update(kwargs)
+        watcher = VacancyWatcher(self.fetch, save=lambda code, data: self.saved.append(code),
+                                 clock=self.clock, sleep=self.clock.sleep, **options)
+        watcher.subscribe(self.deltas.append)
+        return watcher
+    
+    def run_until(self, watcher, end, step=1.0):
+        while self.clock.now < end:
+            watcher.run_pending()
+            self.clock.now += step
+    
+    def test_emits_only_deltas_and_writes_on_change(self):
+        self.set_section("MAT001", available=2, waiting_list=5)
+        watcher = self.make_watcher()
+        watcher.watch(["MAT001"])
+        
+        watcher.run_pending()
+        self.clock.now += 10
+        watcher.poll("MAT001")
+        assert self.deltas == []
+        assert self.saved == ["MAT001"]
+        
+        self.set_section("MAT001", available=4, waiting_list=3)
+        delta = watcher.poll("MAT001")
+        
+        assert self.deltas == [delta]
+        assert (delta['seats_opened'], delta['seats_closed'], delta['waiting_list_change']) == (2, 0, -2)
+        assert delta['changes']['available_vacancies'] == (2, 4)
+        assert 'total_vacancies' not in delta['changes']
+        assert self.saved == ["MAT001", "MAT001"]
+        assert watcher.stats()['changes'] == 1
+    
+    def test_hot_sections_are_polled_more_often(self):
+        self.set_section("LOTADA", available=1)
+        self.set_section("VAZIA", available=40)
+        watcher = self.make_watcher()
+        watcher.watch(["LOTADA", "VAZIA"])
+        
+        self.run_until(watcher, 300)
+        
+        # A quieta recua até max_interval; a quase lotada fica em hot_interval (10 s)
+        assert self.fetches.count("LOTADA") >= 25
+        assert self.fetches.count("VAZIA") <= 8
+        assert watcher.stats()['hot'] == 1
+    
+    def test_churn_resets_the_interval(self):
+        self.set_section("INF001", available=30)
+        watcher = self.make_watcher()
+        watcher.watch(["INF001"])
+        self.run_until(watcher, 200)
+        quiet = watcher.next_poll() - self.clock.now
+        
+        self.set_section("INF001", available=29)
+        self.clock.now = watcher.next_poll()
+        watcher.run_pending()
+        
+        assert quiet > 5
+        assert watcher.next_poll() - self.clock.now == 5
+        assert len(self.deltas) == 1
+    
+    def test_global_budget(self):
+        for number in range(50):
+            self.set_section(f"T{number}", available=1)
+        watcher = self.make_watcher(budget=10)
+        watcher.watch(self.sections)
+        
+        self.run_until(watcher, 20, step=0.5)
+        
+        # 10 consultas por segundo no máximo, mesmo com 50 turmas quentes
+        assert len(self.fetches) <= 10 * 20 + 10
+        assert len(set(self.fetches)) == 50
+    
+    def test_fetch_errors_back_off(self):
+        def failing(code):
+            raise ConnectionError("SIGAA fora do ar")
+        
+        watcher = VacancyWatcher(failing, min_interval=5, max_interval=40, clock=self.clock,
+                                 sleep=self.clock.sleep)
+        watcher.watch(["MAT001"])
+        watcher.run_pending()
+        
+        assert watcher.stats()['errors'] == 1
+        assert watcher.next_poll() == 10
+    
+    def test_unwatch(self):
+        self.set_section("MAT001", available=10)
+        watcher = self.make_watcher()
+        watcher.watch(["MAT001"])
+        watcher.unwatch("MAT001")
+        
+        assert watcher.run_pending() == 0
+        assert watcher.next_poll() is None
+
+    def test_next_poll_skips_stale_entries(self):
+        for code in ("MAT001", "MAT002"):
+            self.set_section(code, available=10)
+        watcher = self.make_watcher()
+        watcher.watch(["MAT001", "MAT002"])
+        
+        # Consultas diretas reagendam; as entradas antigas ficam no heap até serem descartadas
+        for _ in range(3000):
+            watcher.poll("MAT001")
+        watcher.unwatch("MAT002")
+        
+        assert watcher.next_poll() == 80
+        assert len(watcher._queue) <= 2 * 1024
+
+class TestCourseScraperVacancies:
+    
+    def test_watch_vacancies_saves_only_first_reading(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        scraper = CourseScraper()
+        
+        assert "last_updated" in scraper.monitor_course_vacancies("MAT002", save=False)
+        assert not (tmp_path / "scraped_data").exists()
+        
+        watcher = scraper.watch_vacancies(["MAT001"], min_interval=0)
+        watcher.run_pending()
+        path = tmp_path / "scraped_data" / "vacancy_MAT001.json"
+        first = path.read_text(encoding='utf-8')
+        
+        watcher.poll("MAT001")
+        assert path.read_text(encoding='utf-8') == first
+        assert json.loads(first)["available_vacancies"] == 2
+        assert watcher.stats()['writes'] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])